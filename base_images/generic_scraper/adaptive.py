@@ -0,0 +1,123 @@
+"""
+Adaptive polling intervals from observed change rates.
+Every run records whether the scraped content changed (ignoring the run's own
+published_at timestamps) in STATE_DIR/schedule-state.json. For configs with an
+`adaptive` block the cron `schedule` is the fastest polling rate: the interval
+between real runs grows by `backoff` while the content stays the same and
+shrinks by it when the content changes, bounded by min/max_interval. Cron
+ticks before the interval has passed are skipped.
+"""
+import hashlib
+import json
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple
+
+from state_store import JsonStore
+
+
+# Runs start on minute ticks and take a while; a run this much early still counts as due
+DUE_SLACK = 60
+
+
+def nominal_interval(config: Dict[str, Any]) -> int:
+    """Seconds between the next two runs of the config's cron schedule."""
+    from scheduler import CronSchedule
+
+    cron = CronSchedule(config['schedule'])
+    first = cron.next_run(datetime.now())
+    second = cron.next_run(first) if first else None
+    return int((second - first).total_seconds()) if first and second else 86400
+
+
+@dataclass(frozen=True)
+class AdaptivePolicy:
+    """Interval bounds (seconds) and growth factor of one config."""
+    min_interval: int
+    max_interval: int
+    backoff: float = 2.0
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> Optional['AdaptivePolicy']:
+        adaptive = config.get('adaptive')
+        if not adaptive or not adaptive.get('enabled', True):
+            return None
+        return cls(
+            min_interval=int(adaptive.get('min_interval') or nominal_interval(config)),
+            max_interval=int(adaptive.get('max_interval', 86400)),
+            backoff=float(adaptive.get('backoff', 2.0)),
+        )
+
+    def clamp(self, interval: float) -> int:
+        return int(min(self.max_interval, max(self.min_interval, interval)))
+
+
+def validate_adaptive(config: Dict[str, Any], config_path: str):
+    """Check the optional `adaptive` block of a config."""
+    adaptive = config.get('adaptive')
+    if adaptive is None:
+        return
+    if not isinstance(adaptive, dict):
+        raise ValueError(f"'adaptive' must be a mapping in {config_path}")
+    if float(adaptive.get('backoff', 2.0)) <= 1:
+        raise ValueError(f"'adaptive.backoff' must be greater than 1 in {config_path}")
+    minimum = int(adaptive.get('min_interval') or 0)
+    if minimum and int(adaptive.get('max_interval', 86400)) < minimum:
+        raise ValueError(f"'adaptive.max_interval' must not be below 'min_interval' in {config_path}")
+
+
+def content_hash(entries: List[Dict[str, Any]]) -> str:
+    """Hash of the entries without the per-run published_at timestamp."""
+    stable = [{key: value for key, value in entry.items() if key != 'published_at'} for entry in entries]
+    return hashlib.sha1(json.dumps(stable, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+class ChangeTracker:
+    """Observed changes and the current polling interval per config."""
+
+    def __init__(self, store: Optional[JsonStore] = None):
+        self.store = store or JsonStore('schedule-state.json')
+
+    def get(self, crawler_id: str) -> Dict[str, Any]:
+        return self.store.load().get(crawler_id, {})
+
+    def due(self, config: Dict[str, Any], now: Optional[float] = None) -> bool:
+        """False while an adaptive config's current interval has not passed since its last run."""
+        if AdaptivePolicy.from_config(config) is None:
+            return True
+        state = self.get(config['id'])
+        if 'last_run' not in state:
+            return True
+        return (now or time.time()) >= state['last_run'] + state['interval'] - DUE_SLACK
+
+    def record(self, config: Dict[str, Any], entries: Optional[List[Dict[str, Any]]]) -> Tuple[int, bool]:
+        """Record a successful run (entries None: page not modified).
+
+        Returns the new effective interval and whether the content changed.
+        """
+        policy = AdaptivePolicy.from_config(config)
+        nominal = nominal_interval(config)
+        digest = content_hash(entries) if entries is not None else None
+        now = time.time()
+
+        with self.store.transaction() as data:
+            state = data.setdefault(config['id'], {
+                'interval': policy.clamp(nominal) if policy else nominal, 'runs': 0, 'changes': 0,
+            })
+            first = 'content_hash' not in state
+            changed = digest is not None and digest != state.get('content_hash')
+            state['runs'] += 1
+            state['last_run'] = now
+            if changed:
+                state['content_hash'] = digest
+                if not first:
+                    state['changes'] += 1
+                    state['last_change'] = now
+
+            if policy is None:
+                state['interval'] = nominal
+            elif not first:
+                factor = 1 / policy.backoff if changed else policy.backoff
+                state['interval'] = policy.clamp(state['interval'] * factor)
+            return state['interval'], changed and not first
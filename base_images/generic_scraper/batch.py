@@ -0,0 +1,98 @@
+"""
+Concurrent batch runs of many configs.
+A global worker cap bounds parallel runs; HostLimiter bounds parallel
+requests per host so configs sharing a site do not hit it all at once.
+"""
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Any, List, Callable, Optional
+from urllib.parse import urlparse
+
+from config_loader import load_config
+
+
+BATCH_WORKERS = int(os.environ.get('BATCH_WORKERS', '8'))
+MAX_PER_HOST = int(os.environ.get('MAX_PER_HOST', '2'))
+
+
+class HostLimiter:
+    """Per-host semaphores limiting concurrent requests to the same hostname."""
+
+    def __init__(self, per_host: int = MAX_PER_HOST):
+        self.per_host = max(1, per_host)
+        self._semaphores: Dict[str, threading.Semaphore] = {}
+        self._lock = threading.Lock()
+
+    def _semaphore(self, host: str) -> threading.Semaphore:
+        with self._lock:
+            if host not in self._semaphores:
+                self._semaphores[host] = threading.Semaphore(self.per_host)
+            return self._semaphores[host]
+
+    @contextmanager
+    def limit(self, url: str):
+        """Hold one of the host's slots while the block runs."""
+        semaphore = self._semaphore(urlparse(url).hostname or '')
+        with semaphore:
+            yield
+
+
+def run_all(config_dir: str, run_func: Callable[[str, Dict[str, Any]], bool],
+            workers: int = BATCH_WORKERS,
+            before_run: Optional[Callable[[List[Dict[str, Any]]], Any]] = None) -> List[Dict[str, Any]]:
+    """Run every config in config_dir concurrently and return per-config results.
+
+    before_run gets the loaded configs before the first run starts.
+    """
+    jobs = []
+    results = []
+    for config_file in sorted(Path(config_dir).glob('*.yaml')):
+        try:
+            config = load_config(str(config_file))
+            config['_path'] = str(config_file)
+            jobs.append(config)
+        except Exception as e:
+            print(f"Error loading {config_file}: {e}")
+            results.append({'id': config_file.stem, 'host': '', 'success': False, 'seconds': 0.0})
+
+    def timed_run(config: Dict[str, Any]) -> Dict[str, Any]:
+        start = time.perf_counter()
+        try:
+            success = run_func(config['_path'], config)
+        except Exception as e:
+            print(f"Unhandled error in {config['id']}: {e}")
+            success = False
+        return {
+            'id': config['id'],
+            'host': urlparse(config['url']).hostname or '',
+            'success': bool(success),
+            'seconds': time.perf_counter() - start,
+        }
+
+    if before_run:
+        before_run(jobs)
+
+    print(f"Running {len(jobs)} configs with {workers} workers, max {MAX_PER_HOST} per host")
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix='batch') as executor:
+        results.extend(executor.map(timed_run, jobs))
+
+    return results
+
+
+def print_summary(results: List[Dict[str, Any]], wall_time: float):
+    """Print a table of per-config wall times."""
+    print(f"\n{'='*72}")
+    print(f"{'Config':35} {'Host':22} {'Status':8} {'Time':>5}")
+    print(f"{'-'*72}")
+    for result in sorted(results, key=lambda r: r['seconds'], reverse=True):
+        status = 'ok' if result['success'] else 'FAILED'
+        print(f"{result['id']:35} {result['host'][:22]:22} {status:8} {result['seconds']:5.1f}s")
+    print(f"{'-'*72}")
+    failed = sum(1 for r in results if not r['success'])
+    print(f"{len(results)} configs, {failed} failed, total wall time {wall_time:.1f}s "
+          f"(sum of runs {sum(r['seconds'] for r in results):.1f}s)")
+    print(f"{'='*72}")
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: per-container extraction cost of a config against saved HTML.
+
+Compares compiling every field's selector per container (what the scraper did
+before configs carried a compiled plan) with the compiled extraction plan.
+
+Usage:
+    python benchmarks/bench_extraction.py
+    python benchmarks/bench_extraction.py --config ../../crawler_configs/simple/002_gz.yaml \\
+        --html benchmarks/pages/002_gz.html --repeat 50
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+BENCH_DIR = Path(__file__).parent
+ENGINE_DIR = BENCH_DIR.parent
+PROJECT_ROOT = ENGINE_DIR.parent.parent
+sys.path.insert(0, str(ENGINE_DIR))
+
+from config_loader import load_config, get_selector_config  # noqa: E402
+from extraction import SIMPLE_FIELDS, FieldPlan, get_plan  # noqa: E402
+
+
+def per_call_extract(containers, config):
+    selectors = config['selectors']
+    return [
+        {field: FieldPlan.from_config(get_selector_config(selectors, field)).extract(container)
+         for field in SIMPLE_FIELDS}
+        for container in containers
+    ]
+
+
+def plan_extract(containers, config):
+    plan = get_plan(config)
+    return [
+        {field: field_plan.extract(container) for field, field_plan in plan.fields}
+        for container in containers
+    ]
+
+
+def measure(func, containers, config, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(containers, config)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark per-container extraction cost')
+    parser.add_argument('--config', default=str(PROJECT_ROOT / 'crawler_configs' / 'simple' / '002_gz.yaml'))
+    parser.add_argument('--html', default=str(BENCH_DIR / 'pages' / '002_gz.html'))
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    config = load_config(args.config)
+    if config.get('type', 'simple') != 'simple':
+        print(f"Only simple configs are supported, got type '{config['type']}'")
+        sys.exit(1)
+
+    with open(args.html, 'r', encoding='utf-8') as f:
+        soup = BeautifulSoup(f.read(), 'html.parser')
+
+    containers = soup.select(config['selectors']['container'])
+    if not containers:
+        print("No containers found in HTML")
+        sys.exit(1)
+
+    per_call_time, per_call_result = measure(per_call_extract, containers, config, args.repeat)
+    plan_time, plan_result = measure(plan_extract, containers, config, args.repeat)
+
+    count = len(containers)
+    print(f"Config:     {config['id']}")
+    print(f"HTML:       {args.html}")
+    print(f"Containers: {count} (best of {args.repeat})")
+    print(f"{'per call':10} {per_call_time * 1e6 / count:10.1f} µs/container")
+    print(f"{'plan':10} {plan_time * 1e6 / count:10.1f} µs/container")
+    print(f"{'speedup':10} {per_call_time / plan_time:10.2f}x")
+
+    if per_call_result != plan_result:
+        print("WARNING: plan output differs from per-call output")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
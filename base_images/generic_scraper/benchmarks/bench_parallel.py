@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Benchmark: serial vs. process-pool extraction of large listing pages.
+
+For every parser and page size a synthetic page is built from a config and
+its containers are extracted serially and through extract_parallel() with
+each worker count (the pool is started before timing). The stages the pool
+adds (serializing the containers, re-parsing the fragments) are timed on
+their own, so the break-even point can be estimated on machines with fewer
+cores than workers. Results are printed as JSON.
+
+Usage:
+    python benchmarks/bench_parallel.py
+    python benchmarks/bench_parallel.py --sizes 5000,20000 --workers 2,4 --parsers lxml,selectolax
+"""
+import argparse
+import contextlib
+import io
+import json
+import platform
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List
+
+BENCH_DIR = Path(__file__).parent
+ENGINE_DIR = BENCH_DIR.parent
+PROJECT_ROOT = ENGINE_DIR.parent.parent
+sys.path.insert(0, str(ENGINE_DIR))
+sys.path.insert(0, str(BENCH_DIR))
+
+from config_loader import load_config  # noqa: E402
+from extraction import get_plan  # noqa: E402
+from parsers import get_engine  # noqa: E402
+import parallel_extract  # noqa: E402
+from synthetic import synthesize  # noqa: E402
+
+
+def best_of(repeat: int, function) -> float:
+    """Best wall time of `repeat` calls in seconds."""
+    runs = []
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        function()
+        runs.append(time.perf_counter() - start)
+    return min(runs)
+
+
+def measure(config: Dict[str, Any], engine, size: int, workers: List[int], chunk_size: int,
+            repeat: int) -> Dict[str, Any]:
+    plan = get_plan(config)
+    document = engine.parse(synthesize(config, size).encode('utf-8'), None, 'utf-8')
+    containers = engine.select(document, plan.container)
+
+    def serial():
+        return [{field: field_plan.extract(container, engine) for field, field_plan in plan.fields}
+                for container in containers]
+
+    fragments = [engine.serialize(container) for container in containers]
+    chunks = [fragments[start:start + chunk_size] for start in range(0, len(fragments), chunk_size)]
+    reparsed = [node for chunk in chunks for node in engine.parse_fragments(''.join(chunk))]
+
+    result = {
+        'parser': engine.name,
+        'containers': len(containers),
+        'serial_ms': round(best_of(repeat, serial) * 1000, 1),
+        'serialize_ms': round(best_of(repeat, lambda: [engine.serialize(c) for c in containers]) * 1000, 1),
+        'reparse_ms': round(best_of(repeat, lambda: [engine.parse_fragments(''.join(c)) for c in chunks]) * 1000, 1),
+        'reparsed_extract_ms': round(best_of(repeat, lambda: [
+            {field: field_plan.extract(node, engine) for field, field_plan in plan.fields} for node in reparsed
+        ]) * 1000, 1),
+        'parallel_ms': {},
+    }
+    expected = serial()
+
+    for count in workers:
+        parallel_config = dict(config, parallel_extraction={'threshold': 1, 'workers': count, 'chunk_size': chunk_size})
+        with contextlib.redirect_stdout(io.StringIO()):
+            # Start (or grow) the pool outside the timed runs
+            rows = parallel_extract.extract_parallel(containers, plan.fields, engine, parallel_config)
+            if rows is None:
+                # Single chunk: extract_parallel() stays serial
+                result['parallel_ms'][str(count)] = None
+                continue
+            if rows != expected:
+                raise SystemExit(f"Parallel extraction with {count} workers differs from the serial result")
+            seconds = best_of(repeat, lambda: parallel_extract.extract_parallel(
+                containers, plan.fields, engine, parallel_config))
+        result['parallel_ms'][str(count)] = round(seconds * 1000, 1)
+
+    engine.free(document)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serial vs. parallel extraction benchmark')
+    parser.add_argument('--config', default=str(PROJECT_ROOT / 'crawler_configs' / 'simple' / '002_gz.yaml'))
+    parser.add_argument('--parsers', default='html.parser,lxml,selectolax')
+    parser.add_argument('--sizes', default='1000,5000,20000', help='Container counts')
+    parser.add_argument('--workers', default='2,4', help='Worker counts for the pool')
+    parser.add_argument('--chunk-size', type=int, default=parallel_extract.PARALLEL_EXTRACT_CHUNK_SIZE)
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per measurement (best is reported)')
+    args = parser.parse_args()
+
+    config = load_config(args.config)
+    results = {
+        'generated_at': datetime.now().strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'available_cpus': parallel_extract.available_cpus(),
+        'config': config['id'],
+        'chunk_size': args.chunk_size,
+        'runs': [],
+    }
+    for name in args.parsers.split(','):
+        engine = get_engine(name)
+        for size in (int(size) for size in args.sizes.split(',')):
+            print(f"Measuring {size} containers with {engine.name}", file=sys.stderr)
+            results['runs'].append(measure(config, engine, size, [int(w) for w in args.workers.split(',')],
+                                           args.chunk_size, args.repeat))
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
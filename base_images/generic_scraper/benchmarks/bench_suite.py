@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark suite for the generic scraper engine.
+
+Runs every config in crawler_configs/simple and crawler_configs/tschuessschule
+end to end (parse, extract, serialize) against a recorded live snapshot
+(benchmarks/fixtures/<id>.html, written by --record). Without one, a
+hand-written page of the site's structure (benchmarks/pages/<id>.html) or a
+page generated from the config's selectors is used; both are reported as
+`synthetic`. Generated pages are also scaled up to measure per-container cost. For every fixture the decode time of `response.text`
+without a charset header is compared with the engine's bytes-first encoding
+detection. Results are printed as JSON.
+
+Usage:
+    python benchmarks/bench_suite.py                          # All configs + scale runs
+    python benchmarks/bench_suite.py --output bench.json      # Write JSON to a file
+    python benchmarks/bench_suite.py --parser lxml            # Override the parser backend
+    python benchmarks/bench_suite.py --sizes 100,1000 --scale-configs 051_vhs
+    python benchmarks/bench_suite.py --record                 # Store live snapshots (needs network)
+"""
+import argparse
+import contextlib
+import io
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+BENCH_DIR = Path(__file__).parent
+ENGINE_DIR = BENCH_DIR.parent
+PROJECT_ROOT = ENGINE_DIR.parent.parent
+FIXTURE_DIR = BENCH_DIR / 'fixtures'
+PAGES_DIR = BENCH_DIR / 'pages'
+CONFIG_DIRS = [PROJECT_ROOT / 'crawler_configs' / 'simple', PROJECT_ROOT / 'crawler_configs' / 'tschuessschule']
+sys.path.insert(0, str(ENGINE_DIR))
+sys.path.insert(0, str(BENCH_DIR))
+
+import requests  # noqa: E402
+
+from config_loader import load_config  # noqa: E402
+from decoding import detect_encoding  # noqa: E402
+from extraction import get_plan  # noqa: E402
+from output_writer import serialize_json  # noqa: E402
+from parsers import get_engine  # noqa: E402
+import scraper  # noqa: E402
+from synthetic import synthesize  # noqa: E402
+
+
+def load_configs() -> List[Dict[str, Any]]:
+    configs = []
+    for config_dir in CONFIG_DIRS:
+        for config_file in sorted(config_dir.glob('*.yaml')):
+            configs.append(load_config(str(config_file)))
+    return configs
+
+
+def run_pipeline(markup: bytes, config: Dict[str, Any], engine) -> Dict[str, Any]:
+    """One end-to-end run; returns per-stage seconds and the entry count."""
+    scope = get_plan(config).scope if engine.supports_scope else None
+
+    start = time.perf_counter()
+    encoding, _ = detect_encoding(fixture_response(markup), cache=None)
+    document = engine.parse(markup, scope, encoding)
+    parsed = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        entries = scraper.scrape(document, config, engine)
+    extracted = time.perf_counter()
+    serialize_json(entries)
+    serialized = time.perf_counter()
+    engine.free(document)
+
+    return {
+        'parse': parsed - start,
+        'extract': extracted - parsed,
+        'serialize': serialized - extracted,
+        'entries': len(entries),
+    }
+
+
+def fixture_response(markup: bytes) -> requests.Response:
+    """A response as a server without charset in its Content-Type header would send it."""
+    response = requests.Response()
+    response._content = markup
+    response.status_code = 200
+    response.url = 'http://fixture.invalid/'
+    return response
+
+
+def measure_decode(markup: bytes, repeat: int) -> Dict[str, Any]:
+    """Best-of-N decode time: response.text (charset detection) vs. detect_encoding()."""
+    text_runs, bytes_runs = [], []
+    for _ in range(max(1, repeat)):
+        response = fixture_response(markup)
+        start = time.perf_counter()
+        response.text
+        text_runs.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        encoding, source = detect_encoding(response, cache=None)
+        bytes_runs.append(time.perf_counter() - start)
+
+    return {
+        'encoding': encoding,
+        'encoding_source': source,
+        'decode_text_ms': round(min(text_runs) * 1000, 3),
+        'decode_ms': round(min(bytes_runs) * 1000, 3),
+        'decode_saved_ms': round((min(text_runs) - min(bytes_runs)) * 1000, 3),
+    }
+
+
+def measure(markup: bytes, config: Dict[str, Any], engine, repeat: int) -> Dict[str, Any]:
+    """Best-of-N stage timings plus peak traced memory of a separate run."""
+    runs = [run_pipeline(markup, config, engine) for _ in range(max(1, repeat))]
+    best = {stage: min(run[stage] for run in runs) for stage in ('parse', 'extract', 'serialize')}
+
+    tracemalloc.start()
+    run_pipeline(markup, config, engine)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    entries = runs[0]['entries']
+    return {
+        'parser': engine.name,
+        'scoped': bool(get_plan(config).scope and engine.supports_scope),
+        'html_bytes': len(markup),
+        'entries': entries,
+        'parse_ms': round(best['parse'] * 1000, 3),
+        'extract_ms': round(best['extract'] * 1000, 3),
+        'serialize_ms': round(best['serialize'] * 1000, 3),
+        'total_ms': round(sum(best.values()) * 1000, 3),
+        'extract_us_per_entry': round(best['extract'] * 1e6 / entries, 3) if entries else None,
+        'peak_memory_kb': round(peak / 1024, 1),
+    }
+
+
+def load_page(config: Dict[str, Any]) -> Tuple[bytes, str, str]:
+    """Markup to benchmark a config on, its source (snapshot/synthetic) and where it came from."""
+    for directory, source in ((FIXTURE_DIR, 'snapshot'), (PAGES_DIR, 'synthetic')):
+        page = directory / f"{config['id']}.html"
+        if page.exists():
+            return page.read_bytes(), source, str(page.relative_to(BENCH_DIR))
+    return synthesize(config, 50).encode('utf-8'), 'synthetic', 'generated'
+
+
+def record_snapshots(configs: List[Dict[str, Any]]):
+    """Fetch each config's live page and store it as a snapshot fixture."""
+    FIXTURE_DIR.mkdir(exist_ok=True)
+    for config in configs:
+        try:
+            response = scraper.fetch_response(config['url'])
+            (FIXTURE_DIR / f"{config['id']}.html").write_bytes(response.content)
+            print(f"Recorded {config['id']} ({len(response.content)} bytes)", file=sys.stderr)
+        except Exception as e:
+            print(f"Could not record {config['id']}: {e}", file=sys.stderr)
+
+
+def run_suite(configs: List[Dict[str, Any]], parser: Optional[str], repeat: int,
+              sizes: List[int], scale_ids: List[str], scale_repeat: int) -> Dict[str, Any]:
+    results = {
+        'generated_at': datetime.now().strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'parser_override': parser,
+        'fixtures': [],
+        'scale': [],
+    }
+
+    for config in configs:
+        engine = get_engine(parser or config.get('parser'))
+        markup, source, page = load_page(config)
+
+        print(f"Benchmarking {config['id']} ({source}: {page}, {engine.name})", file=sys.stderr)
+        results['fixtures'].append(dict(id=config['id'], source=source, page=page,
+                                        **measure(markup, config, engine, repeat),
+                                        **measure_decode(markup, repeat)))
+
+    for config in configs:
+        if config['id'] not in scale_ids:
+            continue
+        engine = get_engine(parser or config.get('parser'))
+        for size in sizes:
+            print(f"Scaling {config['id']} to {size} containers ({engine.name})", file=sys.stderr)
+            markup = synthesize(config, size).encode('utf-8')
+            results['scale'].append(dict(id=config['id'], containers=size,
+                                         **measure(markup, config, engine, scale_repeat)))
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Offline benchmark suite for the generic scraper')
+    parser.add_argument('--parser', help='Parser backend for all configs (default: per config)')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per fixture (best is reported)')
+    parser.add_argument('--sizes', default='100,1000,10000', help='Container counts for scale runs')
+    parser.add_argument('--scale-configs', default='002_gz,050_tschuessschule_studium',
+                        help="Config ids used for scale runs ('all' for every config)")
+    parser.add_argument('--scale-repeat', type=int, default=1, help='Runs per scale size')
+    parser.add_argument('--only', help='Comma-separated config ids to benchmark')
+    parser.add_argument('--output', help='Write JSON results to this file instead of stdout')
+    parser.add_argument('--record', action='store_true', help='Record live HTML snapshots and exit')
+    args = parser.parse_args()
+
+    configs = load_configs()
+    if args.only:
+        wanted = set(args.only.split(','))
+        configs = [c for c in configs if c['id'] in wanted]
+
+    if args.record:
+        record_snapshots(configs)
+        return
+
+    scale_ids = [c['id'] for c in configs] if args.scale_configs == 'all' else args.scale_configs.split(',')
+    sizes = [int(size) for size in args.sizes.split(',') if size]
+    results = run_suite(configs, args.parser, args.repeat, sizes, scale_ids, args.scale_repeat)
+
+    output = json.dumps(results, ensure_ascii=False, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + '\n', encoding='utf-8')
+        print(f"Results written to {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,142 @@
+"""
+Synthetic HTML pages generated from a crawler config.
+Builds markup that every selector of the config matches, with any number of
+containers, for offline benchmarks when no recorded snapshot exists.
+"""
+import re
+from html import escape
+from typing import Dict, Any, List, Tuple
+
+from config_loader import get_selector_config
+from extraction import SIMPLE_FIELDS
+
+
+_PART_RE = re.compile(r'([.#])([\w-]+)|\[([\w-]+)(?:[~|^$*]?=["\']?([^"\'\]]*)["\']?)?\]|:[\w-]+(?:\([^)]*\))?')
+
+
+class _Node:
+    """One element of the generated tree, created from a selector compound."""
+
+    def __init__(self, compound: str):
+        self.compound = compound
+        self.children: Dict[str, '_Node'] = {}
+        self.attributes: Dict[str, str] = {}
+        self.text = ''
+
+    def child(self, compound: str) -> '_Node':
+        return self.children.setdefault(compound, _Node(compound))
+
+    def render(self) -> str:
+        tag_match = re.match(r'[a-zA-Z][\w-]*', self.compound)
+        tag = tag_match.group(0) if tag_match else 'div'
+        attributes = {}
+        classes = []
+        for dot_or_hash, name, attr, value, in _PART_RE.findall(self.compound):
+            if dot_or_hash == '.':
+                classes.append(name)
+            elif dot_or_hash == '#':
+                attributes['id'] = name
+            elif attr:
+                attributes[attr] = value or attr
+        if classes:
+            attributes['class'] = ' '.join(classes)
+        attributes.update(self.attributes)
+
+        attrs = ''.join(f' {key}="{escape(value)}"' for key, value in attributes.items())
+        if tag in ('img', 'br', 'hr', 'input', 'meta', 'link'):
+            return f'<{tag}{attrs}>'
+        inner = escape(self.text) + ''.join(child.render() for child in self.children.values())
+        return f'<{tag}{attrs}>{inner}</{tag}>'
+
+
+def compounds(selector: str) -> List[str]:
+    """Split a selector into its compounds (combinators become nesting)."""
+    return [part for part in re.split(r'\s*[>\s]\s*', selector.strip()) if part]
+
+
+def _add_field(root: _Node, selector_config: Dict[str, Any], label: str, index: int):
+    selector = selector_config.get('selector', '')
+    if not selector:
+        return
+    node = root
+    for compound in compounds(selector):
+        node = node.child(compound)
+
+    attribute = selector_config.get('attribute') or 'text'
+    if attribute == 'text':
+        node.text = f"{label} {index}"
+    elif attribute == 'href':
+        node.attributes['href'] = f"/{label}/{index}"
+    elif attribute == 'src':
+        node.attributes['src'] = f"/images/{label}-{index}.jpg"
+    else:
+        node.attributes[attribute] = f"{label}-{index}"
+
+
+def _wrap(chain: List[str], inner: str) -> str:
+    """Nest inner markup in elements built from the wrapper compounds."""
+    for compound in reversed(chain):
+        html = _Node(compound).render()
+        close = html.rindex('</')
+        inner = html[:close] + inner + html[close:]
+    return inner
+
+
+def _simple_items(config: Dict[str, Any], count: int) -> Tuple[List[str], List[str]]:
+    selectors = config['selectors']
+    chain = compounds(selectors.get('container', 'div.item'))
+    items = []
+    for index in range(count):
+        item = _Node(chain[-1])
+        for field in SIMPLE_FIELDS:
+            _add_field(item, get_selector_config(selectors, field), field, index)
+        items.append(item.render())
+    return chain[:-1], items
+
+
+def _nested_items(config: Dict[str, Any], count: int, items_per_container: int = 10) -> Tuple[List[str], List[str]]:
+    selectors = config['selectors']
+    chain = compounds(selectors.get('container', 'div.container'))
+    items_config = selectors.get('items', {})
+    item_chain = compounds(items_config.get('selector', 'div.item'))
+    cta = items_config.get('call_to_action_url', {})
+    id_attribute = cta.get('item_id_attribute', 'id') if cta.get('template') else None
+
+    containers = []
+    item_index = 0
+    for container_index in range(max(1, count // items_per_container)):
+        container = _Node(chain[-1])
+        _add_field(container, get_selector_config(selectors, 'category_title'), 'category', container_index)
+        rendered_items = []
+        for _ in range(items_per_container):
+            item = _Node(item_chain[-1])
+            if id_attribute:
+                item.attributes[id_attribute] = f"item-{item_index}"
+            if items_config.get('image_url'):
+                _add_field(item, items_config['image_url'], 'image', item_index)
+            if cta and not cta.get('template'):
+                _add_field(item, cta, 'cta', item_index)
+            rendered_items.append(item.render())
+            item_index += 1
+        html = container.render()
+        close = html.rindex('</')
+        containers.append(html[:close] + _wrap(item_chain[:-1], ''.join(rendered_items)) + html[close:])
+    return chain[:-1], containers
+
+
+def synthesize(config: Dict[str, Any], count: int = 50) -> str:
+    """Return an HTML page with `count` containers (items for nested configs)."""
+    if config.get('type', 'simple') == 'nested':
+        wrappers, items = _nested_items(config, count)
+    else:
+        wrappers, items = _simple_items(config, count)
+
+    body = _wrap(wrappers, '\n'.join(items))
+    navigation = ''.join(f'<li><a href="/section/{i}">Section {i}</a></li>' for i in range(100))
+    footer = ''.join(f'<p>Footer line {i}</p>' for i in range(50))
+    return (
+        '<!DOCTYPE html>\n<html lang="de">\n<head><meta charset="utf-8">'
+        f'<title>Synthetic {escape(config["id"])}</title></head>\n'
+        f'<body><header><ul class="navigation">{navigation}</ul></header>\n'
+        f'<main>{body}</main>\n<footer>{footer}</footer></body>\n</html>\n'
+    )
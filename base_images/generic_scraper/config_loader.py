@@ -3,22 +3,48 @@ Config loader for generic scraper.
 Handles YAML config parsing and crontab generation.
 """
 import os
-import yaml
+import json
+import hashlib
+import importlib
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Callable
+
+from parsers import PARSERS
+from registry_cache import load_yaml
 
 
 CONFIG_DIR = os.environ.get('CONFIG_DIR', '/app/configs')
+OUTPUT_DIR = os.environ.get('OUTPUT_DIR', '/app/output')
+# Persistent scraper state (validators, metrics) lives on the output volume
+STATE_DIR = os.environ.get('STATE_DIR', os.path.join(OUTPUT_DIR, '.state'))
 CRONTAB_PATH = '/etc/cron.d/scraper'
 
+# Feature checks run by load_config as 'module.function'. They are resolved on
+# first use because each of these modules imports config_loader itself.
+VALIDATORS = (
+    'pagination.validate_pagination',
+    'item_store.validate_history',
+    'resilience.validate_retry',
+    'feed.validate_feed',
+    'adaptive.validate_adaptive',
+    'parallel_extract.validate_parallel',
+)
+
+
+@lru_cache(maxsize=None)
+def _resolve(name: str) -> Callable:
+    """The function behind a 'module.function' name."""
+    module, function = name.rsplit('.', 1)
+    return getattr(importlib.import_module(module), function)
+
 
 def load_config(config_path: str) -> Dict[str, Any]:
     """Load and validate a crawler config file."""
-    with open(config_path, 'r', encoding='utf-8') as f:
-        config = yaml.safe_load(f)
+    config = load_yaml(config_path)
 
-    # Validate required fields
-    required = ['id', 'url', 'selectors', 'output']
+    # Validate required fields (feeds map their items without selectors)
+    required = ['id', 'url', 'output'] if config.get('type') == 'feed' else ['id', 'url', 'selectors', 'output']
     for field in required:
         if field not in config:
             raise ValueError(f"Missing required field '{field}' in {config_path}")
@@ -29,12 +55,35 @@ def load_config(config_path: str) -> Dict[str, Any]:
     config.setdefault('schedule', '0 9 * * *')  # Default: daily at 9am
     config.setdefault('run_on_start', True)
     config.setdefault('type', 'simple')
+    config.setdefault('selectors', {})
     config.setdefault('selection', {'strategy': 'random'})
     config.setdefault('post_process', {})
+    config.setdefault('conditional_fetch', True)
+    # JSON APIs are decoded, not parsed as HTML
+    config.setdefault('parser', 'json' if config['type'] == 'json' else 'html.parser')
+
+    # Compile selectors once (also rejects invalid CSS, parsers and pagination at load time)
+    if config['type'] not in ('simple', 'nested', 'json', 'feed'):
+        raise ValueError(f"Unknown type '{config['type']}' in {config_path}, expected simple, nested, json or feed")
+    if config['type'] == 'json':
+        if config['parser'] != 'json':
+            raise ValueError(f"'type: json' configs cannot use parser '{config['parser']}' in {config_path}")
+    elif config['parser'] not in PARSERS:
+        raise ValueError(f"Unknown parser '{config['parser']}' in {config_path}, expected one of: {', '.join(PARSERS)}")
+    for name in VALIDATORS:
+        _resolve(name)(config, config_path)
+    config['_plan'] = _resolve('extraction.compile_plan')(config)
 
     return config
 
 
+def config_fingerprint(config: Dict[str, Any]) -> str:
+    """Stable hash of a config (ignoring internal '_' keys)."""
+    public = {k: v for k, v in config.items() if not k.startswith('_')}
+    canonical = json.dumps(public, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(canonical.encode('utf-8')).hexdigest()
+
+
 def load_all_configs() -> Dict[str, Dict[str, Any]]:
     """Load all config files from CONFIG_DIR."""
     configs = {}
@@ -73,12 +122,14 @@ def generate_crontab():
         ""
     ]
 
+    from scheduler import effective_schedule
     for crawler_id, config in configs.items():
-        schedule = config.get('schedule', '0 9 * * *')
+        schedule, delay = effective_schedule(config)
         config_path = config['_path']
 
-        # Cron line format: schedule command
-        cron_line = f"{schedule} cd /app && python3 scraper.py {config_path} >> /var/log/cron/scraper.log 2>&1"
+        # Cron line format: schedule command (staggered runs sleep into their slot)
+        command = f"cd /app && python3 scraper.py {config_path} >> /var/log/cron/scraper.log 2>&1"
+        cron_line = f"{schedule} {'sleep ' + str(delay) + ' && ' if delay else ''}{command}"
         cron_lines.append(f"# {config.get('name', crawler_id)}")
         cron_lines.append(cron_line)
         cron_lines.append("")
@@ -0,0 +1,28 @@
+"""
+pytest setup for the generic scraper modules.
+The modules read their directories from the environment at import time, so
+they are pointed at a scratch directory here, before any test imports them.
+"""
+import os
+import shutil
+import tempfile
+import uuid
+
+import pytest
+
+_SCRATCH = tempfile.mkdtemp(prefix='gs_scraper_tests_')
+os.environ['CONFIG_DIR'] = os.path.join(_SCRATCH, 'configs')
+os.environ['OUTPUT_DIR'] = os.path.join(_SCRATCH, 'output')
+os.environ['STATE_DIR'] = os.path.join(_SCRATCH, 'state')
+os.environ['REGISTRY_CACHE_DIR'] = os.path.join(_SCRATCH, 'registry')
+os.environ.pop('RATE_LIMIT_DB', None)
+
+
+@pytest.fixture
+def crawler_id():
+    """A crawler id no other test uses, so state files in STATE_DIR don't mix."""
+    return f"test_{uuid.uuid4().hex[:8]}"
+
+
+def pytest_sessionfinish(session, exitstatus):
+    shutil.rmtree(_SCRATCH, ignore_errors=True)
@@ -0,0 +1,125 @@
+"""
+Bytes-first decoding of fetched pages.
+Parsers get the raw response body plus an encoding taken from a BOM, the
+Content-Type header, the document's own declaration (<meta charset>, XML
+declaration) or a per-host guess cached in STATE_DIR/encodings.json. This
+avoids `response.text`, which runs charset detection over the whole body
+whenever the server sends no charset.
+"""
+import codecs
+import re
+import threading
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+
+from state_store import JsonStore
+
+
+# Declarations must appear early in the document
+SNIFF_BYTES = 4096
+
+_BOMS = ((codecs.BOM_UTF8, 'utf-8-sig'), (codecs.BOM_UTF16_LE, 'utf-16'), (codecs.BOM_UTF16_BE, 'utf-16'))
+_CHARSET_RE = re.compile(rb'''<meta[^>]+charset\s*=\s*["']?\s*([\w.:-]+)''', re.IGNORECASE)
+_XML_DECL_RE = re.compile(rb'''^\s*<\?xml[^>]+encoding\s*=\s*["']([\w.:-]+)''')
+
+
+def normalize_encoding(name: Optional[str]) -> Optional[str]:
+    """Python codec name for a declared charset (None if unknown).
+
+    Latin-1 and ASCII labels are read as windows-1252, as browsers do.
+    """
+    if not name:
+        return None
+    try:
+        codec = codecs.lookup(name.strip().strip('"\'')).name
+    except LookupError:
+        return None
+    return 'cp1252' if codec in ('latin-1', 'iso8859-1', 'ascii') else codec
+
+
+def header_charset(content_type: str) -> Optional[str]:
+    """The charset parameter of a Content-Type header."""
+    for param in content_type.split(';')[1:]:
+        key, _, value = param.partition('=')
+        if key.strip().lower() == 'charset':
+            return normalize_encoding(value)
+    return None
+
+
+def declared_charset(content: bytes) -> Optional[str]:
+    """Encoding declared by a BOM, an XML declaration or a <meta> tag."""
+    for bom, encoding in _BOMS:
+        if content.startswith(bom):
+            return encoding
+    head = content[:SNIFF_BYTES]
+    match = _XML_DECL_RE.match(head) or _CHARSET_RE.search(head)
+    return normalize_encoding(match.group(1).decode('ascii')) if match else None
+
+
+def guess_encoding(content: bytes) -> str:
+    """UTF-8 if the body decodes as such, otherwise windows-1252."""
+    try:
+        content.decode('utf-8')
+        return 'utf-8'
+    except UnicodeDecodeError:
+        return 'cp1252'
+
+
+class EncodingCache:
+    """Guessed encoding per host, so the guess is only made once."""
+
+    def __init__(self, store: Optional[JsonStore] = None):
+        self.store = store or JsonStore('encodings.json')
+        self._lock = threading.Lock()
+        self._hosts: Optional[Dict[str, str]] = None
+
+    def get(self, host: str) -> Optional[str]:
+        with self._lock:
+            if self._hosts is None:
+                self._hosts = self.store.load()
+            return self._hosts.get(host)
+
+    def set(self, host: str, encoding: str):
+        with self._lock:
+            if self._hosts is not None:
+                self._hosts[host] = encoding
+        with self.store.transaction() as data:
+            data[host] = encoding
+
+
+ENCODING_CACHE = EncodingCache()
+
+
+def detect_encoding(response: requests.Response,
+                    cache: Optional[EncodingCache] = ENCODING_CACHE) -> Tuple[str, str]:
+    """Encoding of a response body and where it came from (bom/header/declared/default/cached/guessed)."""
+    content = response.content
+    for bom, encoding in _BOMS:
+        if content.startswith(bom):
+            return encoding, 'bom'
+
+    content_type = response.headers.get('Content-Type', '')
+    encoding = header_charset(content_type)
+    if encoding:
+        return encoding, 'header'
+
+    encoding = declared_charset(content)
+    if encoding:
+        return encoding, 'declared'
+
+    # JSON and XML without a declaration are UTF-8 by definition
+    if content_type.split(';')[0].strip().lower().endswith(('json', 'xml')):
+        return 'utf-8', 'default'
+
+    host = urlparse(response.url or '').netloc.lower()
+    encoding = cache.get(host) if cache and host else None
+    if encoding:
+        return encoding, 'cached'
+
+    encoding = guess_encoding(content)
+    if cache and host:
+        cache.set(host, encoding)
+    return encoding, 'guessed'
+
@@ -0,0 +1,116 @@
+"""
+Detail-page enrichment for the generic scraper.
+Fetches the detail URL of every entry on a bounded worker pool, applies the
+config's detail selector plan and caches the extracted values per URL, so
+later runs only fetch new or expired items.
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Callable
+
+import requests
+
+from decoding import detect_encoding
+from parsers import get_engine
+from state_store import JsonStore
+
+
+class DetailCache:
+    """Extracted detail values per URL with fetch time and HTTP validators."""
+
+    def __init__(self, crawler_id: str):
+        self.store = JsonStore(f'detail-cache-{crawler_id}.json')
+        self.entries = self.store.load()
+
+    def get(self, url: str, fingerprint: str) -> Optional[Dict[str, Any]]:
+        cached = self.entries.get(url)
+        if cached and cached.get('fingerprint') == fingerprint:
+            return cached
+        return None
+
+    def save(self, results: Dict[str, Dict[str, Any]]):
+        """Replace the cache with the current run's URLs (drops vanished items)."""
+        with self.store.transaction() as data:
+            data.clear()
+            data.update(results)
+
+
+def _fetch_detail(url: str, cached: Optional[Dict[str, Any]], plan, engine,
+                  fetch: Callable[[str, Dict[str, str]], requests.Response]) -> Dict[str, Any]:
+    """Fetch one detail page (conditionally if cached) and extract its fields."""
+    headers = {}
+    if cached:
+        if cached.get('etag'):
+            headers['If-None-Match'] = cached['etag']
+        if cached.get('last_modified'):
+            headers['If-Modified-Since'] = cached['last_modified']
+
+    response = fetch(url, headers)
+    if response.status_code == 304 and cached:
+        return dict(cached, fetched_at=time.time(), result='revalidated')
+
+    document = engine.parse(response.content, None, detect_encoding(response)[0])
+    values = {field: field_plan.extract(document, engine) for field, field_plan in plan.fields}
+    engine.free(document)
+
+    return {
+        'values': values,
+        'etag': response.headers.get('ETag'),
+        'last_modified': response.headers.get('Last-Modified'),
+        'fingerprint': plan.fingerprint,
+        'fetched_at': time.time(),
+        'result': 'fetched',
+    }
+
+
+def enrich_entries(entries: List[Dict[str, Any]], config: Dict[str, Any], plan,
+                   fetch: Callable[[str, Dict[str, str]], requests.Response]):
+    """Fill entry fields from their detail pages, using the per-URL cache."""
+    # The detail plan's own engine: a JSON or feed listing still links to HTML pages
+    engine = get_engine(plan.parser)
+    cache = DetailCache(config['id'])
+    now = time.time()
+    results: Dict[str, Dict[str, Any]] = {}
+    to_fetch = []
+
+    for url in dict.fromkeys(entry.get(plan.url_field) for entry in entries):
+        if not url:
+            continue
+        cached = cache.get(url, plan.fingerprint)
+        if cached and now - cached.get('fetched_at', 0) < plan.ttl:
+            results[url] = dict(cached, result='cached')
+        else:
+            to_fetch.append((url, cached))
+
+    def worker(job):
+        url, cached = job
+        try:
+            return url, _fetch_detail(url, cached, plan, engine, fetch)
+        except Exception as e:
+            print(f"Detail fetch failed for {url}: {e}")
+            # Keep serving the last known values of a failing detail page
+            return url, dict(cached, result='failed') if cached else None
+
+    if to_fetch:
+        with ThreadPoolExecutor(max_workers=max(1, min(plan.workers, len(to_fetch))),
+                                thread_name_prefix='detail') as executor:
+            for url, result in executor.map(worker, to_fetch):
+                if result is not None:
+                    results[url] = result
+
+    for entry in entries:
+        result = results.get(entry.get(plan.url_field))
+        if not result:
+            continue
+        for field, value in result['values'].items():
+            if value is not None:
+                entry[field] = value
+
+    counts: Dict[str, int] = {}
+    for result in results.values():
+        counts[result['result']] = counts.get(result['result'], 0) + 1
+        result.pop('result', None)
+    cache.save(results)
+
+    summary = ', '.join(f"{count} {name}" for name, count in sorted(counts.items())) or 'none'
+    print(f"Detail pages for {config['id']}: {summary}")
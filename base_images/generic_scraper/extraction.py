@@ -0,0 +1,261 @@
+"""
+Compiled extraction plans.
+A config's selectors are resolved and compiled once at load time into an
+immutable plan that scrape_simple / scrape_nested execute per container.
+Plans are parser-independent; node access goes through a parser engine.
+`type: json` configs compile their selectors as JSONPath expressions.
+"""
+import json
+import hashlib
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, Tuple
+
+import soupsieve
+
+from config_loader import get_selector_config
+from json_path import JsonPath
+from parsers import DEFAULT_ENGINE, PARSERS, ParseScope
+
+
+SIMPLE_FIELDS = ('title', 'description', 'image_url', 'call_to_action_url')
+
+# Outcomes of FieldPlan.lookup (indexes into SelectorStats counters)
+MATCH, FALLBACK, EMPTY = 0, 1, 2
+
+
+@dataclass(frozen=True)
+class Selector:
+    """A selector as written in the config plus its compilation (soupsieve or JsonPath)."""
+    css: str
+    compiled: Any
+
+
+def selector_syntax(config: Dict[str, Any]) -> str:
+    """'jsonpath' for `type: json` configs, 'css' otherwise."""
+    return 'jsonpath' if config.get('type') == 'json' else 'css'
+
+
+def compile_selector(selector: str, syntax: str = 'css') -> Optional[Selector]:
+    """Compile a CSS selector with soupsieve or a JSONPath expression (None for an empty selector)."""
+    if not selector:
+        return None
+    if syntax == 'jsonpath':
+        return Selector(selector, JsonPath(selector))
+    return Selector(selector, soupsieve.compile(selector))
+
+
+@dataclass(frozen=True)
+class FieldPlan:
+    """One field: compiled selector plus resolved attribute, prefix and fallbacks."""
+    selector: Optional[Selector]
+    attribute: str = 'text'
+    prefix: str = ''
+    fallback: Optional[str] = None
+    default: Optional[str] = None
+
+    @classmethod
+    def from_config(cls, selector_config: Dict[str, Any], syntax: str = 'css') -> 'FieldPlan':
+        return cls(
+            selector=compile_selector(selector_config.get('selector', ''), syntax),
+            attribute=selector_config.get('attribute') or 'text',
+            prefix=selector_config.get('prefix') or '',
+            fallback=selector_config.get('fallback'),
+            default=selector_config.get('default'),
+        )
+
+    @property
+    def missing(self) -> Optional[str]:
+        return self.fallback if self.fallback is not None else self.default
+
+    def extract(self, element, engine=DEFAULT_ENGINE) -> Optional[str]:
+        """The value of the first match, else the fallback or default."""
+        return self.lookup(element, engine)[0]
+
+    def lookup(self, element, engine=DEFAULT_ENGINE) -> Tuple[Optional[str], int]:
+        """The extracted value and whether it was a MATCH, a FALLBACK/default or EMPTY."""
+        if self.selector is None:
+            return self.default, EMPTY
+
+        found = engine.select_one(element, self.selector)
+        if found is not None:
+            if self.attribute == 'text':
+                value = engine.text(found)
+            else:
+                value = engine.attr(found, self.attribute)
+
+            if value:
+                if self.prefix and not value.startswith(('http://', 'https://')):
+                    value = self.prefix + value
+                return value, MATCH
+
+        missing = self.missing
+        return missing, FALLBACK if missing else EMPTY
+
+
+@dataclass(frozen=True)
+class DetailPlan:
+    """Second selector plan applied to each entry's detail page."""
+    url_field: str
+    fields: Tuple[Tuple[str, FieldPlan], ...]
+    ttl: int
+    workers: int
+    fingerprint: str
+    # Engine for the detail pages, independent of how the listing is parsed
+    parser: str = 'html.parser'
+
+
+@dataclass(frozen=True)
+class SimplePlan:
+    """Plan for `type: simple` configs."""
+    container: Optional[Selector]
+    fields: Tuple[Tuple[str, FieldPlan], ...]
+    scope: Optional[ParseScope] = None
+    detail: Optional[DetailPlan] = None
+
+
+@dataclass(frozen=True)
+class NestedPlan:
+    """Plan for `type: nested` configs (category containers with items)."""
+    container: Optional[Selector]
+    category_title: FieldPlan
+    items: Optional[Selector]
+    image_url: Optional[FieldPlan]
+    call_to_action_url: Optional[FieldPlan]
+    cta_template: Optional[str]
+    item_id_attribute: str
+    title_override: Optional[str]
+    scope: Optional[ParseScope] = None
+    detail: Optional[DetailPlan] = None
+
+
+@dataclass(frozen=True)
+class FeedPlan:
+    """Plan for `type: feed` configs; RSS/Atom items map onto the entry fields without selectors."""
+    max_items: int
+    stop_at_seen: bool
+    scope: Optional[ParseScope] = None
+    detail: Optional[DetailPlan] = None
+
+
+def compile_scope(config: Dict[str, Any]) -> Optional[ParseScope]:
+    """Resolve the optional `parse_scope` of a config.
+
+    `auto` derives the scope from the container selector and falls back to a
+    full parse if that is not possible; an explicit selector must be valid.
+    """
+    parse_scope = config.get('parse_scope')
+    if not parse_scope:
+        return None
+
+    if (config.get('pagination') or {}).get('next_selector'):
+        print(f"Warning: parse_scope ignored for {config['id']}: next-link pagination needs the full page")
+        return None
+
+    if parse_scope == 'auto':
+        container = config['selectors'].get('container', '')
+        scope = ParseScope.from_selector(container)
+        if scope is None:
+            print(f"Warning: parse_scope 'auto' not possible for container '{container}' "
+                  f"in {config['id']}, parsing the full page")
+        return scope
+
+    scope = ParseScope.from_selector(parse_scope)
+    if scope is None:
+        raise ValueError(f"Unsupported parse_scope '{parse_scope}': use a simple selector "
+                         f"like 'main.content' or '#list' without pseudo-classes")
+    return scope
+
+
+def compile_detail(config: Dict[str, Any]) -> Optional[DetailPlan]:
+    """Compile the optional `detail` block of a config."""
+    detail = config.get('detail')
+    if not detail:
+        return None
+
+    fields = detail.get('fields') or {}
+    if not fields:
+        raise ValueError(f"'detail' needs at least one entry in 'fields' for {config['id']}")
+    # Detail pages are HTML unless stated otherwise, also for JSON listings
+    listing_parser = config.get('parser', 'html.parser')
+    parser = detail.get('parser') or (listing_parser if listing_parser in PARSERS else 'html.parser')
+    if parser != 'json' and parser not in PARSERS:
+        raise ValueError(f"Unknown detail parser '{parser}' for {config['id']}, "
+                         f"expected one of: {', '.join(PARSERS + ('json',))}")
+    syntax = 'jsonpath' if parser == 'json' else 'css'
+
+    canonical = json.dumps(detail, sort_keys=True, ensure_ascii=False, default=str)
+    return DetailPlan(
+        url_field=detail.get('url_field', 'call_to_action_url'),
+        fields=tuple(
+            (field, FieldPlan.from_config(get_selector_config(fields, field), syntax))
+            for field in fields
+        ),
+        ttl=int(detail.get('ttl', 86400)),
+        workers=int(detail.get('workers', 4)),
+        fingerprint=hashlib.sha1(canonical.encode('utf-8')).hexdigest(),
+        parser=parser,
+    )
+
+
+def compile_simple(config: Dict[str, Any]) -> SimplePlan:
+    """Plan for `type: simple` and `type: json` configs (same fields, different selector syntax)."""
+    selectors = config['selectors']
+    syntax = selector_syntax(config)
+    return SimplePlan(
+        container=compile_selector(selectors.get('container', ''), syntax),
+        fields=tuple(
+            (field, FieldPlan.from_config(get_selector_config(selectors, field), syntax))
+            for field in SIMPLE_FIELDS
+        ),
+        # A JSON payload is always decoded as a whole
+        scope=compile_scope(config) if syntax == 'css' else None,
+        detail=compile_detail(config),
+    )
+
+
+def compile_nested(config: Dict[str, Any]) -> NestedPlan:
+    selectors = config['selectors']
+    items_config = selectors.get('items', {})
+    image_config = items_config.get('image_url', {})
+    cta_config = items_config.get('call_to_action_url', {})
+    cta_template = cta_config.get('template')
+
+    return NestedPlan(
+        container=compile_selector(selectors.get('container', '')),
+        category_title=FieldPlan.from_config(get_selector_config(selectors, 'category_title')),
+        items=compile_selector(items_config.get('selector', '')),
+        image_url=FieldPlan.from_config(image_config) if image_config else None,
+        call_to_action_url=None if cta_template else FieldPlan.from_config(cta_config),
+        cta_template=cta_template,
+        item_id_attribute=cta_config.get('item_id_attribute', 'id'),
+        title_override=config.get('output', {}).get('single', {}).get('title_override'),
+        scope=compile_scope(config),
+        detail=compile_detail(config),
+    )
+
+
+def compile_feed(config: Dict[str, Any]) -> FeedPlan:
+    feed = config.get('feed') or {}
+    return FeedPlan(
+        max_items=int(feed.get('max_items', 50)),
+        stop_at_seen=bool(feed.get('stop_at_seen', True)),
+        detail=compile_detail(config),
+    )
+
+
+def compile_plan(config: Dict[str, Any]):
+    """Compile the selectors of a config into an extraction plan."""
+    if config.get('type', 'simple') == 'nested':
+        return compile_nested(config)
+    if config.get('type') == 'feed':
+        return compile_feed(config)
+    return compile_simple(config)
+
+
+def get_plan(config: Dict[str, Any]):
+    """Return the compiled plan of a config, compiling it on first use."""
+    plan = config.get('_plan')
+    if plan is None:
+        plan = compile_plan(config)
+        config['_plan'] = plan
+    return plan
@@ -0,0 +1,177 @@
+"""
+RSS 2.0 and Atom feeds for `type: feed` configs.
+Items are read with an incremental parser in document order and reading stops
+at the first item already known from the previous run, so a run only maps the
+new items. Known items come from STATE_DIR/feed-<id>.json.
+"""
+import html
+import io
+import re
+import time
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from typing import Dict, Any, List, Optional, Set, Tuple
+from urllib.parse import urljoin
+from xml.etree import ElementTree
+
+import requests
+
+from extraction import get_plan
+from run_metrics import RunMetrics
+from state_store import JsonStore
+
+
+ATOM = '{http://www.w3.org/2005/Atom}'
+MEDIA = '{http://search.yahoo.com/mrss/}'
+ITEM_TAGS = ('item', ATOM + 'entry', '{http://purl.org/rss/1.0/}item')
+
+_TAG_RE = re.compile(r'<[^>]+>')
+_IMG_RE = re.compile(r'<img[^>]+src=["\']([^"\']+)', re.IGNORECASE)
+
+
+def validate_feed(config: Dict[str, Any], config_path: str):
+    """Check the optional `feed` block and options that do not apply to feeds."""
+    if config.get('type') != 'feed':
+        return
+    if config.get('pagination'):
+        raise ValueError(f"'pagination' is not supported for 'type: feed' in {config_path}")
+    feed = config.get('feed') or {}
+    if not isinstance(feed, dict):
+        raise ValueError(f"'feed' must be a mapping in {config_path}")
+    if int(feed.get('max_items', 50)) < 1:
+        raise ValueError(f"'feed.max_items' must be at least 1 in {config_path}")
+
+
+def _text(element: Optional[ElementTree.Element]) -> str:
+    return (element.text or '').strip() if element is not None else ''
+
+
+def plain_text(markup: str) -> str:
+    """Feed descriptions are often HTML: drop tags, unescape entities, collapse whitespace."""
+    return ' '.join(html.unescape(_TAG_RE.sub(' ', markup)).split())
+
+
+def feed_date(value: str) -> Optional[str]:
+    """RFC 822 (RSS) or ISO 8601 (Atom) date as local '%Y-%m-%dT%H:%M'."""
+    if not value:
+        return None
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        try:
+            parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    return parsed.strftime('%Y-%m-%dT%H:%M')
+
+
+def _image(item: ElementTree.Element, markup: str) -> Optional[str]:
+    for child in item:
+        if child.tag == 'enclosure' and child.get('type', '').startswith('image/'):
+            return child.get('url')
+        if child.tag in (MEDIA + 'content', MEDIA + 'thumbnail') and child.get('url') and (
+                child.get('medium', 'image') == 'image' or child.get('type', '').startswith('image/')):
+            return child.get('url')
+        if child.tag == ATOM + 'link' and child.get('rel') == 'enclosure' \
+                and child.get('type', '').startswith('image/'):
+            return child.get('href')
+    match = _IMG_RE.search(markup)
+    return html.unescape(match.group(1)) if match else None
+
+
+def item_entry(item: ElementTree.Element, base_url: str) -> Tuple[str, Dict[str, Any]]:
+    """Map an RSS <item> or Atom <entry> onto the entry fields; returns (key, entry)."""
+    if item.tag == ATOM + 'entry':
+        links = item.findall(ATOM + 'link')
+        link = next((l.get('href') for l in links if l.get('rel', 'alternate') == 'alternate'), None)
+        markup = _text(item.find(ATOM + 'summary')) or _text(item.find(ATOM + 'content'))
+        title = _text(item.find(ATOM + 'title'))
+        guid = _text(item.find(ATOM + 'id'))
+        date = _text(item.find(ATOM + 'published')) or _text(item.find(ATOM + 'updated'))
+    else:
+        namespace = item.tag[:-len('item')]
+        link = _text(item.find(namespace + 'link'))
+        markup = _text(item.find(namespace + 'description'))
+        title = _text(item.find(namespace + 'title'))
+        guid = _text(item.find('guid')) or item.get('{http://www.w3.org/1999/02/22-rdf-syntax-ns#}about', '')
+        date = _text(item.find('pubDate')) or _text(item.find('{http://purl.org/dc/elements/1.1/}date'))
+
+    link = urljoin(base_url, link) if link else None
+    image = _image(item, markup)
+    entry = {
+        'title': plain_text(title),
+        'description': plain_text(markup),
+        'image_url': urljoin(base_url, image) if image else None,
+        'call_to_action_url': link,
+        'published_at': feed_date(date),
+    }
+    return guid or link or entry['title'], entry
+
+
+def read_items(source: bytes, base_url: str, known: Set[str], limit: int,
+               stop_at_known: bool = True) -> Tuple[List[Tuple[str, Dict[str, Any]]], int, bool]:
+    """Parse items in document order until a known item (or `limit` new ones).
+
+    Returns (new items, items parsed, stopped early). Processed elements are
+    cleared right away, so memory stays flat for large feeds.
+    """
+    items = []
+    parsed = 0
+    stopped = False
+    for _, element in ElementTree.iterparse(io.BytesIO(source), events=('end',)):
+        if element.tag not in ITEM_TAGS:
+            continue
+        parsed += 1
+        key, entry = item_entry(element, base_url)
+        element.clear()
+        if key in known:
+            if stop_at_known:
+                stopped = True
+                break
+            continue
+        if any(key == new_key for new_key, _ in items):
+            continue
+        items.append((key, entry))
+        if len(items) >= limit:
+            stopped = True
+            break
+    return items, parsed, stopped
+
+
+def scrape_feed(response: requests.Response, config: Dict[str, Any],
+                metrics: Optional[RunMetrics] = None) -> List[Dict[str, Any]]:
+    """New feed items followed by the known ones, newest first, at most `max_items`."""
+    plan = get_plan(config)
+    store = JsonStore(f"feed-{config['id']}.json")
+    known_items = store.load().get('items', [])
+    known = {item['key'] for item in known_items}
+
+    parse_start = time.perf_counter()
+    try:
+        new_items, parsed, stopped = read_items(response.content, config.get('base_url') or response.url,
+                                                known, plan.max_items, plan.stop_at_seen)
+    except ElementTree.ParseError as e:
+        raise ValueError(f"Invalid feed at {response.url}: {e}") from None
+    parse_time = time.perf_counter() - parse_start
+    if metrics:
+        metrics.add('parse_ms', parse_time * 1000)
+        metrics.set('feed_items_parsed', parsed)
+        metrics.set('feed_items_new', len(new_items))
+
+    now = datetime.now().strftime('%Y-%m-%dT%H:%M')
+    new_keys = {key for key, _ in new_items}
+    merged = [{'key': key, 'entry': dict(entry, published_at=entry['published_at'] or now)}
+              for key, entry in new_items]
+    merged += [item for item in known_items if item['key'] not in new_keys]
+    merged = merged[:plan.max_items]
+
+    if new_items or len(merged) != len(known_items):
+        with store.transaction() as data:
+            data['items'] = merged
+
+    print(f"Feed {config['id']}: {len(new_items)} new of {parsed} parsed items"
+          f"{' (stopped at a known item)' if stopped and parsed > len(new_items) else ''} "
+          f"in {parse_time * 1000:.1f} ms, {len(merged)} entries")
+    return [dict({'id': index + 1}, **item['entry']) for index, item in enumerate(merged)]
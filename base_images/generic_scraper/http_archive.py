@@ -0,0 +1,296 @@
+"""
+HTTP record/replay archive for deterministic offline crawler runs.
+
+install() patches the three ways crawlers talk HTTP:
+requests (HTTPAdapter.send), urllib.request (OpenerDirector.open) and
+`curl` invoked through subprocess.run. In record mode every exchange is
+stored in a SQLite archive; in replay mode responses come from the archive
+and nothing touches the network. Request headers are never stored, so API
+keys do not end up in archives.
+
+Configured through the environment (scripts/test-crawler.py sets these):
+
+    HTTP_ARCHIVE_MODE   record | replay (unset: archive disabled)
+    HTTP_ARCHIVE        Archive file, e.g. test_archives/002_gz.sqlite
+    HTTP_ARCHIVE_SPEED  Replay timing: 0 = instant (default), 1 = recorded
+                        response times, 2 = twice as fast, ...
+
+    python http_archive.py ARCHIVE      # List the exchanges of an archive
+"""
+import email.message
+import hashlib
+import io
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+import urllib.response
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional, Tuple
+
+
+HTTP_ARCHIVE_MODE = os.environ.get('HTTP_ARCHIVE_MODE', '')
+HTTP_ARCHIVE = os.environ.get('HTTP_ARCHIVE', '')
+HTTP_ARCHIVE_SPEED = float(os.environ.get('HTTP_ARCHIVE_SPEED', '0') or 0)
+
+
+class HttpArchive:
+    """Exchanges keyed by method, URL and request body; repeated requests replay in order."""
+
+    def __init__(self, path: str, mode: str, speed: float = 0.0):
+        if mode not in ('record', 'replay'):
+            raise ValueError(f"HTTP archive mode must be 'record' or 'replay', not {mode!r}")
+        if mode == 'replay' and not os.path.exists(path):
+            raise FileNotFoundError(f"HTTP archive not found: {path}")
+        self.path = path
+        self.mode = mode
+        self.speed = speed
+        self._lock = threading.Lock()
+        self._replayed: Dict[str, int] = {}
+        self._recorded: Dict[str, int] = {}
+
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS exchanges ('
+            'key TEXT NOT NULL, seq INTEGER NOT NULL, client TEXT NOT NULL, method TEXT NOT NULL, '
+            'url TEXT NOT NULL, status INTEGER NOT NULL, reason TEXT, headers TEXT NOT NULL, '
+            'body BLOB NOT NULL, elapsed REAL NOT NULL, recorded_at TEXT NOT NULL, '
+            'PRIMARY KEY (key, seq))'
+        )
+        if mode == 'record':
+            # A recording replaces the previous one
+            self._db.execute('DELETE FROM exchanges')
+
+    @staticmethod
+    def key(method: str, url: str, body: Optional[bytes] = None) -> str:
+        digest = hashlib.sha1(body).hexdigest()[:12] if body else ''
+        return f"{method.upper()} {url} {digest}".rstrip()
+
+    def record(self, client: str, method: str, url: str, request_body: Optional[bytes], status: int,
+               reason: str, headers: List[Tuple[str, str]], body: bytes, elapsed: float):
+        key = self.key(method, url, request_body)
+        with self._lock:
+            seq = self._recorded.get(key, 0)
+            self._recorded[key] = seq + 1
+            self._db.execute(
+                'INSERT OR REPLACE INTO exchanges VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (key, seq, client, method.upper(), url, status, reason, json.dumps(headers), body,
+                 elapsed, datetime.now().strftime('%Y-%m-%dT%H:%M:%S'))
+            )
+
+    def lookup(self, method: str, url: str, request_body: Optional[bytes] = None) -> Optional[Dict[str, Any]]:
+        """The next recorded exchange for this request (the last one again once exhausted)."""
+        key = self.key(method, url, request_body)
+        with self._lock:
+            seq = self._replayed.get(key, 0)
+            row = self._db.execute(
+                'SELECT status, reason, headers, body, elapsed FROM exchanges '
+                'WHERE key = ? AND seq <= ? ORDER BY seq DESC LIMIT 1', (key, seq)
+            ).fetchone()
+            self._replayed[key] = seq + 1
+        if row is None:
+            return None
+        status, reason, headers, body, elapsed = row
+        if self.speed > 0:
+            time.sleep(elapsed / self.speed)
+        return {'status': status, 'reason': reason or '', 'headers': json.loads(headers),
+                'body': bytes(body), 'elapsed': elapsed}
+
+    def exchanges(self) -> List[Tuple]:
+        return self._db.execute(
+            'SELECT client, method, url, status, length(body), elapsed FROM exchanges ORDER BY rowid'
+        ).fetchall()
+
+
+def _miss_message(method: str, url: str) -> str:
+    return f"Not in HTTP archive ({HTTP_ARCHIVE}): {method.upper()} {url}"
+
+
+def _patch_requests(archive: HttpArchive):
+    try:
+        import requests
+        from requests.adapters import HTTPAdapter
+        from requests.structures import CaseInsensitiveDict
+        from urllib3 import HTTPResponse
+    except ImportError:
+        return
+
+    original_send = HTTPAdapter.send
+
+    def send(self, request, **kwargs):
+        body = request.body.encode('utf-8') if isinstance(request.body, str) else request.body
+        if archive.mode == 'replay':
+            exchange = archive.lookup(request.method, request.url, body)
+            if exchange is None:
+                raise requests.ConnectionError(_miss_message(request.method, request.url), request=request)
+            response = requests.Response()
+            response.status_code = exchange['status']
+            response.reason = exchange['reason']
+            response.headers = CaseInsensitiveDict(exchange['headers'])
+            response._content = exchange['body']
+            response._content_consumed = True
+            # The archive stores the decoded body, so raw must not decode it again
+            response.raw = HTTPResponse(
+                body=io.BytesIO(exchange['body']), status=exchange['status'], reason=exchange['reason'],
+                headers=[(name, value) for name, value in exchange['headers']
+                         if name.lower() not in ('content-encoding', 'transfer-encoding')],
+                preload_content=False, decode_content=False,
+            )
+            response.url = request.url
+            response.request = request
+            response.connection = self
+            response.elapsed = timedelta(seconds=exchange['elapsed'])
+            response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+            return response
+
+        start = time.perf_counter()
+        response = original_send(self, request, **kwargs)
+        content = response.content  # reads the body so it can be stored
+        archive.record('requests', request.method, request.url, body, response.status_code,
+                       response.reason or '', list(response.headers.items()), content,
+                       time.perf_counter() - start)
+        return response
+
+    HTTPAdapter.send = send
+
+
+def _patch_urllib(archive: HttpArchive):
+    original_open = urllib.request.OpenerDirector.open
+
+    def build_response(url: str, status: int, reason: str, headers: List[Tuple[str, str]], body: bytes):
+        message = email.message.Message()
+        for name, value in headers:
+            message[name] = value
+        if status >= 400:
+            raise urllib.error.HTTPError(url, status, reason, message, io.BytesIO(body))
+        response = urllib.response.addinfourl(io.BytesIO(body), message, url, status)
+        response.reason = reason
+        return response
+
+    def open_(self, fullurl, data=None, timeout=None, *args, **kwargs):
+        request = fullurl if isinstance(fullurl, urllib.request.Request) else urllib.request.Request(fullurl, data)
+        body = data if data is not None else request.data
+        method = request.get_method()
+        url = request.full_url
+
+        if archive.mode == 'replay':
+            exchange = archive.lookup(method, url, body)
+            if exchange is None:
+                raise urllib.error.URLError(_miss_message(method, url))
+            return build_response(url, exchange['status'], exchange['reason'], exchange['headers'], exchange['body'])
+
+        start = time.perf_counter()
+        try:
+            if timeout is None:
+                response = original_open(self, fullurl, data, *args, **kwargs)
+            else:
+                response = original_open(self, fullurl, data, timeout, *args, **kwargs)
+        except urllib.error.HTTPError as e:
+            content = e.read()
+            archive.record('urllib', method, url, body, e.code, str(e.reason), list(e.headers.items()),
+                           content, time.perf_counter() - start)
+            return build_response(url, e.code, str(e.reason), list(e.headers.items()), content)
+        with response:
+            content = response.read()
+            status = getattr(response, 'status', None) or response.getcode() or 200
+            reason = getattr(response, 'reason', '') or ''
+            headers = list(response.headers.items())
+        archive.record('urllib', method, url, body, status, reason, headers, content, time.perf_counter() - start)
+        return build_response(response.geturl(), status, reason, headers, content)
+
+    urllib.request.OpenerDirector.open = open_
+
+
+def _curl_url(command: List[str]) -> Tuple[str, str]:
+    """Method and URL of a curl command line (the last argument that is not an option value)."""
+    method = 'GET'
+    url = ''
+    takes_value = {'-H', '--header', '-w', '--write-out', '-X', '--request', '-d', '--data',
+                   '-o', '--output', '-A', '--user-agent', '-u', '--user', '--max-time', '-m'}
+    skip = False
+    for index, arg in enumerate(command[1:], start=1):
+        if skip:
+            skip = False
+            continue
+        if arg in ('-X', '--request'):
+            method = command[index + 1] if index + 1 < len(command) else method
+        if arg in takes_value:
+            skip = True
+        elif not arg.startswith('-'):
+            url = arg
+    return method, url
+
+
+def _patch_curl(archive: HttpArchive):
+    original_run = subprocess.run
+
+    def run(command, *args, **kwargs):
+        if not (isinstance(command, (list, tuple)) and command and os.path.basename(str(command[0])) == 'curl'):
+            return original_run(command, *args, **kwargs)
+        method, url = _curl_url([str(arg) for arg in command])
+        text = kwargs.get('text') or kwargs.get('universal_newlines') or kwargs.get('encoding')
+
+        if archive.mode == 'replay':
+            exchange = archive.lookup(method, url)
+            if exchange is None:
+                stdout, stderr, returncode = b'', _miss_message(method, url).encode('utf-8'), 7
+            else:
+                stdout, stderr, returncode = exchange['body'], exchange['reason'].encode('utf-8'), exchange['status']
+            if text:
+                stdout, stderr = stdout.decode('utf-8', 'replace'), stderr.decode('utf-8', 'replace')
+            completed = subprocess.CompletedProcess(command, returncode, stdout, stderr)
+            if kwargs.get('check') and returncode:
+                raise subprocess.CalledProcessError(returncode, command, stdout, stderr)
+            return completed
+
+        start = time.perf_counter()
+        completed = original_run(command, *args, **kwargs)
+        stdout = completed.stdout or b''
+        stderr = completed.stderr or b''
+        # curl output is stored as is; its exit code takes the place of the HTTP status
+        archive.record('curl', method, url, None, completed.returncode,
+                       stderr if isinstance(stderr, str) else stderr.decode('utf-8', 'replace'),
+                       [], stdout.encode('utf-8') if isinstance(stdout, str) else stdout,
+                       time.perf_counter() - start)
+        return completed
+
+    subprocess.run = run
+
+
+_installed: Optional[HttpArchive] = None
+
+
+def install(path: str = HTTP_ARCHIVE, mode: str = HTTP_ARCHIVE_MODE,
+            speed: float = HTTP_ARCHIVE_SPEED) -> Optional[HttpArchive]:
+    """Patch requests, urllib and curl calls to record into / replay from the archive.
+
+    Does nothing if no mode is configured; safe to call more than once.
+    """
+    global _installed
+    if _installed is not None or not mode:
+        return _installed
+    if not path:
+        raise ValueError("HTTP_ARCHIVE must name the archive file when HTTP_ARCHIVE_MODE is set")
+    archive = HttpArchive(path, mode, speed)
+    _patch_requests(archive)
+    _patch_urllib(archive)
+    _patch_curl(archive)
+    _installed = archive
+    print(f"HTTP archive: {mode} {path}", file=sys.stderr)
+    return archive
+
+
+if __name__ == '__main__':
+    if len(sys.argv) != 2 or sys.argv[1] in ('-h', '--help'):
+        print(__doc__)
+        sys.exit(0 if len(sys.argv) == 2 else 1)
+    rows = HttpArchive(sys.argv[1], 'replay').exchanges()
+    for client, method, url, status, size, elapsed in rows:
+        print(f"{client:8} {method:6} {status:4} {size:9} B {elapsed * 1000:8.1f} ms  {url}")
+    print(f"{len(rows)} exchanges")
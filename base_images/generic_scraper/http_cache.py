@@ -0,0 +1,95 @@
+"""
+Conditional HTTP fetching support.
+Stores ETag / Last-Modified validators per config and URL and counts 304 hits per config.
+"""
+from datetime import datetime
+from typing import Dict, Optional
+
+import requests
+
+from state_store import JsonStore
+
+
+class ValidatorStore:
+    """Persistent ETag / Last-Modified validators keyed by crawler id and URL.
+
+    Configs sharing a start URL keep separate entries, since each one stores
+    its own config fingerprint.
+    """
+
+    def __init__(self, store: Optional[JsonStore] = None):
+        self.store = store or JsonStore('validators.json')
+
+    @staticmethod
+    def _key(crawler_id: str, url: str) -> str:
+        return f"{crawler_id} {url}"
+
+    def conditional_headers(self, crawler_id: str, url: str, fingerprint: str = '') -> Dict[str, str]:
+        """Request headers that make the next fetch of url conditional.
+
+        Validators recorded under a different config fingerprint are ignored,
+        so editing a config always triggers a full fetch.
+        """
+        entry = self.store.load().get(self._key(crawler_id, url), {})
+        if entry.get('fingerprint', '') != fingerprint:
+            return {}
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def content_length(self, crawler_id: str, url: str) -> int:
+        """Body size of the last full response for url (0 if unknown)."""
+        return self.store.load().get(self._key(crawler_id, url), {}).get('content_length', 0)
+
+    def update(self, crawler_id: str, url: str, response: requests.Response, fingerprint: str = ''):
+        """Remember the validators of a successfully processed 200 response."""
+        key = self._key(crawler_id, url)
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+
+        with self.store.transaction() as data:
+            if not etag and not last_modified:
+                data.pop(key, None)
+                return
+            data[key] = {
+                'etag': etag,
+                'last_modified': last_modified,
+                'content_length': len(response.content),
+                'fingerprint': fingerprint,
+                'updated_at': datetime.now().strftime('%Y-%m-%dT%H:%M:%S'),
+            }
+
+    def invalidate(self, crawler_id: str, url: str):
+        with self.store.transaction() as data:
+            data.pop(self._key(crawler_id, url), None)
+
+
+class FetchMetrics:
+    """Per-config counters for conditional fetches (hits = 304 Not Modified)."""
+
+    def __init__(self, store: Optional[JsonStore] = None):
+        self.store = store or JsonStore('fetch-metrics.json')
+
+    def record(self, crawler_id: str, not_modified: bool, bytes_downloaded: int = 0, bytes_saved: int = 0):
+        with self.store.transaction() as data:
+            entry = data.setdefault(crawler_id, {
+                'hits': 0,
+                'misses': 0,
+                'bytes_downloaded': 0,
+                'bytes_saved': 0,
+            })
+            if not_modified:
+                entry['hits'] += 1
+                entry['bytes_saved'] += bytes_saved
+            else:
+                entry['misses'] += 1
+                entry['bytes_downloaded'] += bytes_downloaded
+            entry['last_result'] = 'not_modified' if not_modified else 'modified'
+            entry['last_run'] = datetime.now().strftime('%Y-%m-%dT%H:%M:%S')
+
+        total = entry['hits'] + entry['misses']
+        print(f"Conditional fetch for {crawler_id}: {'hit (304)' if not_modified else 'miss'} "
+              f"- {entry['hits']}/{total} hits, {entry['bytes_saved']} bytes saved")
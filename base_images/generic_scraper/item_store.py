@@ -0,0 +1,107 @@
+"""
+Persistent item identity for "-alle" outputs.
+Items are keyed by a hash of their canonical URL. The store keeps the time an
+item was first seen (used as published_at) and a stable id, and retains items
+that left the page for a bounded window, so runs only append or expire items.
+"""
+import hashlib
+import time
+from datetime import datetime
+from typing import Dict, Any, List
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+from state_store import JsonStore
+
+
+TRACKING_PARAMS = ('utm_', 'fbclid', 'gclid', 'mc_cid', 'mc_eid')
+
+
+def validate_history(config: Dict[str, Any], config_path: str):
+    """Check the optional `history` block of a config."""
+    history = config.get('history')
+    if history is None:
+        return
+    if not isinstance(history, dict):
+        raise ValueError(f"'history' must be a mapping in {config_path}")
+    if float(history.get('window_days', 30)) <= 0:
+        raise ValueError(f"'history.window_days' must be positive in {config_path}")
+    if int(history.get('max_items', 200)) < 1:
+        raise ValueError(f"'history.max_items' must be at least 1 in {config_path}")
+
+
+def canonical_url(url: str) -> str:
+    """Normalize a URL: lowercase scheme/host, no fragment, tracking params or trailing slash."""
+    parts = urlsplit(url.strip())
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith(TRACKING_PARAMS)
+    )
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(query), ''))
+
+
+def item_key(entry: Dict[str, Any], key_field: str) -> str:
+    """Hash of the entry's canonical URL (title and description if it has none)."""
+    value = entry.get(key_field)
+    if value:
+        source = canonical_url(str(value))
+    else:
+        source = f"{entry.get('title') or ''}\n{entry.get('description') or ''}"
+    return hashlib.sha1(source.encode('utf-8')).hexdigest()[:16]
+
+
+class ItemStore:
+    """Known items of one config with their stable id and first/last seen times."""
+
+    def __init__(self, crawler_id: str):
+        self.store = JsonStore(f'items-{crawler_id}.json')
+
+    def apply(self, entries: List[Dict[str, Any]], config: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Return the entries with stable ids and published_at, plus retained older items.
+
+        Current entries keep their page order; items no longer on the page
+        follow, most recently seen first, until they expire.
+        """
+        history = config.get('history') or {}
+        key_field = history.get('key', 'call_to_action_url')
+        window = float(history.get('window_days', 30)) * 86400
+        max_items = int(history.get('max_items', 200))
+        now = time.time()
+        added = 0
+
+        with self.store.transaction() as data:
+            items = data.setdefault('items', {})
+            next_id = data.get('next_id', max((item['id'] for item in items.values()), default=0) + 1)
+
+            current = []
+            seen = set()
+            for entry in entries:
+                key = item_key(entry, key_field)
+                if key in seen:
+                    continue
+                seen.add(key)
+                item = items.get(key)
+                if item is None:
+                    item = items[key] = {'id': next_id, 'first_seen': now}
+                    next_id += 1
+                    added += 1
+                entry['id'] = item['id']
+                entry['published_at'] = datetime.fromtimestamp(item['first_seen']).strftime('%Y-%m-%dT%H:%M')
+                item['last_seen'] = now
+                item['entry'] = entry
+                current.append(entry)
+
+            retained = sorted(
+                (key for key, item in items.items() if key not in seen and now - item['last_seen'] < window),
+                key=lambda key: (items[key]['last_seen'], items[key]['id']),
+                reverse=True,
+            )[:max(0, max_items - len(current))]
+
+            expired = len(items) - len(seen) - len(retained)
+            data['items'] = {key: items[key] for key in list(seen) + retained}
+            data['next_id'] = next_id
+            result = current + [dict(items[key]['entry']) for key in retained]
+
+        print(f"Item history for {config['id']}: {added} new, {len(current) - added} known, "
+              f"{len(retained)} retained, {expired} expired")
+        return result
@@ -0,0 +1,187 @@
+"""
+JSONPath-style expressions for `type: json` configs.
+Supports the subset needed to reshape API payloads into entries:
+
+    $.data[*]            children, wildcards and array indices (negative too)
+    items[0:5]           slices; the leading `$.` is optional
+    $..image.url         recursive descent
+    $['full name']       quoted member names
+    $.events[?(@.public == true)]   filters comparing a relative path with a literal
+    $.events[?(@.image)]            filters on existence
+
+Expressions are compiled once at config load time; field selectors are
+evaluated relative to the container match.
+"""
+import json
+import operator
+import re
+from typing import Any, Callable, List, Optional, Tuple
+
+
+_OPERATORS = {
+    '==': operator.eq, '!=': operator.ne,
+    '<=': operator.le, '>=': operator.ge,
+    '<': operator.lt, '>': operator.gt,
+}
+_NAME_RE = re.compile(r'[A-Za-z_$][\w$-]*')
+_FILTER_RE = re.compile(r'^\?\(\s*(@[^=!<>\s]*)\s*(?:(==|!=|<=|>=|<|>)\s*(.+?))?\s*\)$')
+
+Step = Tuple[str, Any]
+
+
+def _children(node: Any) -> List[Any]:
+    if isinstance(node, dict):
+        return list(node.values())
+    if isinstance(node, list):
+        return list(node)
+    return []
+
+
+def _descendants(node: Any) -> List[Any]:
+    """node and everything below it, in document order."""
+    found = [node]
+    for child in _children(node):
+        found.extend(_descendants(child))
+    return found
+
+
+def _literal(text: str) -> Any:
+    text = text.strip()
+    if len(text) >= 2 and text[0] == text[-1] == "'":
+        return text[1:-1]
+    try:
+        return json.loads(text)
+    except ValueError:
+        raise ValueError(f"invalid literal {text!r}") from None
+
+
+class JsonPath:
+    """A compiled expression; find() returns all matches, first() the first or None."""
+
+    def __init__(self, expression: str):
+        self.expression = expression
+        try:
+            self.steps = self._compile(expression.strip())
+        except ValueError as e:
+            raise ValueError(f"Invalid JSONPath '{expression}': {e}") from None
+
+    def __repr__(self) -> str:
+        return f"JsonPath({self.expression!r})"
+
+    @classmethod
+    def _compile(cls, text: str) -> List[Step]:
+        steps: List[Step] = []
+        if text[:1] in ('$', '@'):
+            text = text[1:]
+        elif text and text[0] not in '.[':
+            text = '.' + text
+
+        position = 0
+        while position < len(text):
+            if text.startswith('..', position):
+                steps.append(('descend', None))
+                position += 2
+                if text.startswith('[', position):
+                    continue
+            elif text[position] == '.':
+                position += 1
+            elif text[position] != '[':
+                raise ValueError(f"unexpected {text[position]!r} at position {position}")
+
+            if text.startswith('[', position):
+                end = cls._bracket_end(text, position)
+                steps.append(cls._bracket(text[position + 1:end].strip()))
+                position = end + 1
+            elif text.startswith('*', position):
+                steps.append(('wildcard', None))
+                position += 1
+            else:
+                match = _NAME_RE.match(text, position)
+                if not match:
+                    raise ValueError(f"expected a member name at position {position}")
+                steps.append(('member', (match.group(0),)))
+                position = match.end()
+        return steps
+
+    @staticmethod
+    def _bracket_end(text: str, start: int) -> int:
+        depth, quote = 0, None
+        for index in range(start, len(text)):
+            char = text[index]
+            if quote:
+                if char == quote:
+                    quote = None
+            elif char in '\'"':
+                quote = char
+            elif char in '[(':
+                depth += 1
+            elif char in '])':
+                depth -= 1
+                if depth == 0:
+                    return index
+        raise ValueError("unbalanced brackets")
+
+    @classmethod
+    def _bracket(cls, inner: str) -> Step:
+        if inner == '*':
+            return ('wildcard', None)
+        if inner.startswith('?'):
+            match = _FILTER_RE.match(inner)
+            if not match:
+                raise ValueError(f"unsupported filter [{inner}]")
+            path, op, literal = match.groups()
+            return ('filter', (JsonPath(path), _OPERATORS.get(op), _literal(literal) if op else None))
+        if re.fullmatch(r'-?\d*:-?\d*', inner):
+            start, _, stop = inner.partition(':')
+            return ('slice', slice(int(start) if start else None, int(stop) if stop else None))
+        parts = [part.strip() for part in inner.split(',')]
+        if all(re.fullmatch(r'-?\d+', part) for part in parts):
+            return ('index', tuple(int(part) for part in parts))
+        if all(len(part) >= 2 and part[0] == part[-1] and part[0] in '\'"' for part in parts):
+            return ('member', tuple(part[1:-1] for part in parts))
+        raise ValueError(f"unsupported selector [{inner}]")
+
+    @staticmethod
+    def _apply(step: Step, node: Any) -> List[Any]:
+        kind, arg = step
+        if kind == 'member':
+            return [node[name] for name in arg if isinstance(node, dict) and name in node]
+        if kind == 'wildcard':
+            return _children(node)
+        if kind == 'descend':
+            return _descendants(node)
+        if not isinstance(node, (list, dict)):
+            return []
+        if kind == 'filter':
+            path, compare, literal = arg
+            return [child for child in _children(node) if _matches(path, compare, literal, child)]
+        if not isinstance(node, list):
+            return []
+        if kind == 'slice':
+            return node[arg]
+        return [node[index] for index in arg if -len(node) <= index < len(node)]
+
+    def find(self, node: Any) -> List[Any]:
+        nodes = [node]
+        for step in self.steps:
+            nodes = [found for current in nodes for found in self._apply(step, current)]
+            if not nodes:
+                break
+        return nodes
+
+    def first(self, node: Any) -> Optional[Any]:
+        found = self.find(node)
+        return found[0] if found else None
+
+
+def _matches(path: JsonPath, compare: Optional[Callable], literal: Any, node: Any) -> bool:
+    values = path.find(node)
+    if compare is None:
+        return any(value not in (None, False, '', [], {}) for value in values)
+    for value in values:
+        try:
+            if compare(value, literal):
+                return True
+        except TypeError:
+            continue
+    return False
@@ -0,0 +1,49 @@
+"""
+Output writer for scraper results.
+Serializes JSON deterministically and only replaces a file (atomically, via
+temp file + os.replace) when its content hash changed. Written files get
+precompressed .gz/.br siblings (see precompress.py).
+"""
+import json
+import hashlib
+from typing import Any
+
+from config_loader import OUTPUT_DIR
+from precompress import PRECOMPRESS, publish
+from state_store import atomic_write
+
+
+def serialize_json(data: Any) -> bytes:
+    """Deterministic JSON encoding used for all output files."""
+    return (json.dumps(data, ensure_ascii=False, indent=2) + '\n').encode('utf-8')
+
+
+def file_hash(path: str) -> str:
+    """SHA-256 of a file's content ('' if it does not exist)."""
+    digest = hashlib.sha256()
+    try:
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(65536), b''):
+                digest.update(chunk)
+    except OSError:
+        return ''
+    return digest.hexdigest()
+
+
+def write_if_changed(path: str, content: bytes) -> bool:
+    """Atomically write content to path unless it is already identical.
+
+    Returns True if the file was written, False if it was unchanged.
+    """
+    written = file_hash(path) != hashlib.sha256(content).hexdigest()
+    if written:
+        atomic_write(path, content)
+    if PRECOMPRESS:
+        # Also fills in missing siblings of unchanged files
+        publish(path, content, root=OUTPUT_DIR)
+    return written
+
+
+def write_json(path: str, data: Any) -> bool:
+    """Serialize data and write it with write_if_changed."""
+    return write_if_changed(path, serialize_json(data))
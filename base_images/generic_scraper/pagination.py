@@ -0,0 +1,77 @@
+"""
+Multi-page crawling for the generic scraper.
+Known page URLs (from a page-number template) are fetched concurrently;
+next-link pagination is followed page by page. Entries of all pages are
+merged and de-duplicated.
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Callable
+
+import requests
+
+
+PAGINATION_WORKERS = int(os.environ.get('PAGINATION_WORKERS', '4'))
+
+
+def validate_pagination(config: Dict[str, Any], config_path: str):
+    """Check the optional `pagination` block of a config."""
+    pagination = config.get('pagination')
+    if pagination is None:
+        return
+    if not isinstance(pagination, dict):
+        raise ValueError(f"'pagination' must be a mapping in {config_path}")
+    if not pagination.get('url_template') and not pagination.get('next_selector'):
+        raise ValueError(f"'pagination' needs 'url_template' or 'next_selector' in {config_path}")
+    if pagination.get('url_template') and '{page}' not in pagination['url_template']:
+        raise ValueError(f"'pagination.url_template' must contain '{{page}}' in {config_path}")
+    if int(pagination.get('max_pages', 10)) < 1:
+        raise ValueError(f"'pagination.max_pages' must be at least 1 in {config_path}")
+
+
+def template_urls(config: Dict[str, Any]) -> List[str]:
+    """URLs of the pages after the first one, built from `url_template`."""
+    pagination = config.get('pagination') or {}
+    template = pagination.get('url_template')
+    if not template:
+        return []
+
+    start = int(pagination.get('start', 2))
+    max_pages = int(pagination.get('max_pages', 10))
+    return [template.format(page=number) for number in range(start, start + max_pages - 1)]
+
+
+def fetch_all(urls: List[str], fetch: Callable[[str], requests.Response],
+              workers: int = PAGINATION_WORKERS) -> List[Optional[requests.Response]]:
+    """Fetch urls concurrently; failed fetches are returned as None, order is kept."""
+    def safe_fetch(url: str) -> Optional[requests.Response]:
+        try:
+            return fetch(url)
+        except Exception as e:
+            print(f"Page fetch failed for {url}: {e}")
+            return None
+
+    if not urls:
+        return []
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(urls))), thread_name_prefix='page') as executor:
+        return list(executor.map(safe_fetch, urls))
+
+
+def merge_entries(pages: List[List[Dict[str, Any]]], config: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Concatenate page entries, drop duplicates and renumber ids."""
+    key_field = (config.get('pagination') or {}).get('dedupe_key', 'call_to_action_url')
+    seen = set()
+    merged = []
+
+    for entries in pages:
+        for entry in entries:
+            key = entry.get(key_field) or (entry.get('title'), entry.get('description'))
+            if key in seen:
+                continue
+            seen.add(key)
+            merged.append(entry)
+
+    for index, entry in enumerate(merged):
+        entry['id'] = index + 1
+
+    return merged
@@ -0,0 +1,143 @@
+"""
+Parallel extraction for very large listing pages.
+Above a container count the containers of a `type: simple` page are
+serialized to HTML fragments, split into chunks and extracted in a process
+pool. Each worker parses its chunk on its own and runs the same compiled
+field plans; chunks are merged in page order, so the entries are identical
+to a serial run. If a chunk cannot be rebuilt from its fragments the page
+is extracted serially instead. Only selectolax rebuilds fragments cheaply
+enough to gain from this by default; see benchmarks/bench_parallel.py.
+"""
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Any, List, Optional, Tuple
+
+from parsers import get_engine
+from selector_stats import SelectorStats
+
+
+def available_cpus() -> int:
+    """CPUs this process can actually use: affinity mask and cgroup CPU quota.
+
+    os.cpu_count() reports the host's CPUs, also in a container limited to one.
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    for quota_file, period_file in (('/sys/fs/cgroup/cpu.max', None),
+                                    ('/sys/fs/cgroup/cpu/cpu.cfs_quota_us', '/sys/fs/cgroup/cpu/cpu.cfs_period_us')):
+        try:
+            with open(quota_file) as f:
+                values = f.read().split()
+            if period_file:
+                with open(period_file) as f:
+                    values.append(f.read().strip())
+        except OSError:
+            continue
+        if values[0] not in ('max', '-1'):
+            cpus = min(cpus, max(1, int(values[0]) // int(values[1])))
+        break
+    return cpus
+
+
+# Container count from which extraction runs in parallel (0 = never)
+PARALLEL_EXTRACT_THRESHOLD = int(os.environ.get('PARALLEL_EXTRACT_THRESHOLD', '5000'))
+PARALLEL_EXTRACT_WORKERS = int(os.environ.get('PARALLEL_EXTRACT_WORKERS', str(available_cpus())))
+PARALLEL_EXTRACT_CHUNK_SIZE = int(os.environ.get('PARALLEL_EXTRACT_CHUNK_SIZE', '1000'))
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def validate_parallel(config: Dict[str, Any], config_path: str):
+    """Check the optional `parallel_extraction` block of a config."""
+    parallel = config.get('parallel_extraction')
+    if parallel is None:
+        return
+    if not isinstance(parallel, dict):
+        raise ValueError(f"'parallel_extraction' must be a mapping in {config_path}")
+    if config.get('type', 'simple') != 'simple':
+        raise ValueError(f"'parallel_extraction' is only supported for 'type: simple' in {config_path}")
+    for key in ('workers', 'chunk_size'):
+        if key in parallel and int(parallel[key]) < 1:
+            raise ValueError(f"'parallel_extraction.{key}' must be at least 1 in {config_path}")
+
+
+def parallel_settings(config: Dict[str, Any], engine=None) -> Tuple[int, int, int]:
+    """(threshold, workers, chunk_size) of a config, defaults from the environment.
+
+    Engines whose fragments are expensive to rebuild only use the pool when
+    the config sets a threshold itself.
+    """
+    parallel = config.get('parallel_extraction') or {}
+    default_threshold = PARALLEL_EXTRACT_THRESHOLD if getattr(engine, 'parallel_by_default', True) else 0
+    return (
+        int(parallel.get('threshold', default_threshold)),
+        int(parallel.get('workers', PARALLEL_EXTRACT_WORKERS)),
+        int(parallel.get('chunk_size', PARALLEL_EXTRACT_CHUNK_SIZE)),
+    )
+
+
+def get_pool(workers: int) -> ProcessPoolExecutor:
+    """Shared process pool, recreated only if more workers are requested."""
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or workers > _pool_workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            # Worker processes are spawned: forking a threaded daemon or batch run is unsafe
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+            _pool_workers = workers
+        return _pool
+
+
+def reset_pool():
+    """Drop a pool whose worker died; the next extraction starts a new one."""
+    global _pool
+    with _pool_lock:
+        _pool = None
+
+
+def extract_chunk(parser: str, fields: Tuple, fragments: List[str]) -> Tuple[List[Dict[str, Any]], Dict[str, List]]:
+    """Worker: field values for every container fragment of one chunk, plus the selector counts."""
+    engine = get_engine(parser)
+    containers = engine.parse_fragments(''.join(fragments))
+    if len(containers) != len(fragments):
+        raise ValueError(f"chunk of {len(fragments)} containers parsed into {len(containers)} elements")
+    stats = SelectorStats()
+    rows = [{field: stats.extract(field, field_plan, container, engine) for field, field_plan in fields}
+            for container in containers]
+    return rows, stats.counts
+
+
+def extract_parallel(containers: List, fields: Tuple, engine, config: Dict[str, Any],
+                     stats: Optional[SelectorStats] = None) -> Optional[List[Dict[str, Any]]]:
+    """Field values per container in page order, or None if the page should be extracted serially."""
+    threshold, workers, chunk_size = parallel_settings(config, engine)
+    # One worker (or one chunk) only adds serializing and re-parsing to the serial work
+    if not threshold or len(containers) < threshold or workers <= 1 or len(containers) <= chunk_size:
+        return None
+
+    fragments = [engine.serialize(container) for container in containers]
+    chunks = [fragments[start:start + chunk_size] for start in range(0, len(fragments), chunk_size)]
+    pool = get_pool(workers)
+    try:
+        results = list(pool.map(extract_chunk, [engine.name] * len(chunks), [fields] * len(chunks), chunks))
+    except Exception as e:
+        if isinstance(e, BrokenProcessPool):
+            reset_pool()
+        print(f"Warning: parallel extraction failed for {config['id']} ({e}), extracting serially")
+        return None
+
+    values = []
+    for rows, counts in results:
+        values += rows
+        if stats is not None:
+            stats.merge(counts)
+    print(f"Extracted {len(containers)} containers in {len(chunks)} chunks on {min(workers, len(chunks))} processes")
+    return values
@@ -0,0 +1,219 @@
+"""
+HTML parser engines for the generic scraper.
+Each engine parses markup and gives extraction plans uniform node access,
+so the same plan runs on BeautifulSoup (html.parser / lxml) or selectolax.
+Engines can restrict tree construction to a parse scope.
+Markup may be the raw response bytes together with their encoding
+(see decoding.py), so no decoded copy of the page is made up front.
+`type: json` configs use the JSON engine, which decodes the payload and
+evaluates JSONPath expressions instead of building an HTML tree.
+"""
+import json
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+    HAS_SELECTOLAX = True
+except ImportError:
+    HAS_SELECTOLAX = False
+
+
+PARSERS = ('html.parser', 'lxml', 'selectolax')
+
+# Leading compound of a selector: optional tag followed by .class / #id parts
+_COMPOUND_RE = re.compile(r'^\s*([a-zA-Z][\w-]*|\*)?((?:[.#][\w-]+)*)')
+
+
+@dataclass(frozen=True)
+class ParseScope:
+    """Elements whose subtrees are kept when parsing (tag, id and classes)."""
+    css: str
+    tag: Optional[str] = None
+    element_id: Optional[str] = None
+    classes: Tuple[str, ...] = ()
+
+    @classmethod
+    def from_selector(cls, selector: str) -> Optional['ParseScope']:
+        """Build a scope from the first compound of a selector.
+
+        Returns None if the compound cannot be expressed as a parse filter:
+        selector lists, sibling combinators (the match may lie outside the
+        kept subtree) or pseudo-classes whose result depends on the position
+        of the element in the full document.
+        """
+        if not selector or any(char in selector for char in ',+~'):
+            return None
+        match = _COMPOUND_RE.match(selector)
+        tag, parts = match.group(1), match.group(2)
+        compound_rest = re.match(r'[^\s>]*', selector[match.end():]).group(0)
+        if ':' in compound_rest or (compound_rest and not compound_rest.startswith('[')):
+            return None
+
+        element_id = None
+        classes = []
+        for part in re.findall(r'[.#][\w-]+', parts):
+            if part[0] == '#':
+                element_id = part[1:]
+            else:
+                classes.append(part[1:])
+
+        if tag in (None, '*') and not element_id and not classes:
+            return None
+        return cls(selector, None if tag == '*' else tag, element_id, tuple(classes))
+
+    def strainer(self) -> SoupStrainer:
+        # Any superset of the scope is safe: selectors run on the result exactly.
+        attrs = {}
+        if self.element_id:
+            attrs['id'] = self.element_id
+        if self.classes:
+            attrs['class'] = self.classes[0]
+        return SoupStrainer(self.tag, attrs=attrs)
+
+
+class SoupEngine:
+    """BeautifulSoup tree with soupsieve selectors (html.parser or lxml builder)."""
+
+    supports_scope = True
+    # Serializing and re-parsing containers costs more than extracting them
+    # (benchmarks/bench_parallel.py), so the process pool is opt-in per config
+    parallel_by_default = False
+
+    def __init__(self, features: str):
+        self.name = features
+
+    def parse(self, markup, scope: Optional[ParseScope] = None, encoding: Optional[str] = None):
+        # from_encoding only applies to bytes; it skips bs4's own encoding detection
+        from_encoding = encoding if isinstance(markup, bytes) else None
+        if scope is not None:
+            return BeautifulSoup(markup, self.name, parse_only=scope.strainer(), from_encoding=from_encoding)
+        return BeautifulSoup(markup, self.name, from_encoding=from_encoding)
+
+    def free(self, document):
+        """Break the tree's reference cycles so memory is released immediately."""
+        document.decompose()
+
+    def select(self, node, selector) -> List:
+        return selector.compiled.select(node)
+
+    def select_one(self, node, selector):
+        return selector.compiled.select_one(node)
+
+    def text(self, node) -> str:
+        return node.get_text(strip=True)
+
+    def attr(self, node, name: str):
+        return node.get(name, '')
+
+    def serialize(self, node) -> str:
+        return str(node)
+
+    def parse_fragments(self, markup: str) -> List:
+        """Top-level elements of concatenated fragments (see parallel_extract.py)."""
+        # Same builder as the serial path, so workers see the tree the serial run would;
+        # lxml wraps the fragments in <html><body>
+        document = BeautifulSoup(markup, self.name)
+        root = document.body if document.body is not None else document
+        return root.find_all(recursive=False)
+
+
+class SelectolaxEngine:
+    """selectolax (lexbor) tree; selectors are evaluated from their CSS text."""
+
+    name = 'selectolax'
+    # lexbor always builds the full (native, compact) tree
+    supports_scope = False
+    parallel_by_default = True
+
+    def parse(self, markup, scope: Optional[ParseScope] = None, encoding: Optional[str] = None):
+        if isinstance(markup, bytes):
+            markup = markup.decode(encoding or 'utf-8', 'replace')
+        return LexborHTMLParser(markup)
+
+    def free(self, document):
+        pass
+
+    def select(self, node, selector) -> List:
+        return node.css(selector.css)
+
+    def select_one(self, node, selector):
+        return node.css_first(selector.css)
+
+    def text(self, node) -> str:
+        return node.text(strip=True)
+
+    def attr(self, node, name: str):
+        return node.attributes.get(name) or ''
+
+    def serialize(self, node) -> str:
+        return node.html
+
+    def parse_fragments(self, markup: str) -> List:
+        body = LexborHTMLParser(markup).body
+        return list(body.iter()) if body is not None else []
+
+
+class JsonEngine:
+    """Decoded JSON payload; selectors are compiled JSONPath expressions."""
+
+    name = 'json'
+    supports_scope = False
+    parallel_by_default = False
+
+    def parse(self, markup, scope: Optional[ParseScope] = None, encoding: Optional[str] = None):
+        # json.loads detects UTF-8/16/32 in bytes itself
+        if isinstance(markup, bytes) and encoding and not encoding.startswith('utf'):
+            markup = markup.decode(encoding, 'replace')
+        return json.loads(markup)
+
+    def free(self, document):
+        pass
+
+    def select(self, node, selector) -> List:
+        return selector.compiled.find(node)
+
+    def select_one(self, node, selector):
+        return selector.compiled.first(node)
+
+    def text(self, node) -> str:
+        """Scalars as text (lists joined with ", "); objects have no text."""
+        if isinstance(node, bool):
+            return 'true' if node else 'false'
+        if isinstance(node, (int, float)):
+            return str(node)
+        if isinstance(node, str):
+            return node.strip()
+        if isinstance(node, list):
+            return ', '.join(text for text in (self.text(item) for item in node) if text)
+        return ''
+
+    def attr(self, node, name: str):
+        return self.text(node.get(name)) if isinstance(node, dict) else ''
+
+
+DEFAULT_ENGINE = SoupEngine('html.parser')
+JSON_ENGINE = JsonEngine()
+
+_engines: Dict[str, object] = {'html.parser': DEFAULT_ENGINE}
+
+
+def get_engine(name: Optional[str] = None):
+    """Return the parser engine for a `parser:` config value."""
+    name = name or 'html.parser'
+    if name == 'json':
+        return JSON_ENGINE
+    if name not in PARSERS:
+        raise ValueError(f"Unknown parser '{name}', expected one of: {', '.join(PARSERS)}")
+
+    if name not in _engines:
+        if name == 'selectolax':
+            if not HAS_SELECTOLAX:
+                raise ValueError("Parser 'selectolax' requested but selectolax is not installed")
+            _engines[name] = SelectolaxEngine()
+        else:
+            _engines[name] = SoupEngine(name)
+    return _engines[name]
@@ -0,0 +1,190 @@
+"""
+Cross-process per-host rate limiting.
+Token buckets keyed by hostname live in a SQLite database on the shared output
+volume, so the generic scraper, custom crawler scripts and cron jobs in
+separate containers draw from the same budget per host.
+
+Only uses the standard library; the same file ships with the Python base
+images (copies kept in sync by scripts/sync-shared-modules.py, edit this one). Rates come from the RATE_LIMITS environment variable:
+
+    RATE_LIMITS="goslar.de=1:5,rest.arbeitsagentur.de=0.5:2"
+
+meaning <requests per second>:<burst>. A rule for goslar.de also covers
+www.goslar.de. Hosts without a rule use RATE_LIMIT_DEFAULT ("0" disables it).
+
+    python rate_limiter.py      # Print wait-time statistics per host
+"""
+import os
+import sqlite3
+import sys
+import threading
+import time
+from typing import Dict, Any, List, Optional, Tuple
+from urllib.parse import urlparse
+
+
+RATE_LIMIT_DB = os.environ.get('RATE_LIMIT_DB', os.path.join(
+    os.environ.get('STATE_DIR', os.path.join(os.environ.get('OUTPUT_DIR', '/app/output'), '.state')),
+    'rate-limits.sqlite'
+))
+RATE_LIMIT_DEFAULT = os.environ.get('RATE_LIMIT_DEFAULT', '2:10')
+RATE_LIMITS = os.environ.get('RATE_LIMITS', '')
+
+
+def parse_rate(value: str) -> Optional[Tuple[float, float]]:
+    """Parse "<rate>[:<burst>]" into (rate, burst); None means unlimited."""
+    rate_text, _, burst_text = value.strip().partition(':')
+    rate = float(rate_text or 0)
+    if rate <= 0:
+        return None
+    burst = float(burst_text) if burst_text else max(1.0, rate)
+    return rate, max(1.0, burst)
+
+
+def parse_rules(value: str) -> Dict[str, Tuple[float, float]]:
+    """Parse "host=rate:burst,..." into {host: (rate, burst)} (unlimited hosts map to (0, 0))."""
+    rules = {}
+    for part in value.split(','):
+        if '=' not in part:
+            continue
+        host, _, rate = part.partition('=')
+        rules[host.strip().lower()] = parse_rate(rate) or (0.0, 0.0)
+    return rules
+
+
+def is_busy(error: Exception) -> bool:
+    """True for lock conflicts with another connection, which pass after a moment."""
+    name = getattr(error, 'sqlite_errorname', '') or ''
+    return name.startswith(('SQLITE_BUSY', 'SQLITE_LOCKED')) or 'database is locked' in str(error)
+
+
+class RateLimiter:
+    """Token bucket per host, shared through SQLite between processes."""
+
+    def __init__(self, path: str = RATE_LIMIT_DB, rules: Optional[str] = None,
+                 default: Optional[str] = None, timeout: float = 30):
+        self.path = path
+        self.timeout = timeout
+        self.rules = parse_rules(RATE_LIMITS if rules is None else rules)
+        self.default = parse_rate(RATE_LIMIT_DEFAULT if default is None else default)
+        self._local = threading.local()
+        self._disabled = False
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS buckets ('
+                'host TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL, '
+                'requests INTEGER NOT NULL DEFAULT 0, waits INTEGER NOT NULL DEFAULT 0, '
+                'wait_seconds REAL NOT NULL DEFAULT 0, max_wait REAL NOT NULL DEFAULT 0)'
+            )
+            self._local.connection = connection
+        return connection
+
+    def bucket_for(self, url: str) -> Tuple[str, Optional[Tuple[float, float]]]:
+        """The bucket name and (rate, burst) that apply to url."""
+        host = (urlparse(url).hostname or '').lower()
+        labels = host.split('.')
+        for index in range(len(labels) - 1):
+            domain = '.'.join(labels[index:])
+            if domain in self.rules:
+                rate = self.rules[domain]
+                return domain, rate if rate[0] > 0 else None
+        return host, self.default
+
+    def reserve(self, url: str) -> float:
+        """Take one token for url's host and return the seconds to wait before using it.
+
+        Tokens may go negative: each caller reserves the next free slot in one
+        transaction, so waiting happens outside the database lock.
+        """
+        bucket, limit = self.bucket_for(url)
+        if limit is None or not bucket or self._disabled:
+            return 0.0
+        rate, burst = limit
+        now = time.time()
+
+        connection = self._connection()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            row = connection.execute('SELECT tokens, updated FROM buckets WHERE host = ?', (bucket,)).fetchone()
+            tokens = burst if row is None else min(burst, row[0] + max(0.0, now - row[1]) * rate)
+            tokens -= 1
+            wait = -tokens / rate if tokens < 0 else 0.0
+            connection.execute(
+                'INSERT INTO buckets (host, tokens, updated, requests, waits, wait_seconds, max_wait) '
+                'VALUES (?, ?, ?, 1, ?, ?, ?) '
+                'ON CONFLICT(host) DO UPDATE SET tokens = excluded.tokens, updated = excluded.updated, '
+                'requests = requests + 1, waits = waits + excluded.waits, '
+                'wait_seconds = wait_seconds + excluded.wait_seconds, '
+                'max_wait = MAX(max_wait, excluded.max_wait)',
+                (bucket, tokens, now, 1 if wait > 0 else 0, wait, wait)
+            )
+            connection.execute('COMMIT')
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+        return wait
+
+    def acquire(self, url: str) -> float:
+        """Block until a request to url's host is allowed; returns the seconds waited.
+
+        If the database is unusable, requests are not limited (fail open). A
+        database locked by another process only lets this one request through.
+        """
+        try:
+            wait = self.reserve(url)
+        except (OSError, sqlite3.Error) as e:
+            if is_busy(e):
+                print(f"Rate limiter skipped for {url}, database busy ({self.path}): {e}")
+            else:
+                print(f"Rate limiter disabled, database not usable ({self.path}): {e}")
+                self._disabled = True
+            return 0.0
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Request and wait counters per bucket since the database was created."""
+        rows = self._connection().execute(
+            'SELECT host, requests, waits, wait_seconds, max_wait FROM buckets ORDER BY wait_seconds DESC'
+        ).fetchall()
+        return [
+            {'host': host, 'requests': requests, 'waits': waits,
+             'wait_seconds': round(wait_seconds, 3), 'max_wait': round(max_wait, 3)}
+            for host, requests, waits, wait_seconds, max_wait in rows
+        ]
+
+
+_default_limiter: Optional[RateLimiter] = None
+
+
+def get_rate_limiter() -> RateLimiter:
+    """The process-wide limiter configured from the environment."""
+    global _default_limiter
+    if _default_limiter is None:
+        _default_limiter = RateLimiter()
+    return _default_limiter
+
+
+def wait_for_host(url: str) -> float:
+    """Convenience wrapper for scripts: wait for a slot on url's host."""
+    return get_rate_limiter().acquire(url)
+
+
+def print_stats():
+    print(f"{'Host':40} {'Requests':>9} {'Waits':>7} {'Wait total':>11} {'Max wait':>9}")
+    for row in get_rate_limiter().stats():
+        print(f"{row['host'][:40]:40} {row['requests']:9} {row['waits']:7} "
+              f"{row['wait_seconds']:10.1f}s {row['max_wait']:8.1f}s")
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        print(__doc__)
+        sys.exit(0 if sys.argv[1] in ('-h', '--help') else 1)
+    print_stats()
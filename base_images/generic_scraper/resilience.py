@@ -0,0 +1,189 @@
+"""
+Retries, per-host circuit breaker and serve-stale bookkeeping for fetches.
+Breaker state and per-config freshness are kept in STATE_DIR, so they
+survive between cron runs and are shared with the daemon.
+"""
+import os
+import random
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Any, Optional
+from urllib.parse import urlparse
+
+import requests
+
+from state_store import JsonStore
+
+
+FETCH_RETRIES = int(os.environ.get('FETCH_RETRIES', '2'))
+FETCH_BACKOFF = float(os.environ.get('FETCH_BACKOFF', '2'))
+FETCH_CONNECT_TIMEOUT = float(os.environ.get('FETCH_CONNECT_TIMEOUT', '10'))
+FETCH_TIMEOUT = float(os.environ.get('FETCH_TIMEOUT', '30'))
+BREAKER_FAILURES = int(os.environ.get('BREAKER_FAILURES', '3'))
+BREAKER_COOLDOWN = int(os.environ.get('BREAKER_COOLDOWN', '900'))
+# Seconds the half-open trial request holds the host before another caller may try
+BREAKER_PROBE_TIMEOUT = int(os.environ.get('BREAKER_PROBE_TIMEOUT', '300'))
+
+# Status codes that say "try again later" rather than "this request is wrong"
+RETRY_STATUS = (429, 500, 502, 503, 504)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of a request while a host's circuit breaker is open."""
+
+
+@dataclass(frozen=True)
+class FetchPolicy:
+    """Retry, timeout and stale-output settings of one config."""
+    retries: int = FETCH_RETRIES
+    backoff: float = FETCH_BACKOFF
+    max_backoff: float = 60.0
+    connect_timeout: float = FETCH_CONNECT_TIMEOUT
+    timeout: float = FETCH_TIMEOUT
+    on_error: str = 'serve_stale'
+    stale_max_age: int = 0
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict[str, Any]]) -> 'FetchPolicy':
+        retry = (config or {}).get('retry') or {}
+        return cls(
+            retries=int(retry.get('attempts', FETCH_RETRIES + 1)) - 1,
+            backoff=float(retry.get('backoff', FETCH_BACKOFF)),
+            max_backoff=float(retry.get('max_backoff', 60.0)),
+            connect_timeout=float(retry.get('connect_timeout', FETCH_CONNECT_TIMEOUT)),
+            timeout=float(retry.get('timeout', FETCH_TIMEOUT)),
+            on_error=retry.get('on_error', 'serve_stale'),
+            stale_max_age=int(retry.get('stale_max_age', 0)),
+        )
+
+    def delay(self, attempt: int, response: Optional[requests.Response] = None) -> float:
+        """Seconds to wait before retry number `attempt` (1-based), with full jitter.
+
+        A numeric Retry-After header of a 429/503 response is honoured.
+        """
+        if response is not None:
+            retry_after = response.headers.get('Retry-After', '')
+            if retry_after.isdigit():
+                return min(float(retry_after), self.max_backoff)
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** (attempt - 1)))
+
+
+DEFAULT_POLICY = FetchPolicy()
+
+
+def validate_retry(config: Dict[str, Any], config_path: str):
+    """Check the optional `retry` block of a config."""
+    retry = config.get('retry')
+    if retry is None:
+        return
+    if not isinstance(retry, dict):
+        raise ValueError(f"'retry' must be a mapping in {config_path}")
+    if int(retry.get('attempts', 1)) < 1:
+        raise ValueError(f"'retry.attempts' must be at least 1 in {config_path}")
+    if retry.get('on_error', 'serve_stale') not in ('serve_stale', 'empty'):
+        raise ValueError(f"'retry.on_error' must be 'serve_stale' or 'empty' in {config_path}")
+
+
+def is_retryable(error: Exception) -> bool:
+    """Timeouts, connection errors and 429/5xx responses are worth retrying."""
+    if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+        return True
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        return error.response.status_code in RETRY_STATUS
+    return False
+
+
+class CircuitBreaker:
+    """Per-host failure counters; a host is skipped for a cool-down after repeated failures.
+
+    After the cool-down one request is let through (half-open): success
+    closes the breaker, failure opens it again. Other callers are skipped
+    until the trial reports back or `probe_timeout` passes.
+    """
+
+    def __init__(self, failures: int = BREAKER_FAILURES, cooldown: int = BREAKER_COOLDOWN,
+                 store: Optional[JsonStore] = None, probe_timeout: int = BREAKER_PROBE_TIMEOUT):
+        self.failures = max(1, failures)
+        self.cooldown = cooldown
+        self.probe_timeout = probe_timeout
+        self.store = store or JsonStore('circuit-breakers.json')
+
+    @staticmethod
+    def host(url: str) -> str:
+        return urlparse(url).netloc.lower()
+
+    def check(self, url: str):
+        """Raise CircuitOpenError if requests to url's host are currently skipped."""
+        host = self.host(url)
+        state = self.store.load().get(host)
+        if not state or not state.get('open_until'):
+            return
+        now = time.time()
+        if state['open_until'] > now:
+            raise self._open_error(host, state)
+
+        # Half-open: the first caller after the cool-down takes the trial request
+        with self.store.transaction() as data:
+            state = data.get(host)
+            if not state or not state.get('open_until'):
+                return
+            if state['open_until'] > now:
+                raise self._open_error(host, state)
+            if state.get('probe_until', 0) > now:
+                raise CircuitOpenError(f"Circuit half-open for {host}, waiting for the trial request "
+                                       f"(last: {state.get('last_error', '')})")
+            state['probe_until'] = now + self.probe_timeout
+
+    @staticmethod
+    def _open_error(host: str, state: Dict[str, Any]) -> CircuitOpenError:
+        return CircuitOpenError(
+            f"Circuit open for {host} until "
+            f"{datetime.fromtimestamp(state['open_until']).strftime('%H:%M:%S')} "
+            f"after {state['failures']} failures (last: {state.get('last_error', '')})"
+        )
+
+    def record_success(self, url: str):
+        host = self.host(url)
+        if host in self.store.load():
+            with self.store.transaction() as data:
+                if data.pop(host, None):
+                    print(f"Circuit closed for {host}")
+
+    def record_failure(self, url: str, error: Exception):
+        host = self.host(url)
+        now = time.time()
+        with self.store.transaction() as data:
+            state = data.setdefault(host, {'failures': 0, 'open_until': 0})
+            state['failures'] += 1
+            state['last_error'] = str(error)[:300]
+            state['last_failure'] = now
+            state.pop('probe_until', None)
+            if state['failures'] >= self.failures:
+                state['open_until'] = now + self.cooldown
+                print(f"Circuit opened for {host} for {self.cooldown}s after {state['failures']} failures")
+
+
+class FreshnessStore:
+    """Last successful run and stale state per config (STATE_DIR/freshness.json)."""
+
+    def __init__(self, store: Optional[JsonStore] = None):
+        self.store = store or JsonStore('freshness.json')
+
+    def get(self, crawler_id: str) -> Dict[str, Any]:
+        return self.store.load().get(crawler_id, {})
+
+    def mark_fresh(self, crawler_id: str):
+        with self.store.transaction() as data:
+            data[crawler_id] = {'last_success': datetime.now().strftime('%Y-%m-%dT%H:%M:%S')}
+
+    def mark_stale(self, crawler_id: str, error: Exception) -> Dict[str, Any]:
+        """Record a failed run; returns the updated state (with `stale_since`)."""
+        now = datetime.now().strftime('%Y-%m-%dT%H:%M:%S')
+        with self.store.transaction() as data:
+            state = data.setdefault(crawler_id, {})
+            state.setdefault('stale_since', now)
+            state['failures'] = state.get('failures', 0) + 1
+            state['last_error'] = str(error)[:300]
+            state['last_attempt'] = now
+            return dict(state)
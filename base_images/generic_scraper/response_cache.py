@@ -0,0 +1,126 @@
+"""
+Short-lived in-process cache of fetched responses and parsed documents.
+In batch and daemon mode several configs (and their pagination and detail
+fetches) can resolve to the same URL within minutes. The first fetch is
+shared and concurrent requests for the same URL wait for it instead of
+fetching again. Parsed documents are only kept for URLs that more than one
+config starts from, since trees are much bigger than the page itself.
+"""
+import os
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Dict, Any, Callable, Iterable, Tuple
+
+import requests
+
+
+RESPONSE_CACHE_TTL = int(os.environ.get('RESPONSE_CACHE_TTL', '300'))
+RESPONSE_CACHE_MAX_DOCUMENTS = int(os.environ.get('RESPONSE_CACHE_MAX_DOCUMENTS', '16'))
+
+
+class ResponseCache:
+    """Responses (200 only) and parsed documents per URL for `ttl` seconds; disabled while ttl is 0."""
+
+    def __init__(self, ttl: int = 0, max_documents: int = RESPONSE_CACHE_MAX_DOCUMENTS):
+        self.ttl = ttl
+        self.max_documents = max_documents
+        self.stats: Counter = Counter()
+        self._lock = threading.Lock()
+        self._key_locks: Dict[Any, threading.Lock] = {}
+        self._responses: Dict[str, Tuple[float, requests.Response]] = {}
+        self._documents: 'OrderedDict[Tuple, Tuple[float, requests.Response, Any]]' = OrderedDict()
+        self._shared_urls: set = set()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def enable(self, ttl: int = RESPONSE_CACHE_TTL):
+        self.ttl = ttl
+
+    def share(self, urls: Iterable[str]):
+        """Start URLs of all loaded configs; documents are kept for those used more than once."""
+        counts = Counter(urls)
+        with self._lock:
+            self._shared_urls = {url for url, count in counts.items() if count > 1}
+
+    def _count(self, name: str):
+        with self._lock:
+            self.stats[name] += 1
+
+    def _key_lock(self, key) -> threading.Lock:
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def _purge(self, now: float):
+        """Drop expired entries (caller holds self._lock)."""
+        for url in [url for url, (expires, _) in self._responses.items() if expires <= now]:
+            del self._responses[url]
+            self._key_locks.pop(('response', url), None)
+        for key in [key for key, (expires, _, _) in self._documents.items() if expires <= now]:
+            del self._documents[key]
+            self._key_locks.pop(('document',) + key, None)
+
+    def fetch(self, url: str, fetch: Callable[[], requests.Response]) -> Tuple[requests.Response, bool]:
+        """The cached response for url, or fetch() it; returns (response, cache hit)."""
+        if not self.enabled:
+            return fetch(), False
+
+        with self._key_lock(('response', url)):
+            now = time.monotonic()
+            with self._lock:
+                self._purge(now)
+                cached = self._responses.get(url)
+            if cached:
+                self._count('response_hits')
+                return cached[1], True
+
+            response = fetch()
+            self._count('response_misses')
+            if response.status_code == 200:
+                with self._lock:
+                    self._responses[url] = (now + self.ttl, response)
+            return response, False
+
+    def document(self, url: str, response: requests.Response, engine, scope,
+                 parse: Callable[[], Any]) -> Tuple[Any, bool]:
+        """Parsed document of a response, shared if url is the start URL of several configs.
+
+        Returns (document, shared). Shared documents are read by several runs
+        and must not be freed by the caller.
+        """
+        if not self.enabled or url not in self._shared_urls:
+            return parse(), False
+
+        key = (url, id(response), engine.name, scope.css if scope else None)
+        with self._key_lock(('document',) + key):
+            now = time.monotonic()
+            with self._lock:
+                self._purge(now)
+                cached = self._documents.get(key)
+            if cached:
+                self._count('document_hits')
+                return cached[2], True
+
+            document = parse()
+            self._count('document_misses')
+            with self._lock:
+                # The response is kept alive with its document, so id(response) stays unique
+                self._documents[key] = (now + self.ttl, response, document)
+                while len(self._documents) > self.max_documents:
+                    self._documents.popitem(last=False)
+            return document, True
+
+    def summary(self) -> Dict[str, Any]:
+        """Hit counts and rates since the cache was enabled."""
+        with self._lock:
+            stats = Counter(self.stats)
+        result: Dict[str, Any] = dict(stats)
+        for kind in ('response', 'document'):
+            hits, misses = stats[f'{kind}_hits'], stats[f'{kind}_misses']
+            result[f'{kind}_hit_rate'] = round(hits / (hits + misses), 3) if hits + misses else None
+        return result
+
+
+RESPONSE_CACHE = ResponseCache()
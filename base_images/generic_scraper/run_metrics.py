@@ -0,0 +1,210 @@
+"""
+Structured per-run metrics for the generic scraper.
+Every run appends one JSON line to the run ledger in OUTPUT_DIR; optionally
+the latest run per crawler is rendered as a Prometheus textfile.
+"""
+import os
+import json
+import time
+import fcntl
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Any, Optional
+
+from config_loader import OUTPUT_DIR
+from selector_stats import SelectorStats
+from state_store import JsonStore, atomic_write
+
+
+RUN_LEDGER = os.environ.get('RUN_LEDGER', os.path.join(OUTPUT_DIR, 'scraper-runs.jsonl'))
+RUN_LEDGER_MAX_BYTES = int(os.environ.get('RUN_LEDGER_MAX_BYTES', str(5 * 1024 * 1024)))
+# e.g. /var/lib/node_exporter/textfile/gs_scraper.prom; disabled when empty
+PROMETHEUS_TEXTFILE = os.environ.get('PROMETHEUS_TEXTFILE', '')
+
+
+_PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+
+def rss_mb() -> Optional[float]:
+    """Current resident set size of this process in MB (None without /proc)."""
+    try:
+        with open('/proc/self/statm', 'rb') as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class RunMetrics:
+    """Counters and stage timings of one scraper run (thread-safe)."""
+
+    def __init__(self, crawler_id: str):
+        self._lock = threading.Lock()
+        self._start = time.perf_counter()
+        self.data: Dict[str, Any] = {
+            'crawler_id': crawler_id,
+            'started_at': datetime.now().strftime('%Y-%m-%dT%H:%M:%S'),
+            'fetch_ms': 0.0,
+            'ttfb_ms': None,
+            'requests': 0,
+            'bytes_downloaded': 0,
+            'rate_limit_wait_ms': 0.0,
+            'parse_ms': 0.0,
+            'extract_ms': 0.0,
+            'entries': 0,
+            'write_ms': 0.0,
+            'files_written': 0,
+            'files_unchanged': 0,
+        }
+        # Filled by the extraction of this run (single-threaded per run)
+        self.selectors = SelectorStats()
+        # RSS at the start of the run and the highest value sampled since
+        self._rss_start = rss_mb()
+        self._rss_peak = self._rss_start
+
+    def add(self, key: str, amount):
+        with self._lock:
+            self.data[key] = (self.data.get(key) or 0) + amount
+
+    def set(self, key: str, value):
+        with self._lock:
+            self.data[key] = value
+
+    def sample_memory(self) -> Optional[float]:
+        """Sample the process RSS for this run's peak; returns the current RSS in MB."""
+        rss = rss_mb()
+        if rss is not None:
+            with self._lock:
+                self._rss_peak = max(self._rss_peak or 0.0, rss)
+        return rss
+
+    @contextmanager
+    def stage(self, name: str):
+        """Add the wall time of the block to `<name>_ms`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(f'{name}_ms', (time.perf_counter() - start) * 1000)
+            self.sample_memory()
+
+    def record_response(self, response, seconds: float):
+        """Count one HTTP response and its download time."""
+        with self._lock:
+            self.data['requests'] += 1
+            self.data['bytes_downloaded'] += len(response.content)
+            self.data['fetch_ms'] += seconds * 1000
+            if self.data['ttfb_ms'] is None:
+                self.data['ttfb_ms'] = round(response.elapsed.total_seconds() * 1000, 1)
+
+    def finish(self, outcome: str, error: Optional[str] = None) -> Dict[str, Any]:
+        """Complete the record and write it to the ledger (and Prometheus textfile)."""
+        self.sample_memory()
+        with self._lock:
+            self.data['outcome'] = outcome
+            if error:
+                self.data['error'] = error[:500]
+            self.data['duration_ms'] = (time.perf_counter() - self._start) * 1000
+            if self._rss_start is not None:
+                self.data['rss_start_mb'] = round(self._rss_start, 1)
+                self.data['rss_peak_mb'] = round(self._rss_peak, 1)
+                self.data['rss_delta_mb'] = round(self._rss_peak - self._rss_start, 1)
+            if self.selectors.counts:
+                self.data['selectors'] = self.selectors.summary()
+            if self.selectors.containers is not None:
+                self.data['containers'] = self.selectors.containers
+            for key, value in self.data.items():
+                if key.endswith('_ms') and isinstance(value, float):
+                    self.data[key] = round(value, 1)
+            record = dict(self.data)
+
+        try:
+            append_ledger(record)
+            if PROMETHEUS_TEXTFILE:
+                update_prometheus(record)
+        except Exception as e:
+            print(f"Could not write run metrics: {e}")
+
+        print(f"Run metrics: outcome={outcome}, fetch {record['fetch_ms']} ms "
+              f"(rate limit wait {record['rate_limit_wait_ms']} ms), "
+              f"parse {record['parse_ms']} ms, extract {record['extract_ms']} ms, "
+              f"write {record['write_ms']} ms, {record['entries']} entries, "
+              f"{record['bytes_downloaded']} bytes, RSS +{record.get('rss_delta_mb', 0)} MB")
+        return record
+
+
+def append_ledger(record: Dict[str, Any], path: str = RUN_LEDGER):
+    """Append one JSON line, rotating the ledger to `<path>.1` when it gets too big."""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    line = json.dumps(record, ensure_ascii=False, sort_keys=True) + '\n'
+
+    with open(path + '.lock', 'a') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            if os.path.exists(path) and os.path.getsize(path) > RUN_LEDGER_MAX_BYTES:
+                os.replace(path, path + '.1')
+            with open(path, 'a', encoding='utf-8') as f:
+                f.write(line)
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"')
+
+
+def update_prometheus(record: Dict[str, Any], path: str = PROMETHEUS_TEXTFILE):
+    """Render the latest run of every crawler as a Prometheus textfile."""
+    with JsonStore('prometheus-last-runs.json').transaction() as runs:
+        runs[record['crawler_id']] = record
+        latest = dict(runs)
+
+    lines = [
+        '# HELP gs_scraper_stage_seconds Duration of a scraper run stage.',
+        '# TYPE gs_scraper_stage_seconds gauge',
+    ]
+    for crawler_id, run in sorted(latest.items()):
+        for stage in ('rate_limit_wait', 'fetch', 'parse', 'extract', 'write', 'duration'):
+            lines.append(f'gs_scraper_stage_seconds{{crawler="{_label(crawler_id)}",stage="{stage}"}} '
+                         f'{(run.get(f"{stage}_ms") or 0) / 1000:.4f}')
+
+    gauges = [
+        ('bytes_downloaded', 'gs_scraper_bytes_downloaded', 'Bytes downloaded in the last run.'),
+        ('entries', 'gs_scraper_entries', 'Entries extracted in the last run.'),
+        ('containers', 'gs_scraper_containers', 'Matches of the container selector in the last run.'),
+        ('requests', 'gs_scraper_requests', 'HTTP requests made in the last run.'),
+        ('effective_interval_s', 'gs_scraper_effective_interval_seconds', 'Current polling interval.'),
+    ]
+    for key, name, help_text in gauges:
+        lines += [f'# HELP {name} {help_text}', f'# TYPE {name} gauge']
+        for crawler_id, run in sorted(latest.items()):
+            lines.append(f'{name}{{crawler="{_label(crawler_id)}"}} {run.get(key) or 0}')
+
+    lines += ['# HELP gs_scraper_rss_delta_bytes RSS the last run added to the scraper process '
+              '(highest sample during the run minus RSS at its start).',
+              '# TYPE gs_scraper_rss_delta_bytes gauge']
+    for crawler_id, run in sorted(latest.items()):
+        lines.append(f'gs_scraper_rss_delta_bytes{{crawler="{_label(crawler_id)}"}} '
+                     f'{int((run.get("rss_delta_mb") or 0) * 1024 * 1024)}')
+
+    lines += ['# HELP gs_scraper_selector_hit_rate Share of containers where a field selector matched.',
+              '# TYPE gs_scraper_selector_hit_rate gauge']
+    for crawler_id, run in sorted(latest.items()):
+        for field, stats in sorted((run.get('selectors') or {}).items()):
+            if stats.get('hit_rate') is not None:
+                lines.append(f'gs_scraper_selector_hit_rate{{crawler="{_label(crawler_id)}",field="{_label(field)}"}} '
+                             f'{stats["hit_rate"]}')
+
+    lines += ['# HELP gs_scraper_last_run_success 1 if the last run did not fail.',
+              '# TYPE gs_scraper_last_run_success gauge']
+    for crawler_id, run in sorted(latest.items()):
+        lines.append(f'gs_scraper_last_run_success{{crawler="{_label(crawler_id)}"}} '
+                     f'{0 if run.get("outcome") == "error" else 1}')
+
+    lines += ['# HELP gs_scraper_last_run_timestamp_seconds Start time of the last run.',
+              '# TYPE gs_scraper_last_run_timestamp_seconds gauge']
+    for crawler_id, run in sorted(latest.items()):
+        started = datetime.strptime(run['started_at'], '%Y-%m-%dT%H:%M:%S').timestamp()
+        lines.append(f'gs_scraper_last_run_timestamp_seconds{{crawler="{_label(crawler_id)}"}} {started:.0f}')
+
+    atomic_write(path, ('\n'.join(lines) + '\n').encode('utf-8'))
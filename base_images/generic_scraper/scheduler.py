@@ -0,0 +1,344 @@
+"""
+Resident scheduler for the generic scraper.
+Evaluates the cron `schedule` of every config in-process and dispatches
+scraper runs onto a bounded worker pool (replaces one cron line per config).
+"""
+import os
+import re
+import time
+import signal
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Set, Callable, Tuple
+
+from config_loader import CONFIG_DIR, load_config
+from adaptive import ChangeTracker
+
+
+SCHEDULER_WORKERS = int(os.environ.get('SCHEDULER_WORKERS', '4'))
+SCHEDULER_MAX_QUEUE = int(os.environ.get('SCHEDULER_MAX_QUEUE', '100'))
+SCHEDULER_STATUS_INTERVAL = int(os.environ.get('SCHEDULER_STATUS_INTERVAL', '3600'))
+# Seconds after the scheduled time within which runs are spread (0 = off)
+SCHEDULE_STAGGER_WINDOW = int(os.environ.get('SCHEDULE_STAGGER_WINDOW', '0'))
+
+
+class CronSchedule:
+    """Minimal 5-field cron expression (minute hour day month weekday)."""
+
+    RANGES = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 7)]
+
+    def __init__(self, expression: str):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Invalid cron expression '{expression}': expected 5 fields")
+
+        self.expression = expression
+        parsed = [self._parse_field(field, low, high) for field, (low, high) in zip(fields, self.RANGES)]
+        self.minutes, self.hours, self.days, self.months, weekdays = parsed
+        # Cron allows both 0 and 7 for Sunday
+        self.weekdays = {0 if d == 7 else d for d in weekdays}
+        # Cron matches day-of-month OR day-of-week if both are restricted
+        self.day_restricted = fields[2] != '*'
+        self.weekday_restricted = fields[4] != '*'
+
+    @staticmethod
+    def _parse_field(field: str, low: int, high: int) -> Set[int]:
+        values = set()
+        for part in field.split(','):
+            step = 1
+            if '/' in part:
+                part, step_str = part.split('/', 1)
+                step = int(step_str)
+                if step < 1:
+                    raise ValueError(f"Invalid step in cron field '{field}'")
+
+            if part == '*':
+                start, end = low, high
+            elif '-' in part:
+                start_str, end_str = part.split('-', 1)
+                start, end = int(start_str), int(end_str)
+            else:
+                start = int(part)
+                end = high if step > 1 else start
+
+            if start < low or end > high or start > end:
+                raise ValueError(f"Value out of range in cron field '{field}'")
+            values.update(range(start, end + 1, step))
+        return values
+
+    def _matches_day(self, dt: datetime) -> bool:
+        weekday = (dt.weekday() + 1) % 7  # cron: Sunday = 0
+        day_match = dt.day in self.days
+        weekday_match = weekday in self.weekdays
+        if self.day_restricted and self.weekday_restricted:
+            return day_match or weekday_match
+        return day_match and weekday_match
+
+    def matches(self, dt: datetime) -> bool:
+        """Check whether the schedule fires in the minute of `dt`."""
+        return (
+            dt.minute in self.minutes
+            and dt.hour in self.hours
+            and dt.month in self.months
+            and self._matches_day(dt)
+        )
+
+    def next_run(self, after: datetime) -> Optional[datetime]:
+        """Return the first matching minute strictly after `after`."""
+        dt = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = dt + timedelta(days=366 * 4)
+
+        while dt < limit:
+            if dt.month not in self.months or not self._matches_day(dt):
+                dt = (dt + timedelta(days=1)).replace(hour=0, minute=0)
+                continue
+            if dt.hour not in self.hours:
+                dt = (dt + timedelta(hours=1)).replace(minute=0)
+                continue
+            if dt.minute not in self.minutes:
+                dt += timedelta(minutes=1)
+                continue
+            return dt
+
+        return None
+
+
+def stagger_offset(crawler_id: str, window: int) -> int:
+    """Stable offset in [0, window) seconds derived from the crawler id."""
+    if window <= 0:
+        return 0
+    return int(hashlib.sha1(crawler_id.encode('utf-8')).hexdigest()[:8], 16) % window
+
+
+def stagger_schedule(expression: str, crawler_id: str, window: int) -> Tuple[str, int]:
+    """Shift a cron schedule by the crawler's offset inside `window` seconds.
+
+    Whole minutes of the offset move fixed minute fields ("0", "0,30") and
+    steps ("*/15" -> "7-59/15"); the offset never reaches the next scheduled
+    minute, so the run frequency is unchanged. The remaining seconds are
+    returned as a start delay. Other minute fields only get the delay.
+    """
+    fields = expression.split()
+    if window <= 0 or len(fields) != 5:
+        return expression, 0
+
+    minute = fields[0]
+    step = re.fullmatch(r'\*/(\d+)', minute)
+    if re.fullmatch(r'\d+(,\d+)*', minute):
+        values = sorted({int(value) for value in minute.split(',')})
+        gaps = [b - a for a, b in zip(values, values[1:])] + [60 - values[-1] + values[0]]
+        max_shift = min(min(gaps), 60 - values[-1])
+        shift_field = lambda shift: ','.join(str(value + shift) for value in values)
+    elif step:
+        max_shift = int(step.group(1))
+        shift_field = lambda shift: f"{shift}-59/{max_shift}" if shift else minute
+    else:
+        max_shift = 1
+        shift_field = lambda shift: minute
+
+    shift, delay = divmod(stagger_offset(crawler_id, min(window, max_shift * 60)), 60)
+    return ' '.join([shift_field(shift)] + fields[1:]), delay
+
+
+def effective_schedule(config: Dict[str, Any]) -> Tuple[str, int]:
+    """The config's schedule after staggering, plus the start delay in seconds."""
+    window = int(config.get('stagger_window', SCHEDULE_STAGGER_WINDOW))
+    return stagger_schedule(config['schedule'], config['id'], window)
+
+
+def _interrupt(signum, frame):
+    """SIGTERM handler: stop the main loop the same way as Ctrl+C."""
+    raise KeyboardInterrupt
+
+
+class ScheduledConfig:
+    """A loaded config together with its parsed schedule."""
+
+    def __init__(self, path: str, config: Dict[str, Any], mtime: float):
+        self.path = path
+        self.config = config
+        self.mtime = mtime
+        expression, self.delay = effective_schedule(config)
+        self.cron = CronSchedule(expression)
+        self.next_run = self.cron.next_run(datetime.now())
+
+    @property
+    def id(self) -> str:
+        return self.config['id']
+
+
+class Scheduler:
+    """Run scraper configs from a directory on their cron schedules."""
+
+    def __init__(self, run_func: Callable[[str, Dict[str, Any]], Any],
+                 config_dir: str = CONFIG_DIR,
+                 workers: int = SCHEDULER_WORKERS,
+                 max_queue: int = SCHEDULER_MAX_QUEUE,
+                 on_reload: Optional[Callable[[List[Dict[str, Any]]], Any]] = None,
+                 on_status: Optional[Callable[[], Any]] = None):
+        self.run_func = run_func
+        # Called with all loaded configs after they changed / after each status report
+        self.on_reload = on_reload
+        self.on_status = on_status
+        self.config_dir = Path(config_dir)
+        self.workers = workers
+        self.max_queue = max_queue
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='scraper')
+        self.entries: Dict[str, ScheduledConfig] = {}
+        self.pending: Set[str] = set()
+        self.running: Set[str] = set()
+        self.lock = threading.Lock()
+        self._last_status = 0.0
+        self.tracker = ChangeTracker()
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of dispatched runs that have not started yet."""
+        with self.lock:
+            return len(self.pending - self.running)
+
+    def reload(self) -> bool:
+        """Load new or changed configs and drop deleted ones. Returns True on change."""
+        changed = False
+        seen = set()
+
+        for config_file in sorted(self.config_dir.glob('*.yaml')):
+            path = str(config_file)
+            seen.add(path)
+            try:
+                mtime = config_file.stat().st_mtime
+            except OSError:
+                continue
+
+            current = self.entries.get(path)
+            if current and current.mtime == mtime:
+                continue
+
+            try:
+                config = load_config(path)
+                config['_path'] = path
+                self.entries[path] = ScheduledConfig(path, config, mtime)
+                entry = self.entries[path]
+                delay = f" +{entry.delay}s" if entry.delay else ''
+                print(f"{'Reloaded' if current else 'Loaded'} config: {config['id']} ({entry.cron.expression}{delay})")
+            except Exception as e:
+                print(f"Error loading {config_file}: {e}")
+                if current:
+                    # Keep the last good version but do not retry every tick
+                    current.mtime = mtime
+                continue
+            changed = True
+
+        for path in list(self.entries):
+            if path not in seen:
+                print(f"Removed config: {self.entries[path].id}")
+                del self.entries[path]
+                changed = True
+
+        if changed and self.on_reload:
+            self.on_reload([entry.config for entry in self.entries.values()])
+        return changed
+
+    def dispatch(self, entry: ScheduledConfig, delay: int = 0) -> bool:
+        """Submit a run for `entry` (after `delay` seconds) unless it is already queued or the queue is full."""
+        with self.lock:
+            if entry.id in self.pending:
+                print(f"Skipping {entry.id}: previous run still queued or running")
+                return False
+            if len(self.pending - self.running) >= self.max_queue:
+                print(f"Skipping {entry.id}: queue full ({self.max_queue})")
+                return False
+            self.pending.add(entry.id)
+
+        if delay:
+            timer = threading.Timer(delay, self.executor.submit, args=(self._run, entry.path, entry.config))
+            timer.daemon = True
+            timer.start()
+        else:
+            self.executor.submit(self._run, entry.path, entry.config)
+        print(f"Dispatched {entry.id}{f' (starts in {delay}s)' if delay else ''} (queue depth: {self.queue_depth})")
+        return True
+
+    def _run(self, path: str, config: Dict[str, Any]):
+        crawler_id = config['id']
+        with self.lock:
+            self.running.add(crawler_id)
+        try:
+            self.run_func(path, config)
+        except Exception as e:
+            print(f"Unhandled error in scheduled run of {crawler_id}: {e}")
+        finally:
+            with self.lock:
+                self.running.discard(crawler_id)
+                self.pending.discard(crawler_id)
+
+    def status(self) -> List[Dict[str, Any]]:
+        """Snapshot of next-run times per config."""
+        with self.lock:
+            pending = set(self.pending)
+            running = set(self.running)
+        return [
+            {
+                'id': entry.id,
+                'schedule': entry.cron.expression,
+                'next_run': entry.next_run.strftime('%Y-%m-%d %H:%M') if entry.next_run else None,
+                'state': 'running' if entry.id in running else 'queued' if entry.id in pending else 'idle',
+                'interval': self.tracker.get(entry.id).get('interval') if entry.config.get('adaptive') else None,
+            }
+            for entry in sorted(self.entries.values(), key=lambda e: e.next_run or datetime.max)
+        ]
+
+    def print_status(self):
+        print(f"\n{'='*50}")
+        print(f"Scheduler status at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        print(f"Configs: {len(self.entries)}, workers: {self.workers}, queue depth: {self.queue_depth}")
+        for item in self.status():
+            interval = f"  every {item['interval'] // 60} min" if item['interval'] else ''
+            print(f"  {item['id']:35} {item['schedule']:15} next: {item['next_run']}  [{item['state']}]{interval}")
+        if self.on_status:
+            self.on_status()
+        print(f"{'='*50}")
+        self._last_status = time.monotonic()
+
+    def tick(self, now: datetime):
+        """Dispatch every config whose next run is due at `now` (and whose adaptive interval has passed)."""
+        for entry in list(self.entries.values()):
+            if entry.next_run and entry.next_run <= now:
+                if self.tracker.due(entry.config, now.timestamp() + entry.delay):
+                    self.dispatch(entry, entry.delay)
+                entry.next_run = entry.cron.next_run(now)
+
+    def run_forever(self, run_on_start: bool = True):
+        """Main loop: reload configs, dispatch due runs, sleep until the next minute."""
+        self.reload()
+
+        if run_on_start:
+            for entry in self.entries.values():
+                if entry.config.get('run_on_start', True):
+                    self.dispatch(entry)
+
+        self.print_status()
+
+        # docker stop sends SIGTERM; running scrapers get to finish as on Ctrl+C
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGTERM, _interrupt)
+
+        try:
+            while True:
+                now = datetime.now()
+                time.sleep(60 - now.second - now.microsecond / 1_000_000)
+
+                if self.reload():
+                    self.print_status()
+
+                self.tick(datetime.now().replace(second=0, microsecond=0))
+
+                if time.monotonic() - self._last_status >= SCHEDULER_STATUS_INTERVAL:
+                    self.print_status()
+        except KeyboardInterrupt:
+            print("Scheduler stopping, waiting for running scrapers...")
+        finally:
+            self.executor.shutdown(wait=True)
@@ -7,83 +7,154 @@ import sys
 import os
 import json
 import random
-import re
+import argparse
+import threading
+import time
 from datetime import datetime
-from typing import Dict, Any, List, Optional
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+from urllib.parse import urljoin
 
 import requests
 from bs4 import BeautifulSoup
 
-from config_loader import load_config, get_selector_config
+from config_loader import CONFIG_DIR, OUTPUT_DIR, load_config, config_fingerprint
+from http_cache import ValidatorStore, FetchMetrics
+from extraction import get_plan, compile_selector, selector_syntax
+from parsers import get_engine
+from batch import HostLimiter, run_all, print_summary
+from output_writer import write_json
+from pagination import template_urls, fetch_all, merge_entries
+from detail import enrich_entries
+from run_metrics import RunMetrics, rss_mb
+from item_store import ItemStore
+from feed import scrape_feed
+from parallel_extract import extract_parallel
+from selector_stats import SelectorStats, check_baseline
+from decoding import detect_encoding
+from response_cache import RESPONSE_CACHE
+from adaptive import ChangeTracker, content_hash
+from rate_limiter import get_rate_limiter
+from resilience import (
+    DEFAULT_POLICY, CircuitBreaker, CircuitOpenError, FetchPolicy, FreshnessStore, is_retryable
+)
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (compatible; GS-Crawler/1.0; +https://goslar.app)'
+}
+
+_thread_local = threading.local()
+
+HOST_LIMITER = HostLimiter()
+CIRCUIT_BREAKER = CircuitBreaker()
+
+
+def get_session() -> requests.Session:
+    """Per-thread HTTP session, so keep-alive connections are reused across runs."""
+    session = getattr(_thread_local, 'session', None)
+    if session is None:
+        session = requests.Session()
+        session.headers.update(HEADERS)
+        _thread_local.session = session
+    return session
+
+
+def fetch_response(url: str, headers: Optional[Dict[str, str]] = None,
+                   session: Optional[requests.Session] = None,
+                   metrics: Optional[RunMetrics] = None,
+                   policy: Optional[FetchPolicy] = None) -> requests.Response:
+    """Fetch a URL, sharing a recent response with other configs in batch and daemon mode."""
+    response, hit = RESPONSE_CACHE.fetch(url, lambda: fetch_uncached(url, headers, session, metrics, policy))
+    if metrics and RESPONSE_CACHE.enabled:
+        metrics.add('response_cache_hits' if hit else 'response_cache_misses', 1)
+    return response
+
+
+def fetch_uncached(url: str, headers: Optional[Dict[str, str]] = None,
+                   session: Optional[requests.Session] = None,
+                   metrics: Optional[RunMetrics] = None,
+                   policy: Optional[FetchPolicy] = None) -> requests.Response:
+    """Fetch a URL with retries; a 304 Not Modified response is returned, not raised.
+
+    Raises CircuitOpenError without making a request while the host's
+    circuit breaker is open.
+    """
+    session = session or get_session()
+    policy = policy or DEFAULT_POLICY
+    CIRCUIT_BREAKER.check(url)
+
+    for attempt in range(policy.retries + 1):
+        response = None
+        try:
+            with HOST_LIMITER.limit(url):
+                waited = get_rate_limiter().acquire(url)
+                if metrics and waited:
+                    metrics.add('rate_limit_wait_ms', waited * 1000)
+                start = time.perf_counter()
+                response = session.get(url, headers=headers, timeout=(policy.connect_timeout, policy.timeout))
+                if metrics:
+                    metrics.record_response(response, time.perf_counter() - start)
+            if response.status_code != 304:
+                response.raise_for_status()
+        except requests.RequestException as e:
+            if not is_retryable(e):
+                raise
+            if attempt == policy.retries:
+                CIRCUIT_BREAKER.record_failure(url, e)
+                raise
+            # Back off outside the host slot so other requests can proceed
+            delay = policy.delay(attempt + 1, response)
+            print(f"Fetch of {url} failed ({e}), retry {attempt + 1}/{policy.retries} in {delay:.1f}s")
+            if metrics:
+                metrics.add('retries', 1)
+            time.sleep(delay)
+        else:
+            CIRCUIT_BREAKER.record_success(url)
+            return response
 
 
-OUTPUT_DIR = os.environ.get('OUTPUT_DIR', '/app/output')
+def parse_page(response: requests.Response, engine=None, scope=None):
+    """Parse a fetched page's raw bytes with the given parser engine (default: html.parser)."""
+    engine = engine or get_engine()
+    encoding, _ = detect_encoding(response)
+    return engine.parse(response.content, scope, encoding)
 
 
 def fetch_page(url: str) -> BeautifulSoup:
     """Fetch and parse a webpage."""
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (compatible; GS-Crawler/1.0; +https://goslar.app)'
-    }
-    response = requests.get(url, headers=headers, timeout=30)
-    response.raise_for_status()
-    return BeautifulSoup(response.text, 'html.parser')
-
-
-def extract_value(element, selector_config: Dict[str, Any], base_url: str = '') -> Optional[str]:
-    """Extract a value from an element using selector config."""
-    selector = selector_config.get('selector', '')
-    attribute = selector_config.get('attribute', 'text')
-    prefix = selector_config.get('prefix', '')
-    fallback = selector_config.get('fallback')
-    default = selector_config.get('default')
-
-    if not selector:
-        return default
-
-    found = element.select_one(selector)
-    if not found:
-        return fallback if fallback is not None else default
-
-    # Extract value based on attribute type
-    if attribute == 'text':
-        value = found.get_text(strip=True)
-    elif attribute in ('href', 'src', 'id'):
-        value = found.get(attribute, '')
-    else:
-        value = found.get(attribute, '')
-
-    if value and prefix:
-        # Don't add prefix if value is already absolute URL
-        if not value.startswith(('http://', 'https://')):
-            value = prefix + value
+    return parse_page(fetch_response(url))
 
-    return value if value else (fallback if fallback is not None else default)
 
-
-def scrape_simple(soup: BeautifulSoup, config: Dict[str, Any]) -> List[Dict[str, Any]]:
+def scrape_simple(soup, config: Dict[str, Any], engine=None,
+                  stats: Optional[SelectorStats] = None) -> List[Dict[str, Any]]:
     """Scrape using simple container-based approach."""
-    selectors = config['selectors']
-    base_url = config.get('base_url', config['url'])
+    plan = get_plan(config)
+    engine = engine or get_engine(config.get('parser'))
 
-    container_selector = selectors.get('container', '')
-    if not container_selector:
+    if plan.container is None:
         print(f"Warning: No container selector defined for {config['id']}")
         return []
 
-    containers = soup.select(container_selector)
+    containers = engine.select(soup, plan.container)
     print(f"Found {len(containers)} items for {config['id']}")
-
+    if stats is not None:
+        stats.count_containers(len(containers))
+
+    # Very large pages are extracted in a process pool (JSON payloads have no markup to split)
+    rows = extract_parallel(containers, plan.fields, engine, config, stats) if config.get('type') != 'json' else None
+    if rows is None and stats is not None:
+        rows = ({field: stats.extract(field, field_plan, container, engine) for field, field_plan in plan.fields}
+                for container in containers)
+    elif rows is None:
+        rows = ({field: field_plan.extract(container, engine) for field, field_plan in plan.fields}
+                for container in containers)
+
+    published_at = datetime.now().strftime('%Y-%m-%dT%H:%M')
     entries = []
-    for index, container in enumerate(containers):
-        entry = {
-            'id': index + 1,
-            'title': extract_value(container, get_selector_config(selectors, 'title'), base_url),
-            'description': extract_value(container, get_selector_config(selectors, 'description'), base_url),
-            'image_url': extract_value(container, get_selector_config(selectors, 'image_url'), base_url),
-            'call_to_action_url': extract_value(container, get_selector_config(selectors, 'call_to_action_url'), base_url),
-            'published_at': datetime.now().strftime('%Y-%m-%dT%H:%M')
-        }
+    for index, values in enumerate(rows):
+        entry = {'id': index + 1}
+        entry.update(values)
+        entry['published_at'] = published_at
 
         # Only add entries that have at least a title or description
         if entry['title'] or entry['description']:
@@ -92,48 +163,41 @@ def scrape_simple(soup: BeautifulSoup, config: Dict[str, Any]) -> List[Dict[str,
     return entries
 
 
-def scrape_nested(soup: BeautifulSoup, config: Dict[str, Any]) -> List[Dict[str, Any]]:
+def scrape_nested(soup, config: Dict[str, Any], engine=None,
+                  stats: Optional[SelectorStats] = None) -> List[Dict[str, Any]]:
     """Scrape using nested container approach (for tschuessschule-style pages)."""
-    selectors = config['selectors']
-    base_url = config.get('base_url', config['url'])
+    plan = get_plan(config)
+    engine = engine or get_engine(config.get('parser'))
     url = config['url']
 
-    container_selector = selectors.get('container', '')
-    containers = soup.select(container_selector)
+    if plan.container is None or plan.items is None:
+        return []
 
+    stats = stats or SelectorStats()
     entries = []
     entry_id = 1
 
+    containers = engine.select(soup, plan.container)
+    stats.count_containers(len(containers))
     for container in containers:
         # Get category title from container
-        category_config = get_selector_config(selectors, 'category_title')
-        category_title = extract_value(container, category_config, base_url)
-
-        # Get items config
-        items_config = selectors.get('items', {})
-        items_selector = items_config.get('selector', '')
-
-        if not items_selector:
-            continue
+        category_title = stats.extract('category_title', plan.category_title, container, engine)
+        title = plan.title_override if plan.title_override is not None else category_title
 
-        items = container.select(items_selector)
-
-        for item in items:
+        for item in engine.select(container, plan.items):
             # Extract image
-            image_config = items_config.get('image_url', {})
-            image_url = extract_value(item, image_config, base_url) if image_config else None
+            image_url = stats.extract('image_url', plan.image_url, item, engine) if plan.image_url else None
 
             # Build call_to_action_url
-            cta_config = items_config.get('call_to_action_url', {})
-            if cta_config.get('template'):
-                item_id = item.get(cta_config.get('item_id_attribute', 'id'), '')
-                call_to_action_url = cta_config['template'].format(url=url, item_id=item_id)
+            if plan.cta_template:
+                item_id = engine.attr(item, plan.item_id_attribute)
+                call_to_action_url = plan.cta_template.format(url=url, item_id=item_id)
             else:
-                call_to_action_url = extract_value(item, cta_config, base_url)
+                call_to_action_url = stats.extract('call_to_action_url', plan.call_to_action_url, item, engine)
 
             entry = {
                 'id': entry_id,
-                'title': config['output']['single'].get('title_override', category_title),
+                'title': title,
                 'description': category_title,
                 'image_url': image_url,
                 'call_to_action_url': call_to_action_url,
@@ -146,6 +210,101 @@ def scrape_nested(soup: BeautifulSoup, config: Dict[str, Any]) -> List[Dict[str,
     return entries
 
 
+def scrape(document, config: Dict[str, Any], engine=None,
+           stats: Optional[SelectorStats] = None) -> List[Dict[str, Any]]:
+    """Scrape a parsed document based on the config type, counting selector outcomes in `stats`."""
+    if config.get('type', 'simple') == 'nested':
+        return scrape_nested(document, config, engine, stats)
+    return scrape_simple(document, config, engine, stats)
+
+
+def find_next_url(document, page_url: str, config: Dict[str, Any], engine) -> Optional[str]:
+    """Absolute URL of the next page link, if `pagination.next_selector` is configured."""
+    next_selector = (config.get('pagination') or {}).get('next_selector')
+    if not next_selector:
+        return None
+
+    link = engine.select_one(document, compile_selector(next_selector, selector_syntax(config)))
+    if link is None:
+        href = ''
+    elif config.get('type') == 'json':
+        # The expression points at the URL value itself
+        href = engine.text(link)
+    else:
+        href = engine.attr(link, 'href')
+    return urljoin(page_url, href) if href else None
+
+
+def extract_page(response: requests.Response, config: Dict[str, Any], engine,
+                 metrics: Optional[RunMetrics] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """Parse one fetched page and return its entries and the next page URL."""
+    scope = get_plan(config).scope if engine.supports_scope else None
+    parse_start = time.perf_counter()
+    # Configs starting from the same URL share one parsed document in batch/daemon mode
+    requested_url = response.history[0].url if response.history else response.url
+    document, shared = RESPONSE_CACHE.document(requested_url, response, engine, scope,
+                                               lambda: parse_page(response, engine, scope))
+    parse_time = time.perf_counter() - parse_start
+
+    extract_start = time.perf_counter()
+    entries = scrape(document, config, engine, metrics.selectors if metrics else None)
+    next_url = find_next_url(document, response.url, config, engine)
+    if metrics:
+        metrics.add('parse_ms', parse_time * 1000)
+        metrics.add('extract_ms', (time.perf_counter() - extract_start) * 1000)
+    # The parsed tree is usually the largest allocation of a run, sample before it is released
+    rss = metrics.sample_memory() if metrics else rss_mb()
+
+    # Release the tree before post-processing and writing (shared trees are released by the cache)
+    if not shared:
+        engine.free(document)
+    del document
+    print(f"Parsed {response.url} with {engine.name}{f' (scope: {scope.css})' if scope else ''} "
+          f"in {parse_time * 1000:.1f} ms{f', RSS {rss:.1f} MB' if rss is not None else ''}")
+
+    return entries, next_url
+
+
+def scrape_more_pages(config: Dict[str, Any], engine, first_entries: List[Dict[str, Any]],
+                      next_url: Optional[str], metrics: Optional[RunMetrics] = None) -> List[Dict[str, Any]]:
+    """Fetch and scrape the pages after the first one and merge all entries."""
+    max_pages = int(config['pagination'].get('max_pages', 10))
+    session = get_session()
+    policy = FetchPolicy.from_config(config)
+    pages = [first_entries]
+
+    urls = template_urls(config)
+    if urls:
+        # Known page URLs: fetch concurrently over this run's session
+        responses = fetch_all(urls, lambda page_url: fetch_response(page_url, session=session,
+                                                                   metrics=metrics, policy=policy))
+        for response in responses:
+            if response is None:
+                break
+            entries, _ = extract_page(response, config, engine, metrics)
+            if not entries:
+                break
+            pages.append(entries)
+    else:
+        # Next links are only known after parsing the previous page
+        visited = {config['url']}
+        while next_url and next_url not in visited and len(pages) < max_pages:
+            visited.add(next_url)
+            try:
+                response = fetch_response(next_url, session=session, metrics=metrics, policy=policy)
+            except Exception as e:
+                print(f"Page fetch failed for {next_url}: {e}")
+                break
+            entries, next_url = extract_page(response, config, engine, metrics)
+            if not entries:
+                break
+            pages.append(entries)
+
+    merged = merge_entries(pages, config)
+    print(f"Merged {sum(len(p) for p in pages)} entries from {len(pages)} pages into {len(merged)} unique entries")
+    return merged
+
+
 def select_single(entries: List[Dict], config: Dict[str, Any]) -> Dict[str, Any]:
     """Select a single entry based on selection strategy."""
     if not entries:
@@ -156,7 +315,8 @@ def select_single(entries: List[Dict], config: Dict[str, Any]) -> Dict[str, Any]
     if strategy == 'first':
         selected = entries[0].copy()
     elif strategy == 'random':
-        selected = random.choice(entries).copy()
+        # Seeded with the content, so unchanged entries keep the same pick and the file stays untouched
+        selected = random.Random(content_hash(entries)).choice(entries).copy()
     elif strategy == 'latest':
         # Sort by published_at if available
         sorted_entries = sorted(
@@ -199,56 +359,170 @@ def apply_post_processing(entry: Dict[str, Any], all_entries: List[Dict], config
     return entry
 
 
-def save_output(entries: List[Dict], single_entry: Dict, config: Dict[str, Any]):
-    """Save output files."""
+def output_paths(config: Dict[str, Any]) -> List[str]:
+    """Paths of all enabled output files of a config."""
+    output_config = config.get('output', {})
+    paths = []
+    if output_config.get('all', {}).get('enabled', False):
+        paths.append(os.path.join(OUTPUT_DIR, output_config['all'].get('filename', f"{config['id']}-alle.json")))
+    if output_config.get('single', {}).get('enabled', False):
+        paths.append(os.path.join(OUTPUT_DIR, output_config['single'].get('filename', f"{config['id']}.json")))
+    return paths
+
+
+def _stable_key(entry: Dict[str, Any]) -> str:
+    return json.dumps({key: value for key, value in entry.items() if key not in ('id', 'published_at')},
+                      sort_keys=True, ensure_ascii=False)
+
+
+def keep_published_at(entries: List[Dict], path: str):
+    """Give entries that are otherwise unchanged the published_at of the previous output at path.
+
+    published_at is the scrape time, so without this every run would rewrite the file.
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            previous = json.load(f)
+    except (OSError, ValueError):
+        return
+    stamps = {}
+    for entry in previous if isinstance(previous, list) else [previous]:
+        if isinstance(entry, dict) and entry.get('published_at'):
+            stamps.setdefault(_stable_key(entry), entry['published_at'])
+    if not stamps:
+        return
+    for entry in entries:
+        if entry.get('published_at'):
+            entry['published_at'] = stamps.get(_stable_key(entry), entry['published_at'])
+
+
+def save_output(entries: List[Dict], single_entry: Dict, config: Dict[str, Any]) -> Dict[str, str]:
+    """Save output files that changed. Returns {filename: 'written' | 'unchanged'}."""
     os.makedirs(OUTPUT_DIR, exist_ok=True)
     output_config = config.get('output', {})
+    results = {}
 
     # Save "all" file
     if output_config.get('all', {}).get('enabled', False):
         all_filename = output_config['all'].get('filename', f"{config['id']}-alle.json")
-        all_path = os.path.join(OUTPUT_DIR, all_filename)
-        with open(all_path, 'w', encoding='utf-8') as f:
-            json.dump(entries, f, ensure_ascii=False, indent=2)
-        print(f"Saved {len(entries)} entries to {all_filename}")
+        keep_published_at(entries, os.path.join(OUTPUT_DIR, all_filename))
+        written = write_json(os.path.join(OUTPUT_DIR, all_filename), entries)
+        results[all_filename] = 'written' if written else 'unchanged'
+        if written:
+            print(f"Saved {len(entries)} entries to {all_filename}")
+        else:
+            print(f"Unchanged: {all_filename} ({len(entries)} entries)")
 
     # Save "single" file
     if output_config.get('single', {}).get('enabled', False) and single_entry:
         single_filename = output_config['single'].get('filename', f"{config['id']}.json")
-        single_path = os.path.join(OUTPUT_DIR, single_filename)
-        with open(single_path, 'w', encoding='utf-8') as f:
-            json.dump(single_entry, f, ensure_ascii=False, indent=2)
-        print(f"Saved single entry to {single_filename}")
+        keep_published_at([single_entry], os.path.join(OUTPUT_DIR, single_filename))
+        written = write_json(os.path.join(OUTPUT_DIR, single_filename), single_entry)
+        results[single_filename] = 'written' if written else 'unchanged'
+        if written:
+            print(f"Saved single entry to {single_filename}")
+        else:
+            print(f"Unchanged: {single_filename}")
+
+    return results
+
+
+def record_change(config: Dict[str, Any], entries: Optional[List[Dict[str, Any]]], run_metrics: RunMetrics):
+    """Record whether the content changed and the resulting polling interval."""
+    interval, changed = ChangeTracker().record(config, entries)
+    run_metrics.set('content_changed', changed)
+    run_metrics.set('effective_interval_s', interval)
+    if config.get('adaptive'):
+        print(f"Content {'changed' if changed else 'unchanged'}, next run in {interval // 60} min")
+
+
+def check_selectors(config: Dict[str, Any], run_metrics: RunMetrics):
+    """Warn about selectors that stopped matching (sharp hit-rate drops, no containers at all)."""
+    stats = run_metrics.selectors
+    summary = stats.summary()
+    if not summary and stats.containers is None:
+        return
+    alerts = check_baseline(config['id'], summary, containers=stats.containers)
+    for alert in alerts:
+        if alert['field'] == 'container':
+            print(f"Warning: container selector in {config['id']} matched no items "
+                  f"(baseline {alert['baseline']:g}), the page markup may have changed")
+        else:
+            print(f"Warning: selector for '{alert['field']}' in {config['id']} matched {alert['hit_rate']:.0%} "
+                  f"of items (baseline {alert['baseline']:.0%}), the page markup may have changed")
+    if alerts:
+        run_metrics.set('selector_alerts', alerts)
 
 
-def run_scraper(config_path: str):
-    """Main scraper execution."""
+def run_scraper(config_path: str, config: Optional[Dict[str, Any]] = None) -> bool:
+    """Main scraper execution. Returns True on success."""
     print(f"\n{'='*50}")
     print(f"Starting scraper at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print(f"Config: {config_path}")
     print(f"{'='*50}")
 
+    run_metrics = RunMetrics(config['id'] if config else Path(config_path).stem)
     try:
-        # Load config
-        config = load_config(config_path)
+        # Load config (the daemon passes an already loaded one)
+        if config is None:
+            config = load_config(config_path)
+            run_metrics.set('crawler_id', config['id'])
         print(f"Crawler: {config['name']} ({config['id']})")
         print(f"URL: {config['url']}")
 
-        # Fetch page
-        soup = fetch_page(config['url'])
-
-        # Scrape based on type
-        scraper_type = config.get('type', 'simple')
-        if scraper_type == 'nested':
-            entries = scrape_nested(soup, config)
+        # Fetch page, conditionally if earlier output is still present
+        url = config['url']
+        validators = ValidatorStore()
+        fetch_metrics = FetchMetrics()
+        fingerprint = config_fingerprint(config)
+        # With pagination an unchanged first page says nothing about later pages
+        conditional = config.get('conditional_fetch', True) and not config.get('pagination') and all(
+            os.path.exists(path) for path in output_paths(config)
+        )
+        request_headers = validators.conditional_headers(config['id'], url, fingerprint) if conditional else {}
+
+        policy = FetchPolicy.from_config(config)
+        response = fetch_response(url, request_headers, metrics=run_metrics, policy=policy)
+        if response.status_code == 304:
+            fetch_metrics.record(config['id'], not_modified=True, bytes_saved=validators.content_length(config['id'], url))
+            print(f"Page not modified since last run, keeping existing output for {config['id']}")
+            FreshnessStore().mark_fresh(config['id'])
+            record_change(config, None, run_metrics)
+            run_metrics.finish('not_modified')
+            return True
+        fetch_metrics.record(config['id'], not_modified=False, bytes_downloaded=len(response.content))
+
+        engine = get_engine(config.get('parser'))
+        if config['type'] == 'feed':
+            entries = scrape_feed(response, config, run_metrics)
         else:
-            entries = scrape_simple(soup, config)
+            entries, next_url = extract_page(response, config, engine, run_metrics)
+
+            if config.get('pagination'):
+                entries = scrape_more_pages(config, engine, entries, next_url, run_metrics)
+            check_selectors(config, run_metrics)
 
+        detail_plan = get_plan(config).detail
+        if detail_plan and entries:
+            with run_metrics.stage('detail'):
+                enrich_entries(entries, config, detail_plan,
+                               lambda detail_url, headers: fetch_response(detail_url, headers, metrics=run_metrics,
+                                                                              policy=policy))
+
+        run_metrics.set('entries', len(entries))
         if not entries:
             print(f"No entries found for {config['id']}")
-            return
+            validators.invalidate(config['id'], url)
+            # An empty page is no evidence that the content is stable, keep the interval
+            run_metrics.finish('no_entries')
+            return True
 
         print(f"Scraped {len(entries)} entries")
+        record_change(config, entries, run_metrics)
+
+        # Stable ids and first-seen timestamps across runs
+        if config.get('history', {}).get('enabled', False):
+            entries = ItemStore(config['id']).apply(entries, config)
 
         # Select single entry
         single_entry = select_single(entries, config)
@@ -258,26 +532,185 @@ def run_scraper(config_path: str):
             single_entry = apply_post_processing(single_entry, entries, config)
 
         # Save output
-        save_output(entries, single_entry, config)
+        with run_metrics.stage('write'):
+            written = save_output(entries, single_entry, config)
+        run_metrics.set('files_written', sum(1 for result in written.values() if result == 'written'))
+        run_metrics.set('files_unchanged', sum(1 for result in written.values() if result == 'unchanged'))
+        validators.update(config['id'], url, response, fingerprint)
+        FreshnessStore().mark_fresh(config['id'])
 
         print(f"Scraper {config['id']} completed successfully")
+        run_metrics.finish('success')
+        return True
 
     except Exception as e:
         print(f"Error in scraper: {e}")
-        import traceback
-        traceback.print_exc()
+        if not isinstance(e, (CircuitOpenError, requests.RequestException)):
+            import traceback
+            traceback.print_exc()
+        if config is not None:
+            handle_failure(config, e, run_metrics)
+        run_metrics.finish(run_metrics.data.get('outcome', 'error'), str(e))
+        return False
+
+
+def handle_failure(config: Dict[str, Any], error: Exception, run_metrics: RunMetrics):
+    """Apply the config's error policy: keep the previous output (marked stale) or empty it."""
+    policy = FetchPolicy.from_config(config)
+    state = FreshnessStore().mark_stale(config['id'], error)
+    run_metrics.set('stale_since', state['stale_since'])
+
+    last_success = state.get('last_success')
+    stale_seconds = (datetime.now() - datetime.fromisoformat(last_success)).total_seconds() if last_success else 0
+    expired = policy.stale_max_age and (not last_success or stale_seconds > policy.stale_max_age)
+
+    if policy.on_error == 'empty' or expired:
+        save_output([], {}, config)
+        print(f"Emptied output of {config['id']} after failure (policy: {policy.on_error}, "
+              f"last success: {last_success or 'never'})")
+        run_metrics.set('outcome', 'error')
+    elif any(os.path.exists(path) for path in output_paths(config)):
+        print(f"Serving stale output for {config['id']} (stale since {state['stale_since']}, "
+              f"last success: {last_success or 'unknown'})")
+        run_metrics.set('outcome', 'stale')
+
+
+def compare_entries(left: List[Dict], right: List[Dict]) -> List[str]:
+    """Describe differences between two entry lists (published_at is ignored)."""
+    differences = []
+    if len(left) != len(right):
+        differences.append(f"entry count differs: {len(left)} vs {len(right)}")
+
+    for index, (a, b) in enumerate(zip(left, right)):
+        for key in sorted(set(a) | set(b)):
+            if key == 'published_at':
+                continue
+            if a.get(key) != b.get(key):
+                differences.append(f"entry {index + 1} field '{key}': {a.get(key)!r} vs {b.get(key)!r}")
+
+    return differences
+
+
+def verify_parsers(config_path: str, parsers: List[str]) -> bool:
+    """Run two parser backends on one fetched page and report differing entries."""
+    config = load_config(config_path)
+    left, right = (get_engine(name) for name in parsers)
+
+    print(f"Verifying parsers {left.name} vs {right.name} for {config['id']}")
+    response = fetch_response(config['url'])
+
+    results = []
+    for engine in (left, right):
+        scope = get_plan(config).scope if engine.supports_scope else None
+        start = time.perf_counter()
+        document = parse_page(response, engine, scope)
+        parse_time = time.perf_counter() - start
+        entries = scrape(document, config, engine)
+        total_time = time.perf_counter() - start
+        print(f"  {engine.name:12} {len(entries):5} entries, parse {parse_time * 1000:8.1f} ms, "
+              f"total {total_time * 1000:8.1f} ms")
+        results.append(entries)
+
+    differences = compare_entries(*results)
+    if differences:
+        print(f"{len(differences)} difference(s) found:")
+        for difference in differences:
+            print(f"  - {difference}")
+        return False
+
+    print("No differences found")
+    return True
+
+
+def share_start_urls(configs: List[Dict[str, Any]]):
+    """Enable the shared response cache for this process and register the configs' start URLs."""
+    RESPONSE_CACHE.enable()
+    RESPONSE_CACHE.share(config['url'] for config in configs)
+
+
+def run_batch(config_dir: str) -> bool:
+    """Run all configs in config_dir once, concurrently. Returns True if all succeeded."""
+    start = time.perf_counter()
+    results = run_all(config_dir, run_scraper, before_run=share_start_urls)
+    print_summary(results, time.perf_counter() - start)
+    print_cache_summary()
+    return all(result['success'] for result in results)
+
+
+def print_cache_summary():
+    if not RESPONSE_CACHE.enabled:
+        return
+    stats = RESPONSE_CACHE.summary()
+    rate = lambda value: f"{value:.0%}" if value is not None else '-'
+    print(f"Shared response cache (TTL {RESPONSE_CACHE.ttl}s): "
+          f"responses {stats.get('response_hits', 0)} hits / {stats.get('response_misses', 0)} misses "
+          f"({rate(stats['response_hit_rate'])}), "
+          f"documents {stats.get('document_hits', 0)} hits / {stats.get('document_misses', 0)} misses "
+          f"({rate(stats['document_hit_rate'])})")
+
+
+def run_daemon(config_dir: str):
+    """Run all configs in config_dir on their schedules in this process."""
+    from scheduler import Scheduler
+
+    print(f"Starting scheduler daemon for {config_dir}")
+    run_on_start = os.environ.get('RUN_ON_START', 'true') == 'true'
+    Scheduler(run_scraper, config_dir=config_dir, on_reload=share_start_urls,
+              on_status=print_cache_summary).run_forever(run_on_start=run_on_start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generic config-driven web scraper')
+    parser.add_argument('config_path', nargs='?', help='Path to a crawler YAML config')
+    parser.add_argument('--daemon', action='store_true',
+                        help='Run all configs from --config-dir on their cron schedules')
+    parser.add_argument('--all', metavar='CONFIG_DIR', dest='all_dir',
+                        help='Run all configs in CONFIG_DIR once, concurrently')
+    parser.add_argument('--config-dir', default=CONFIG_DIR,
+                        help=f'Config directory for --daemon (default: {CONFIG_DIR})')
+    parser.add_argument('--verify', nargs=2, metavar=('PARSER_A', 'PARSER_B'),
+                        help='Run two parser backends on the config and report differences')
+    parser.add_argument('--force', action='store_true',
+                        help='Run the config even if its adaptive interval has not passed yet')
+    args = parser.parse_args()
+
+    if args.daemon:
+        run_daemon(args.config_dir)
+        return
+
+    if args.all_dir:
+        if not run_batch(args.all_dir):
+            sys.exit(1)
+        return
+
+    if not args.config_path:
+        parser.print_usage()
+        print("       python scraper.py /app/configs/002_gz.yaml")
+        print("       python scraper.py --all /app/configs")
+        print("       python scraper.py --daemon")
         sys.exit(1)
 
-
-if __name__ == '__main__':
-    if len(sys.argv) < 2:
-        print("Usage: python scraper.py <config_path>")
-        print("       python scraper.py /app/configs/002_gz.yaml")
+    if not os.path.exists(args.config_path):
+        print(f"Config file not found: {args.config_path}")
         sys.exit(1)
 
-    config_path = sys.argv[1]
-    if not os.path.exists(config_path):
-        print(f"Config file not found: {config_path}")
+    if args.verify:
+        if not verify_parsers(args.config_path, args.verify):
+            sys.exit(1)
+        return
+
+    # Config errors are reported (and recorded) by run_scraper itself
+    try:
+        config = load_config(args.config_path)
+    except Exception:
+        config = None
+    if config and not args.force and not ChangeTracker().due(config):
+        print(f"Skipping {config['id']}: adaptive interval not reached yet (use --force to run anyway)")
+        return
+
+    if not run_scraper(args.config_path, config):
         sys.exit(1)
 
-    run_scraper(config_path)
+
+if __name__ == '__main__':
+    main()
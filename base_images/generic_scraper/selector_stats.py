@@ -0,0 +1,116 @@
+"""
+Per-field selector diagnostics.
+While extracting, every field counts how often its selector matched, fell
+back to `fallback`/`default` or gave an empty value, and the time spent in
+it. The counts go into the run ledger; a field whose hit rate drops far
+below its rolling baseline (STATE_DIR/selector-baseline.json) is reported,
+which usually means the site changed its markup. The container selector is
+tracked the same way: a run where it matches nothing although it used to
+match is reported as well.
+"""
+import os
+import time
+from typing import Dict, Any, List, Optional
+
+from extraction import MATCH, FALLBACK, EMPTY
+from state_store import JsonStore
+
+
+# Alert when a field's hit rate falls this far (absolute) below its baseline
+SELECTOR_ALERT_DROP = float(os.environ.get('SELECTOR_ALERT_DROP', '0.3'))
+# Runs needed before a baseline is trusted; weight of the newest run in it
+SELECTOR_BASELINE_MIN_RUNS = 3
+SELECTOR_BASELINE_WEIGHT = 0.2
+# Time one in this many selector calls; timing every call would cost more than counting
+TIMING_SAMPLE = 16
+
+
+class SelectorStats:
+    """Match/fallback/empty counts and time per field of one run."""
+
+    def __init__(self):
+        # field -> [matches, fallbacks, empty, seconds of the timed calls, timed calls]
+        self.counts: Dict[str, List] = {}
+        # Matches of the container selector over all pages (None: no container selector ran)
+        self.containers: Optional[int] = None
+
+    def count_containers(self, count: int):
+        """Add the matches of the container selector on one page."""
+        self.containers = (self.containers or 0) + count
+
+    def extract(self, field: str, field_plan, element, engine) -> Optional[str]:
+        """field_plan.extract(), counted under `field` (fields without a selector are not counted)."""
+        if field_plan.selector is None:
+            return field_plan.default
+        counts = self.counts.get(field)
+        if counts is None:
+            counts = self.counts[field] = [0, 0, 0, 0.0, 0]
+        # Only every TIMING_SAMPLE-th call is timed, the rest just counts
+        if (counts[MATCH] + counts[FALLBACK] + counts[EMPTY]) % TIMING_SAMPLE:
+            value, outcome = field_plan.lookup(element, engine)
+        else:
+            start = time.perf_counter()
+            value, outcome = field_plan.lookup(element, engine)
+            counts[3] += time.perf_counter() - start
+            counts[4] += 1
+        counts[outcome] += 1
+        return value
+
+    def merge(self, counts: Dict[str, List]):
+        """Add counts collected elsewhere (e.g. in a parallel extraction worker)."""
+        for field, values in counts.items():
+            own = self.counts.setdefault(field, [0, 0, 0, 0.0, 0])
+            for index, value in enumerate(values):
+                own[index] += value
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Ledger form: counts, hit rate and (extrapolated) milliseconds per field."""
+        result = {}
+        for field, counts in sorted(self.counts.items()):
+            total = counts[MATCH] + counts[FALLBACK] + counts[EMPTY]
+            result[field] = {
+                'matches': counts[MATCH],
+                'fallbacks': counts[FALLBACK],
+                'empty': counts[EMPTY],
+                'hit_rate': round(counts[MATCH] / total, 3) if total else None,
+                'ms': round(counts[3] * 1000 * total / counts[4], 2) if counts[4] else 0.0,
+            }
+        return result
+
+
+def check_baseline(crawler_id: str, summary: Dict[str, Dict[str, Any]],
+                   store: Optional[JsonStore] = None, containers: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Update the rolling hit-rate baseline of each field; returns the fields that dropped sharply.
+
+    `containers` (matches of the container selector) is tracked under the
+    field name 'container'; dropping to zero against a non-zero baseline is
+    always reported, since then no field gets to run at all.
+    """
+    alerts = []
+    store = store or JsonStore('selector-baseline.json')
+    with store.transaction() as data:
+        baselines = data.setdefault(crawler_id, {})
+        if containers is not None:
+            baseline = baselines.get('container')
+            if baseline is None:
+                baselines['container'] = {'matches': containers, 'runs': 1}
+            else:
+                if containers == 0 and baseline['matches'] > 0:
+                    alerts.append({'field': 'container', 'matches': 0, 'baseline': round(baseline['matches'], 1)})
+                baseline['matches'] += SELECTOR_BASELINE_WEIGHT * (containers - baseline['matches'])
+                baseline['runs'] += 1
+
+        for field, stats in summary.items():
+            hit_rate = stats['hit_rate']
+            if hit_rate is None:
+                continue
+            baseline = baselines.get(field)
+            if baseline is None:
+                baselines[field] = {'hit_rate': hit_rate, 'runs': 1}
+                continue
+
+            if baseline['runs'] >= SELECTOR_BASELINE_MIN_RUNS and hit_rate < baseline['hit_rate'] - SELECTOR_ALERT_DROP:
+                alerts.append({'field': field, 'hit_rate': hit_rate, 'baseline': round(baseline['hit_rate'], 3)})
+            baseline['hit_rate'] += SELECTOR_BASELINE_WEIGHT * (hit_rate - baseline['hit_rate'])
+            baseline['runs'] += 1
+    return alerts
@@ -2,6 +2,12 @@
 echo "Starting Generic Scraper..."
 cd /app
 
+# Resident scheduler: one Python process evaluates all schedules in-process
+if [ "${SCRAPER_MODE:-cron}" = "daemon" ]; then
+    echo "Starting scheduler daemon..."
+    exec python3 scraper.py --daemon --config-dir /app/configs
+fi
+
 # Generate crontab from config files
 echo "Generating crontab from configs..."
 python3 -c "from config_loader import generate_crontab; generate_crontab()"
@@ -9,12 +15,7 @@ python3 -c "from config_loader import generate_crontab; generate_crontab()"
 # Run all scrapers once on startup if RUN_ON_START is set
 if [ "${RUN_ON_START:-true}" = "true" ]; then
     echo "Running initial scrape for all configs..."
-    for config in /app/configs/*.yaml; do
-        if [ -f "$config" ]; then
-            echo "Running scraper for: $config"
-            python3 scraper.py "$config" >> /proc/1/fd/1 2>&1
-        fi
-    done
+    python3 scraper.py --all /app/configs >> /proc/1/fd/1 2>&1
 fi
 
 # Start cron daemon
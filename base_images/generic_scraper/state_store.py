@@ -0,0 +1,73 @@
+"""
+Small persistent JSON stores for scraper state.
+Files live in STATE_DIR and are shared between cron runs, daemon threads
+and containers on the same output volume.
+"""
+import os
+import json
+import fcntl
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator
+
+from config_loader import STATE_DIR
+
+
+_locks: Dict[str, threading.Lock] = {}
+_locks_guard = threading.Lock()
+
+
+def _thread_lock(path: str) -> threading.Lock:
+    with _locks_guard:
+        return _locks.setdefault(path, threading.Lock())
+
+
+def atomic_write(path: str, data: bytes):
+    """Write data to path via a temp file in the same directory and os.replace."""
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-', suffix=os.path.basename(path))
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+class JsonStore:
+    """A JSON object on disk, updated under a thread and file lock."""
+
+    def __init__(self, name: str, state_dir: str = STATE_DIR):
+        self.path = os.path.join(state_dir, name)
+
+    def load(self) -> Dict[str, Any]:
+        """Read the current content without locking (may be slightly stale)."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    @contextmanager
+    def transaction(self) -> Iterator[Dict[str, Any]]:
+        """Yield the stored dict; changes are written back when the block exits."""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with _thread_lock(self.path):
+            with open(self.path + '.lock', 'a') as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    data = self.load()
+                    yield data
+                    # No sort_keys: stored entries (item history, feed items) must keep their key order
+                    atomic_write(
+                        self.path,
+                        json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+                    )
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
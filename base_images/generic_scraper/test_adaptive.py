@@ -0,0 +1,104 @@
+"""Tests for adaptive polling intervals."""
+import types
+
+import pytest
+
+import adaptive
+from adaptive import AdaptivePolicy, ChangeTracker, content_hash, validate_adaptive
+from state_store import JsonStore
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Frozen time for the tracker; advance with clock.now += seconds."""
+    fake = types.SimpleNamespace(now=1_000_000.0)
+    fake.time = lambda: fake.now
+    monkeypatch.setattr(adaptive, 'time', fake)
+    return fake
+
+
+@pytest.fixture
+def tracker(tmp_path, clock):
+    return ChangeTracker(JsonStore('schedule-state.json', str(tmp_path)))
+
+
+def config(crawler_id, **block):
+    return {'id': crawler_id, 'schedule': '*/15 * * * *',
+            'adaptive': dict({'max_interval': 7200, 'backoff': 2}, **block)}
+
+
+def entries(title):
+    return [{'id': 1, 'title': title, 'published_at': '2026-03-02T10:00'}]
+
+
+def test_content_hash_ignores_published_at():
+    assert content_hash(entries('a')) == content_hash([dict(entries('a')[0], published_at='2026-03-03T08:00')])
+    assert content_hash(entries('a')) != content_hash(entries('b'))
+
+
+def test_policy_defaults_to_cron_interval():
+    policy = AdaptivePolicy.from_config(config('x'))
+
+    assert (policy.min_interval, policy.max_interval, policy.backoff) == (900, 7200, 2.0)
+    assert policy.clamp(100) == 900 and policy.clamp(10 ** 6) == 7200
+    assert AdaptivePolicy.from_config({'id': 'x', 'schedule': '* * * * *'}) is None
+    assert AdaptivePolicy.from_config(config('x', enabled=False)) is None
+
+
+def test_interval_backs_off_while_unchanged(tracker, crawler_id):
+    cfg = config(crawler_id)
+
+    assert tracker.record(cfg, entries('a')) == (900, False)
+    intervals = [tracker.record(cfg, entries('a'))[0] for _ in range(4)]
+
+    assert intervals == [1800, 3600, 7200, 7200]
+
+
+def test_change_shrinks_interval(tracker, crawler_id):
+    cfg = config(crawler_id)
+    tracker.record(cfg, entries('a'))
+    tracker.record(cfg, entries('a'))
+    tracker.record(cfg, entries('a'))
+
+    assert tracker.record(cfg, entries('b')) == (1800, True)
+    assert tracker.record(cfg, entries('c')) == (900, True)
+    state = tracker.get(crawler_id)
+    assert (state['runs'], state['changes']) == (5, 2)
+
+
+def test_not_modified_counts_as_unchanged(tracker, crawler_id):
+    cfg = config(crawler_id)
+    tracker.record(cfg, entries('a'))
+
+    assert tracker.record(cfg, None) == (1800, False)
+    assert tracker.get(crawler_id)['content_hash'] == content_hash(entries('a'))
+
+
+def test_due_waits_for_interval(tracker, clock, crawler_id):
+    cfg = config(crawler_id)
+    assert tracker.due(cfg)
+
+    tracker.record(cfg, entries('a'))
+    tracker.record(cfg, entries('a'))
+    assert not tracker.due(cfg, clock.now + 1000)
+    # Runs up to DUE_SLACK early still count as due
+    assert tracker.due(cfg, clock.now + 1800 - adaptive.DUE_SLACK)
+
+
+def test_configs_without_adaptive_block_are_always_due(tracker, crawler_id):
+    cfg = {'id': crawler_id, 'schedule': '*/15 * * * *'}
+
+    assert tracker.record(cfg, entries('a')) == (900, False)
+    assert tracker.record(cfg, entries('a')) == (900, False)
+    assert tracker.due(cfg)
+
+
+def test_validate_adaptive():
+    validate_adaptive({}, 'x.yaml')
+    validate_adaptive({'adaptive': {'min_interval': 600, 'max_interval': 3600}}, 'x.yaml')
+    with pytest.raises(ValueError, match='mapping'):
+        validate_adaptive({'adaptive': True}, 'x.yaml')
+    with pytest.raises(ValueError, match='backoff'):
+        validate_adaptive({'adaptive': {'backoff': 1}}, 'x.yaml')
+    with pytest.raises(ValueError, match='max_interval'):
+        validate_adaptive({'adaptive': {'min_interval': 3600, 'max_interval': 600}}, 'x.yaml')
@@ -0,0 +1,108 @@
+"""Tests for concurrent batch runs and the per-host request limit."""
+import threading
+import time
+
+from batch import HostLimiter, print_summary, run_all
+
+
+CONFIG = """id: {id}
+url: {url}
+selectors:
+  container: li
+  title:
+    selector: h2
+output:
+  all:
+    enabled: true
+    filename: {id}-alle.json
+"""
+
+
+def write_configs(directory, **urls):
+    for crawler_id, url in urls.items():
+        (directory / f'{crawler_id}.yaml').write_text(CONFIG.format(id=crawler_id, url=url), encoding='utf-8')
+
+
+class Gauge:
+    """Counts how many threads are inside at once."""
+
+    def __init__(self):
+        self.current = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        with self._lock:
+            self.current += 1
+            self.peak = max(self.peak, self.current)
+
+    def __exit__(self, *exc):
+        with self._lock:
+            self.current -= 1
+
+
+def test_host_limiter_caps_requests_per_host():
+    limiter = HostLimiter(per_host=2)
+    gauges = {'example.org': Gauge(), 'example.com': Gauge()}
+
+    def request(url, host):
+        with limiter.limit(url), gauges[host]:
+            time.sleep(0.02)
+
+    threads = [threading.Thread(target=request, args=(f'https://{host}/{index}', host))
+               for index in range(6) for host in gauges]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    assert gauges['example.org'].peak == 2
+    assert gauges['example.com'].peak == 2
+
+
+def test_hosts_are_matched_without_case_and_port():
+    limiter = HostLimiter(per_host=1)
+
+    assert limiter._semaphore('example.org') is limiter._semaphore('example.org')
+    with limiter.limit('https://Example.org:8443/a'):
+        assert not limiter._semaphore('example.org').acquire(blocking=False)
+
+
+def test_run_all_runs_configs_concurrently(tmp_path):
+    write_configs(tmp_path, **{f'{index:03d}_test': f'https://host{index}.example.org/' for index in range(4)})
+    gauge = Gauge()
+    loaded = []
+
+    def run(path, config):
+        with gauge:
+            time.sleep(0.05)
+        return True
+
+    results = run_all(str(tmp_path), run, workers=4, before_run=loaded.extend)
+
+    assert sorted(config['id'] for config in loaded) == ['000_test', '001_test', '002_test', '003_test']
+    assert all(config['_path'].endswith(f"{config['id']}.yaml") for config in loaded)
+    assert [result['success'] for result in results] == [True] * 4
+    assert gauge.peak > 1
+
+
+def test_failures_are_reported_per_config(tmp_path, capsys):
+    write_configs(tmp_path, ok='https://example.org/', raises='https://example.org/b',
+                  fails='https://example.com/')
+    (tmp_path / 'broken.yaml').write_text('id: broken\n', encoding='utf-8')
+
+    def run(path, config):
+        if config['id'] == 'raises':
+            raise RuntimeError('boom')
+        return config['id'] == 'ok'
+
+    results = {result['id']: result for result in run_all(str(tmp_path), run, workers=2)}
+
+    assert {crawler_id: result['success'] for crawler_id, result in results.items()} == \
+        {'broken': False, 'fails': False, 'ok': True, 'raises': False}
+    assert results['fails']['host'] == 'example.com'
+
+    print_summary(list(results.values()), 1.0)
+    out = capsys.readouterr().out
+    assert 'Unhandled error in raises: boom' in out
+    assert '4 configs, 3 failed' in out
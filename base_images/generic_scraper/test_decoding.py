@@ -0,0 +1,89 @@
+"""Tests for bytes-first encoding detection."""
+import codecs
+
+import pytest
+import requests
+
+from decoding import EncodingCache, declared_charset, detect_encoding, header_charset, normalize_encoding
+from state_store import JsonStore
+
+
+def response(content, content_type='text/html', url='https://example.org/page'):
+    result = requests.Response()
+    result._content = content
+    result.url = url
+    if content_type:
+        result.headers['Content-Type'] = content_type
+    return result
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return EncodingCache(JsonStore('encodings.json', str(tmp_path)))
+
+
+@pytest.mark.parametrize('name, codec', [
+    ('UTF-8', 'utf-8'),
+    ('"utf8"', 'utf-8'),
+    ('ISO-8859-1', 'cp1252'),
+    ('us-ascii', 'cp1252'),
+    ('iso-8859-15', 'iso8859-15'),
+    ('no-such-charset', None),
+    ('', None),
+])
+def test_normalize_encoding(name, codec):
+    assert normalize_encoding(name) == codec
+
+
+def test_header_charset():
+    assert header_charset('text/html; charset=ISO-8859-1') == 'cp1252'
+    assert header_charset('text/html;Charset="utf-8"') == 'utf-8'
+    assert header_charset('text/html') is None
+
+
+def test_declared_charset():
+    assert declared_charset(b'<html><head><meta charset="windows-1252">') == 'cp1252'
+    assert declared_charset(
+        b'<meta http-equiv="Content-Type" content="text/html; charset=utf-8">') == 'utf-8'
+    assert declared_charset(b"<?xml version='1.0' encoding='ISO-8859-15'?><rss/>") == 'iso8859-15'
+    assert declared_charset(codecs.BOM_UTF16_LE + 'x'.encode('utf-16-le')) == 'utf-16'
+    # Declarations after the sniffed prefix are ignored
+    assert declared_charset(b' ' * 5000 + b'<meta charset="utf-8">') is None
+
+
+def test_bom_wins_over_header(cache):
+    page = response(codecs.BOM_UTF8 + b'<p>x</p>', 'text/html; charset=iso-8859-1')
+    assert detect_encoding(page, cache) == ('utf-8-sig', 'bom')
+
+
+def test_header_wins_over_declaration(cache):
+    page = response(b'<meta charset="utf-8">', 'text/html; charset=iso-8859-1')
+    assert detect_encoding(page, cache) == ('cp1252', 'header')
+
+
+def test_declaration_without_header(cache):
+    page = response(b'<meta charset="iso-8859-1"><p>Gro\xdfe Stra\xdfe</p>', 'text/html')
+    assert detect_encoding(page, cache) == ('cp1252', 'declared')
+
+
+def test_json_and_xml_default_to_utf8(cache):
+    assert detect_encoding(response(b'{"a": 1}', 'application/json'), cache) == ('utf-8', 'default')
+    assert detect_encoding(response(b'<rss/>', 'application/rss+xml'), cache) == ('utf-8', 'default')
+    assert cache.store.load() == {}
+
+
+def test_guess_is_cached_per_host(cache):
+    first = detect_encoding(response('<p>Straße</p>'.encode('cp1252'), 'text/html'), cache)
+    # The next page of the host is valid UTF-8 but the cached guess is used
+    second = detect_encoding(response('<p>Straße</p>'.encode('utf-8'), 'text/html'), cache)
+    other = detect_encoding(response('<p>Straße</p>'.encode('utf-8'), 'text/html',
+                                     'https://other.example.org/'), cache)
+
+    assert first == ('cp1252', 'guessed')
+    assert second == ('cp1252', 'cached')
+    assert other == ('utf-8', 'guessed')
+    assert EncodingCache(cache.store).get('example.org') == 'cp1252'
+
+
+def test_without_cache():
+    assert detect_encoding(response(b'<p>plain</p>', None), None) == ('utf-8', 'guessed')
@@ -0,0 +1,124 @@
+"""Tests for detail-page enrichment and its per-URL cache."""
+import time
+
+import requests
+
+from detail import DetailCache, enrich_entries
+from extraction import compile_detail
+
+DETAIL_PAGE = b'<html><body><div class="lead">Lead text</div><figure><img src="/a.jpg"></figure></body></html>'
+
+
+def page(body: bytes = DETAIL_PAGE, status: int = 200, **headers) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    response._content = body
+    response.url = 'https://example.org/'
+    response.headers['Content-Type'] = 'text/html; charset=utf-8'
+    response.headers.update({name.replace('_', '-'): value for name, value in headers.items()})
+    return response
+
+
+def config(crawler_id, **detail):
+    return {'id': crawler_id, 'type': 'simple', 'detail': dict({
+        'fields': {
+            'description': {'selector': 'div.lead'},
+            'image_url': {'selector': 'figure img', 'attribute': 'src', 'prefix': 'https://example.org'},
+        },
+    }, **detail)}
+
+
+class Fetcher:
+    """Stand-in for fetch_response() that serves canned responses and logs requests."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def __call__(self, url, headers):
+        self.requests.append((url, headers))
+        return self.responses.pop(0)
+
+
+def test_fields_come_from_the_detail_page(crawler_id, capsys):
+    cfg = config(crawler_id)
+    entries = [{'title': 'A', 'description': 'teaser', 'call_to_action_url': 'https://example.org/a'}]
+    enrich_entries(entries, cfg, compile_detail(cfg), Fetcher(page()))
+
+    assert entries[0]['description'] == 'Lead text'
+    assert entries[0]['image_url'] == 'https://example.org/a.jpg'
+    assert '1 fetched' in capsys.readouterr().out
+
+
+def test_cached_pages_are_not_fetched_again_within_ttl(crawler_id):
+    cfg = config(crawler_id, ttl=3600)
+    plan = compile_detail(cfg)
+    entries = [{'call_to_action_url': 'https://example.org/a'}]
+    enrich_entries(entries, cfg, plan, Fetcher(page()))
+
+    fetcher = Fetcher()
+    entries = [{'call_to_action_url': 'https://example.org/a'}]
+    enrich_entries(entries, cfg, plan, fetcher)
+    assert fetcher.requests == []
+    assert entries[0]['description'] == 'Lead text'
+
+
+def test_expired_pages_are_revalidated(crawler_id):
+    cfg = config(crawler_id, ttl=0)
+    plan = compile_detail(cfg)
+    enrich_entries([{'call_to_action_url': 'https://example.org/a'}], cfg, plan, Fetcher(page(ETag='"v1"')))
+
+    fetcher = Fetcher(page(b'', status=304))
+    entries = [{'call_to_action_url': 'https://example.org/a'}]
+    enrich_entries(entries, cfg, plan, fetcher)
+    assert fetcher.requests == [('https://example.org/a', {'If-None-Match': '"v1"'})]
+    assert entries[0]['description'] == 'Lead text'
+
+
+def test_failed_fetch_keeps_the_last_known_values(crawler_id):
+    cfg = config(crawler_id, ttl=0)
+    plan = compile_detail(cfg)
+    enrich_entries([{'call_to_action_url': 'https://example.org/a'}], cfg, plan, Fetcher(page()))
+
+    def failing(url, headers):
+        raise requests.ConnectionError('down')
+
+    entries = [{'call_to_action_url': 'https://example.org/a', 'description': 'teaser'}]
+    enrich_entries(entries, cfg, plan, failing)
+    assert entries[0]['description'] == 'Lead text'
+
+
+def test_items_that_left_the_listing_are_dropped_from_the_cache(crawler_id):
+    cfg = config(crawler_id)
+    plan = compile_detail(cfg)
+    enrich_entries([{'call_to_action_url': 'https://example.org/a'}, {'call_to_action_url': 'https://example.org/b'}],
+                   cfg, plan, Fetcher(page(), page()))
+    enrich_entries([{'call_to_action_url': 'https://example.org/b'}], cfg, plan, Fetcher())
+
+    assert set(DetailCache(crawler_id).entries) == {'https://example.org/b'}
+
+
+def test_changed_detail_config_invalidates_the_cache(crawler_id):
+    cache = DetailCache(crawler_id)
+    cache.save({'https://example.org/a': {'values': {}, 'fingerprint': 'old', 'fetched_at': time.time()}})
+
+    assert DetailCache(crawler_id).get('https://example.org/a', 'old') is not None
+    assert DetailCache(crawler_id).get('https://example.org/a', 'new') is None
+
+
+def test_json_listings_parse_detail_pages_as_html(crawler_id):
+    cfg = dict(config(crawler_id), type='json', parser='json')
+    plan = compile_detail(cfg)
+    assert plan.parser == 'html.parser'
+
+    entries = [{'call_to_action_url': 'https://example.org/a'}]
+    enrich_entries(entries, cfg, plan, Fetcher(page()))
+    assert entries[0]['description'] == 'Lead text'
+
+
+def test_detail_parser_can_be_json(crawler_id):
+    cfg = {'id': crawler_id, 'type': 'simple', 'detail': {'parser': 'json', 'fields': {'description': {'selector': '$.lead'}}}}
+    entries = [{'call_to_action_url': 'https://example.org/a.json'}]
+    enrich_entries(entries, cfg, compile_detail(cfg), Fetcher(page(b'{"lead": "From JSON"}')))
+
+    assert entries[0]['description'] == 'From JSON'
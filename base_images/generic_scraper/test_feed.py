@@ -0,0 +1,121 @@
+"""Tests for RSS/Atom parsing and the incremental read of `type: feed` configs."""
+import pytest
+import requests
+
+from feed import feed_date, plain_text, read_items, scrape_feed, validate_feed
+
+
+def rss(*guids):
+    items = ''.join(
+        f"<item><title>News {guid}</title><link>/news/{guid}</link><guid>{guid}</guid>"
+        f"<description>&lt;p&gt;Text &lt;img src=&quot;/img/{guid}.jpg&quot;&gt; {guid}&lt;/p&gt;</description>"
+        f"<pubDate>Mon, 02 Mar 2026 10:00:00 GMT</pubDate></item>"
+        for guid in guids
+    )
+    return f"<?xml version='1.0'?><rss version='2.0'><channel><title>Goslar</title>{items}</channel></rss>".encode()
+
+
+ATOM_FEED = b"""<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <title>Goslar</title>
+  <entry>
+    <title>Atom news</title>
+    <id>urn:uuid:1</id>
+    <link rel="enclosure" type="image/png" href="/img/atom.png"/>
+    <link rel="alternate" href="https://example.org/atom/1"/>
+    <summary>Short &amp; sweet</summary>
+    <updated>2026-03-02T10:00:00Z</updated>
+  </entry>
+</feed>"""
+
+
+def keys(items):
+    return [key for key, _ in items]
+
+
+def test_read_rss_items():
+    items, parsed, stopped = read_items(rss('a', 'b'), 'https://example.org/', set(), 50)
+
+    assert (keys(items), parsed, stopped) == (['a', 'b'], 2, False)
+    entry = items[0][1]
+    assert entry['title'] == 'News a'
+    assert entry['description'] == 'Text a'
+    assert entry['image_url'] == 'https://example.org/img/a.jpg'
+    assert entry['call_to_action_url'] == 'https://example.org/news/a'
+    assert entry['published_at'] == feed_date('2026-03-02T10:00:00+00:00')
+
+
+def test_read_atom_entry():
+    items, parsed, _ = read_items(ATOM_FEED, 'https://example.org/', set(), 50)
+
+    assert parsed == 1
+    key, entry = items[0]
+    assert key == 'urn:uuid:1'
+    assert entry['call_to_action_url'] == 'https://example.org/atom/1'
+    assert entry['image_url'] == 'https://example.org/img/atom.png'
+    assert entry['description'] == 'Short & sweet'
+
+
+def test_stop_at_first_known_item():
+    items, parsed, stopped = read_items(rss('d', 'c', 'b', 'a'), '', {'b', 'a'}, 50)
+
+    assert keys(items) == ['d', 'c']
+    # Items after the first known one are not parsed at all
+    assert parsed == 3
+    assert stopped
+
+
+def test_without_stop_at_known_skips_known_items():
+    items, parsed, stopped = read_items(rss('d', 'b', 'c', 'a'), '', {'b', 'a'}, 50, stop_at_known=False)
+
+    assert keys(items) == ['d', 'c']
+    assert parsed == 4
+    assert not stopped
+
+
+def test_limit_and_duplicates():
+    items, parsed, stopped = read_items(rss('a', 'a', 'b', 'c'), '', set(), 2)
+
+    assert keys(items) == ['a', 'b']
+    assert parsed == 3
+    assert stopped
+
+
+def test_feed_date_formats():
+    assert feed_date('') is None
+    assert feed_date('not a date') is None
+    assert feed_date('2026-03-02T10:15:00') == '2026-03-02T10:15'
+    assert feed_date('Mon, 02 Mar 2026 10:00:00 GMT') == feed_date('2026-03-02T10:00:00Z')
+
+
+def test_plain_text():
+    assert plain_text('<p>Fa&szlig;nacht\n  <b>in</b> Goslar</p>') == 'Faßnacht in Goslar'
+
+
+def test_scrape_feed_merges_new_items_before_known(crawler_id):
+    config = {'id': crawler_id, 'type': 'feed', 'base_url': 'https://example.org/', 'feed': {'max_items': 3}}
+
+    def response(content):
+        result = requests.Response()
+        result._content = content
+        result.url = 'https://example.org/feed.xml'
+        return result
+
+    first = scrape_feed(response(rss('b', 'a')), config)
+    second = scrape_feed(response(rss('d', 'c', 'b', 'a')), config)
+
+    assert [entry['title'] for entry in first] == ['News b', 'News a']
+    assert [entry['title'] for entry in second] == ['News d', 'News c', 'News b']
+    assert [entry['id'] for entry in second] == [1, 2, 3]
+
+    with pytest.raises(ValueError, match='Invalid feed'):
+        scrape_feed(response(b'<rss><channel>'), config)
+
+
+def test_validate_feed():
+    validate_feed({'type': 'simple', 'pagination': {}}, 'x.yaml')
+    validate_feed({'type': 'feed', 'feed': {'max_items': 5}}, 'x.yaml')
+    with pytest.raises(ValueError, match='pagination'):
+        validate_feed({'type': 'feed', 'pagination': {'max_pages': 2}}, 'x.yaml')
+    with pytest.raises(ValueError, match='max_items'):
+        validate_feed({'type': 'feed', 'feed': {'max_items': 0}}, 'x.yaml')
@@ -0,0 +1,175 @@
+"""Tests for recording HTTP traffic into an archive and replaying it offline."""
+import sqlite3
+import subprocess
+import threading
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+from requests.adapters import HTTPAdapter
+
+import http_archive
+from http_archive import HttpArchive, _curl_url
+
+
+class Handler(BaseHTTPRequestHandler):
+    hits = 0
+
+    def do_GET(self):
+        if self.path == '/fehlt':
+            self.reply(404, b'nicht gefunden')
+            return
+        Handler.hits += 1
+        body = f'Abruf {Handler.hits}: Altstadtfest in Goslar'.encode('utf-8')
+        self.reply(200, body, content_type='text/plain; charset=utf-8')
+
+    def do_POST(self):
+        length = int(self.headers['Content-Length'])
+        self.reply(200, b'echo ' + self.rfile.read(length))
+
+    def reply(self, status, body, content_type='text/plain'):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    """Local HTTP server; stop it with server.shutdown() to prove replay stays offline."""
+    Handler.hits = 0
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    httpd.url = f'http://127.0.0.1:{httpd.server_address[1]}'
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def use_archive(monkeypatch):
+    """Install an archive; originals are put back before each install and after the test."""
+    originals = {
+        (HTTPAdapter, 'send'): HTTPAdapter.send,
+        (urllib.request.OpenerDirector, 'open'): urllib.request.OpenerDirector.open,
+        (subprocess, 'run'): subprocess.run,
+    }
+    for (owner, name), value in originals.items():
+        monkeypatch.setattr(owner, name, value)
+    monkeypatch.setattr(http_archive, '_installed', None)
+
+    def use(path, mode):
+        for (owner, name), value in originals.items():
+            setattr(owner, name, value)
+        http_archive._installed = None
+        monkeypatch.setattr(http_archive, 'HTTP_ARCHIVE', str(path))
+        return http_archive.install(str(path), mode)
+
+    return use
+
+
+def test_requests_round_trip(tmp_path, server, use_archive):
+    archive = tmp_path / 'test.sqlite'
+    use_archive(archive, 'record')
+    recorded = requests.get(server.url + '/termine', headers={'Authorization': 'Bearer geheim'}, timeout=5)
+    server.shutdown()
+
+    use_archive(archive, 'replay')
+    replayed = requests.get(server.url + '/termine', timeout=5)
+
+    assert (replayed.status_code, replayed.content) == (200, recorded.content)
+    assert replayed.text == 'Abruf 1: Altstadtfest in Goslar'
+    assert replayed.headers['Content-Type'] == 'text/plain; charset=utf-8'
+    # Request headers (API keys) are never stored
+    with sqlite3.connect(archive) as db:
+        assert b'geheim' not in b''.join(str(row).encode('utf-8') for row in db.execute('SELECT * FROM exchanges'))
+
+
+def test_urllib_round_trip_with_errors(tmp_path, server, use_archive):
+    archive = tmp_path / 'test.sqlite'
+    use_archive(archive, 'record')
+    with urllib.request.urlopen(server.url + '/termine', timeout=5) as response:
+        recorded = response.read()
+    with pytest.raises(urllib.error.HTTPError):
+        urllib.request.urlopen(server.url + '/fehlt', timeout=5)
+    server.shutdown()
+
+    use_archive(archive, 'replay')
+    with urllib.request.urlopen(server.url + '/termine', timeout=5) as response:
+        assert (response.status, response.read()) == (200, recorded)
+    with pytest.raises(urllib.error.HTTPError) as error:
+        urllib.request.urlopen(server.url + '/fehlt', timeout=5)
+    assert (error.value.code, error.value.read()) == (404, b'nicht gefunden')
+
+
+def test_repeated_requests_replay_in_order(tmp_path, server, use_archive):
+    archive = tmp_path / 'test.sqlite'
+    use_archive(archive, 'record')
+    for _ in range(2):
+        requests.get(server.url + '/termine', timeout=5)
+    server.shutdown()
+
+    use_archive(archive, 'replay')
+    texts = [requests.get(server.url + '/termine', timeout=5).text for _ in range(3)]
+
+    # Once exhausted, the last recording is served again
+    assert [text.split(':')[0] for text in texts] == ['Abruf 1', 'Abruf 2', 'Abruf 2']
+
+
+def test_request_bodies_are_part_of_the_key(tmp_path, server, use_archive):
+    archive = tmp_path / 'test.sqlite'
+    use_archive(archive, 'record')
+    requests.post(server.url + '/suche', data=b'goslar', timeout=5)
+    requests.post(server.url + '/suche', data=b'oker', timeout=5)
+    server.shutdown()
+
+    use_archive(archive, 'replay')
+    assert requests.post(server.url + '/suche', data=b'oker', timeout=5).content == b'echo oker'
+    assert requests.post(server.url + '/suche', data=b'goslar', timeout=5).content == b'echo goslar'
+
+
+def test_missing_requests_fail_like_network_errors(tmp_path, use_archive):
+    archive = tmp_path / 'test.sqlite'
+    HttpArchive(str(archive), 'record')
+    use_archive(archive, 'replay')
+
+    with pytest.raises(requests.ConnectionError, match='Not in HTTP archive'):
+        requests.get('http://127.0.0.1:9/nirgends', timeout=5)
+    with pytest.raises(urllib.error.URLError, match='Not in HTTP archive'):
+        urllib.request.urlopen('http://127.0.0.1:9/nirgends', timeout=5)
+    completed = subprocess.run(['curl', '-s', 'http://127.0.0.1:9/nirgends'], capture_output=True)
+    assert completed.returncode == 7
+
+
+def test_replay_needs_an_existing_archive(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        HttpArchive(str(tmp_path / 'missing.sqlite'), 'replay')
+    with pytest.raises(ValueError, match='record'):
+        HttpArchive(str(tmp_path / 'test.sqlite'), 'live')
+
+
+def test_recording_replaces_the_previous_one(tmp_path):
+    path = str(tmp_path / 'test.sqlite')
+    first = HttpArchive(path, 'record')
+    first.record('requests', 'GET', 'https://example.org/', None, 200, 'OK', [], b'alt', 0.1)
+
+    HttpArchive(path, 'record')
+
+    assert HttpArchive(path, 'replay').exchanges() == []
+
+
+@pytest.mark.parametrize('command, expected', [
+    (['curl', '-s', 'https://example.org/api'], ('GET', 'https://example.org/api')),
+    (['curl', '-X', 'POST', '-H', 'Accept: text/html', 'https://example.org/form', '-o', 'out.html'],
+     ('POST', 'https://example.org/form')),
+    (['curl', '--max-time', '30', '-A', 'gs-crawler', 'https://example.org/'], ('GET', 'https://example.org/')),
+])
+def test_curl_url(command, expected):
+    assert _curl_url(command) == expected
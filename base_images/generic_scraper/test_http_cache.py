@@ -0,0 +1,89 @@
+"""Tests for the persistent HTTP validators and conditional-fetch counters."""
+import requests
+import pytest
+
+from http_cache import FetchMetrics, ValidatorStore
+from state_store import JsonStore
+
+URL = 'https://example.org/news'
+
+
+def response(body: bytes = b'<html></html>', **headers) -> requests.Response:
+    result = requests.Response()
+    result.status_code = 200
+    result._content = body
+    result.headers.update({name.replace('_', '-'): value for name, value in headers.items()})
+    return result
+
+
+@pytest.fixture
+def validators(tmp_path):
+    return ValidatorStore(JsonStore('validators.json', str(tmp_path)))
+
+
+def test_no_headers_without_stored_validators(validators):
+    assert validators.conditional_headers('002_gz', URL) == {}
+
+
+def test_stored_validators_become_conditional_headers(validators):
+    validators.update('002_gz', URL, response(b'12345', ETag='"abc"', Last_Modified='Sun, 18 Oct 2026 08:00:00 GMT'))
+
+    assert validators.conditional_headers('002_gz', URL) == {
+        'If-None-Match': '"abc"',
+        'If-Modified-Since': 'Sun, 18 Oct 2026 08:00:00 GMT',
+    }
+    assert validators.content_length('002_gz', URL) == 5
+
+
+def test_validators_are_kept_per_crawler(validators):
+    validators.update('002_gz', URL, response(ETag='"gz"'))
+    validators.update('003_other', URL, response(ETag='"other"'))
+
+    assert validators.conditional_headers('002_gz', URL) == {'If-None-Match': '"gz"'}
+    assert validators.conditional_headers('003_other', URL) == {'If-None-Match': '"other"'}
+    assert validators.conditional_headers('004_new', URL) == {}
+
+
+def test_changed_fingerprint_forces_a_full_fetch(validators):
+    validators.update('002_gz', URL, response(ETag='"abc"'), fingerprint='v1')
+
+    assert validators.conditional_headers('002_gz', URL, 'v1') == {'If-None-Match': '"abc"'}
+    assert validators.conditional_headers('002_gz', URL, 'v2') == {}
+
+
+def test_response_without_validators_drops_the_entry(validators):
+    validators.update('002_gz', URL, response(ETag='"abc"'))
+    validators.update('002_gz', URL, response())
+
+    assert validators.conditional_headers('002_gz', URL) == {}
+    assert validators.content_length('002_gz', URL) == 0
+
+
+def test_invalidate(validators):
+    validators.update('002_gz', URL, response(ETag='"abc"'))
+    validators.update('003_other', URL, response(ETag='"other"'))
+    validators.invalidate('002_gz', URL)
+
+    assert validators.conditional_headers('002_gz', URL) == {}
+    assert validators.conditional_headers('003_other', URL) == {'If-None-Match': '"other"'}
+
+
+def test_validators_survive_a_new_store_instance(tmp_path):
+    ValidatorStore(JsonStore('validators.json', str(tmp_path))).update('002_gz', URL, response(ETag='"abc"'))
+
+    assert ValidatorStore(JsonStore('validators.json', str(tmp_path))).conditional_headers('002_gz', URL) == {
+        'If-None-Match': '"abc"'
+    }
+
+
+def test_fetch_metrics_count_hits_and_saved_bytes(tmp_path, capsys):
+    store = JsonStore('fetch-metrics.json', str(tmp_path))
+    metrics = FetchMetrics(store)
+    metrics.record('002_gz', not_modified=False, bytes_downloaded=1000)
+    metrics.record('002_gz', not_modified=True, bytes_saved=1000)
+
+    entry = store.load()['002_gz']
+    assert (entry['hits'], entry['misses']) == (1, 1)
+    assert (entry['bytes_downloaded'], entry['bytes_saved']) == (1000, 1000)
+    assert entry['last_result'] == 'not_modified'
+    assert '1/2 hits' in capsys.readouterr().out
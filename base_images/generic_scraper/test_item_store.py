@@ -0,0 +1,73 @@
+"""Tests for stable item ids and retained history."""
+import json
+import time
+
+from item_store import ItemStore, canonical_url, item_key
+
+
+def entry(number: int, **extra):
+    return dict({'title': f'Item {number}', 'description': 'Text', 'image_url': '',
+                 'call_to_action_url': f'https://example.org/item/{number}'}, **extra)
+
+
+def test_canonical_url_ignores_tracking_fragments_and_case():
+    assert canonical_url('HTTPS://Example.org/a/?utm_source=x&b=2&a=1#top') == 'https://example.org/a?a=1&b=2'
+    assert canonical_url('https://example.org/') == 'https://example.org/'
+
+
+def test_item_key_falls_back_to_title_and_description():
+    assert item_key({'title': 'A', 'description': 'B'}, 'call_to_action_url') == \
+        item_key({'title': 'A', 'description': 'B', 'call_to_action_url': ''}, 'call_to_action_url')
+
+
+def test_ids_stay_stable_and_new_items_get_new_ids(crawler_id):
+    config = {'id': crawler_id, 'history': {}}
+    first = ItemStore(crawler_id).apply([entry(1), entry(2)], config)
+    second = ItemStore(crawler_id).apply([entry(3), entry(2)], config)
+
+    assert [item['id'] for item in first] == [1, 2]
+    # Page order first, then retained items
+    assert [(item['title'], item['id']) for item in second] == [('Item 3', 3), ('Item 2', 2), ('Item 1', 1)]
+
+
+def test_published_at_is_the_first_seen_time(crawler_id):
+    config = {'id': crawler_id, 'history': {}}
+    first = ItemStore(crawler_id).apply([entry(1)], config)
+    time.sleep(0.01)
+    second = ItemStore(crawler_id).apply([entry(1, description='Changed')], config)
+
+    assert second[0]['published_at'] == first[0]['published_at']
+    assert second[0]['description'] == 'Changed'
+
+
+def test_duplicates_on_the_page_are_dropped(crawler_id):
+    result = ItemStore(crawler_id).apply([entry(1), entry(1, title='Again')], {'id': crawler_id, 'history': {}})
+
+    assert [item['title'] for item in result] == ['Item 1']
+
+
+def test_items_expire_after_the_window(crawler_id):
+    config = {'id': crawler_id, 'history': {'window_days': 0.5 / 86400}}
+    ItemStore(crawler_id).apply([entry(1)], config)
+    time.sleep(0.6)
+    result = ItemStore(crawler_id).apply([entry(2)], config)
+
+    assert [item['title'] for item in result] == ['Item 2']
+
+
+def test_retained_items_are_capped_by_max_items(crawler_id):
+    config = {'id': crawler_id, 'history': {'max_items': 3}}
+    ItemStore(crawler_id).apply([entry(number) for number in range(1, 6)], config)
+    result = ItemStore(crawler_id).apply([entry(6)], config)
+
+    assert len(result) == 3
+    assert result[0]['title'] == 'Item 6'
+
+
+def test_retained_items_keep_their_key_order(crawler_id):
+    config = {'id': crawler_id, 'history': {}}
+    first = ItemStore(crawler_id).apply([entry(1)], config)
+    retained = ItemStore(crawler_id).apply([entry(2)], config)[1]
+
+    # Byte-identical output, so unchanged files are not rewritten
+    assert json.dumps(retained) == json.dumps(first[0])
@@ -0,0 +1,95 @@
+"""Tests for the JSONPath subset used by `type: json` configs."""
+import pytest
+
+from json_path import JsonPath
+
+
+PAYLOAD = {
+    'data': {
+        'events': [
+            {'title': 'Altstadtfest', 'public': True, 'seats': 200, 'image': {'url': '/a.jpg'}},
+            {'title': 'Ratssitzung', 'public': False, 'seats': 40},
+            {'title': 'Konzert', 'public': True, 'seats': 80, 'image': {'url': ''}},
+        ],
+        'full name': 'Stadt Goslar',
+        'meta': {'count': 3, 'image': {'url': '/logo.png'}},
+    },
+}
+
+
+def find(expression, node=PAYLOAD):
+    return JsonPath(expression).find(node)
+
+
+def titles(expression):
+    return [event['title'] for event in find(expression)]
+
+
+def test_members_and_optional_root():
+    assert find('$.data.meta.count') == [3]
+    assert find('data.meta.count') == [3]
+    assert find("$['data']['full name']") == ['Stadt Goslar']
+    assert find('$.data.missing.count') == []
+
+
+def test_wildcards():
+    assert titles('$.data.events[*]') == ['Altstadtfest', 'Ratssitzung', 'Konzert']
+    assert find('$.data.events.*.seats') == [200, 40, 80]
+    # A wildcard over an object yields its values in order
+    assert find('$.data.meta.*') == [3, {'url': '/logo.png'}]
+    assert find('$.data.meta.count.*') == []
+
+
+def test_indices_and_slices():
+    assert titles('$.data.events[0]') == ['Altstadtfest']
+    assert titles('$.data.events[-1]') == ['Konzert']
+    assert titles('$.data.events[0,2]') == ['Altstadtfest', 'Konzert']
+    assert titles('$.data.events[1:]') == ['Ratssitzung', 'Konzert']
+    assert titles('$.data.events[:-1]') == ['Altstadtfest', 'Ratssitzung']
+    assert find('$.data.events[7]') == []
+    assert find('$.data.meta[0]') == []
+
+
+def test_recursive_descent():
+    assert find('$..image.url') == ['/a.jpg', '', '/logo.png']
+    assert find('$..[?(@.seats > 100)].title') == ['Altstadtfest']
+
+
+def test_filter_comparisons():
+    assert titles('$.data.events[?(@.public == true)]') == ['Altstadtfest', 'Konzert']
+    assert titles('$.data.events[?(@.public != true)]') == ['Ratssitzung']
+    assert titles('$.data.events[?(@.seats >= 80)]') == ['Altstadtfest', 'Konzert']
+    assert titles("$.data.events[?(@.title == 'Konzert')]") == ['Konzert']
+    assert titles('$.data.events[?(@.title == "Konzert")]') == ['Konzert']
+
+
+def test_filter_on_existence_skips_empty_values():
+    assert titles('$.data.events[?(@.image)]') == ['Altstadtfest', 'Konzert']
+    assert titles('$.data.events[?(@.image.url)]') == ['Altstadtfest']
+
+
+def test_filter_ignores_incomparable_values():
+    assert titles("$.data.events[?(@.title > 5)]") == []
+
+
+def test_first():
+    assert JsonPath('$.data.events[*].title').first(PAYLOAD) == 'Altstadtfest'
+    assert JsonPath('$.nothing').first(PAYLOAD) is None
+
+
+def test_relative_to_container():
+    event = find('$.data.events[0]')[0]
+    assert JsonPath('@.image.url').first(event) == '/a.jpg'
+    assert JsonPath('image.url').first(event) == '/a.jpg'
+
+
+@pytest.mark.parametrize('expression', [
+    '$.data[',
+    '$.data[?(@.a ~ 1)]',
+    '$.data[?(@.a == nope)]',
+    '$.data[a]',
+    '$.data.#',
+])
+def test_invalid_expressions(expression):
+    with pytest.raises(ValueError, match='Invalid JSONPath'):
+        JsonPath(expression)
@@ -0,0 +1,117 @@
+"""Tests for write-if-changed outputs and unchanged re-runs."""
+import json
+import os
+from datetime import datetime
+
+import pytest
+
+import output_writer
+import scraper
+from output_writer import serialize_json, write_if_changed
+from parsers import get_engine
+
+
+PAGE = """<ul>
+  <li><h2>Altstadtfest</h2><p>Am Marktplatz</p><a href="/fest">mehr</a></li>
+  <li><h2>Konzert</h2><p>In der Kaiserpfalz</p><a href="/konzert">mehr</a></li>
+  <li><h2>Flohmarkt</h2><p>Am Osterfeld</p><a href="/flohmarkt">mehr</a></li>
+</ul>"""
+
+
+@pytest.fixture
+def output_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(scraper, 'OUTPUT_DIR', str(tmp_path))
+    monkeypatch.setattr(output_writer, 'OUTPUT_DIR', str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Frozen datetime.now() of the scraper; set clock.now_value to move it."""
+    class Clock(datetime):
+        now_value = datetime(2026, 10, 18, 9, 0)
+
+        @classmethod
+        def now(cls, tz=None):
+            return cls.now_value
+
+    monkeypatch.setattr(scraper, 'datetime', Clock)
+    return Clock
+
+
+def config(crawler_id, strategy='random'):
+    return {
+        'id': crawler_id, 'url': 'https://example.org/', 'parser': 'html.parser',
+        'selectors': {
+            'container': 'li',
+            'title': {'selector': 'h2'},
+            'description': {'selector': 'p'},
+            'call_to_action_url': {'selector': 'a', 'attribute': 'href', 'prefix': 'https://example.org'},
+        },
+        'selection': {'strategy': strategy},
+        'output': {'single': {'enabled': True, 'filename': f'{crawler_id}.json'},
+                   'all': {'enabled': True, 'filename': f'{crawler_id}-alle.json'}},
+    }
+
+
+def run(cfg, page=PAGE):
+    """The extraction and output steps of run_scraper() on a fixed page."""
+    engine = get_engine(cfg['parser'])
+    entries = scraper.scrape(engine.parse(page.encode('utf-8'), None, 'utf-8'), cfg, engine)
+    single = scraper.apply_post_processing(scraper.select_single(entries, cfg), entries, cfg)
+    return scraper.save_output(entries, single, cfg)
+
+
+def test_write_if_changed(tmp_path):
+    path = str(tmp_path / 'out.json')
+
+    assert write_if_changed(path, b'{"a": 1}\n')
+    mtime = os.stat(path).st_mtime_ns
+    assert not write_if_changed(path, b'{"a": 1}\n')
+    assert os.stat(path).st_mtime_ns == mtime
+    assert write_if_changed(path, b'{"a": 2}\n')
+    assert open(path, 'rb').read() == b'{"a": 2}\n'
+    # Only the target file, no temp files left behind
+    assert sorted(p.name for p in tmp_path.iterdir() if not p.name.endswith(('.gz', '.br'))) == ['out.json']
+
+
+def test_serialize_json_keeps_umlauts_and_order():
+    assert serialize_json({'b': 'Straße', 'a': 1}) == '{\n  "b": "Straße",\n  "a": 1\n}\n'.encode('utf-8')
+
+
+def test_rerun_on_identical_input_leaves_output_untouched(output_dir, clock, crawler_id):
+    cfg = config(crawler_id)
+    assert set(run(cfg).values()) == {'written'}
+    files = {name: (output_dir / name).read_bytes() for name in (f'{crawler_id}.json', f'{crawler_id}-alle.json')}
+    mtimes = {name: os.stat(output_dir / name).st_mtime_ns for name in files}
+
+    # Later runs stamp a new scrape time and would pick another random entry
+    for minute in (15, 30, 45):
+        clock.now_value = datetime(2026, 10, 18, 9, minute)
+        assert set(run(cfg).values()) == {'unchanged'}
+
+    assert {name: (output_dir / name).read_bytes() for name in files} == files
+    assert {name: os.stat(output_dir / name).st_mtime_ns for name in files} == mtimes
+
+
+def test_changed_entries_get_a_new_timestamp(output_dir, clock, crawler_id):
+    cfg = config(crawler_id, strategy='first')
+    run(cfg)
+
+    clock.now_value = datetime(2026, 10, 18, 10, 0)
+    results = run(cfg, PAGE.replace('In der Kaiserpfalz', 'Im Odeon'))
+
+    assert results == {f'{crawler_id}-alle.json': 'written', f'{crawler_id}.json': 'unchanged'}
+    entries = json.loads((output_dir / f'{crawler_id}-alle.json').read_text(encoding='utf-8'))
+    assert [entry['published_at'] for entry in entries] == ['2026-10-18T09:00', '2026-10-18T10:00',
+                                                           '2026-10-18T09:00']
+
+
+def test_random_pick_follows_the_content(crawler_id):
+    cfg = config(crawler_id)
+    entries = [{'id': index, 'title': f'Entry {index}', 'published_at': '2026-10-18T09:00'} for index in range(20)]
+    later = [dict(entry, published_at='2026-10-18T10:00') for entry in entries]
+
+    assert scraper.select_single(entries, cfg)['title'] == scraper.select_single(later, cfg)['title']
+    picks = {scraper.select_single(entries[:size], cfg)['title'] for size in range(5, 20)}
+    assert len(picks) > 1
@@ -0,0 +1,155 @@
+"""Tests for multi-page crawling: page URLs, concurrent fetches and merging."""
+import threading
+import time
+
+import pytest
+import requests
+
+import scraper
+from pagination import fetch_all, merge_entries, template_urls, validate_pagination
+from parsers import get_engine
+
+
+def listing(*titles, next_href=None):
+    items = ''.join(f'<li><h2>{title}</h2><a href="/termine/{title.lower()}">mehr</a></li>' for title in titles)
+    link = f'<a class="weiter" href="{next_href}">Weiter</a>' if next_href else ''
+    return f'<html><body><ul>{items}</ul>{link}</body></html>'.encode('utf-8')
+
+
+def response(url, body):
+    result = requests.Response()
+    result.status_code = 200
+    result._content = body
+    result.url = url
+    result.headers['Content-Type'] = 'text/html; charset=utf-8'
+    return result
+
+
+def config(crawler_id, **pagination):
+    return {
+        'id': crawler_id, 'url': 'https://example.org/termine', 'type': 'simple', 'parser': 'html.parser',
+        'selectors': {
+            'container': 'li',
+            'title': {'selector': 'h2'},
+            'call_to_action_url': {'selector': 'a', 'attribute': 'href', 'prefix': 'https://example.org'},
+        },
+        'pagination': pagination,
+    }
+
+
+@pytest.fixture
+def site(monkeypatch):
+    """Pages by URL, served in place of scraper.fetch_response; other URLs fail."""
+    pages = {}
+
+    def fetch_response(url, session=None, metrics=None, policy=None, headers=None):
+        if url not in pages:
+            raise requests.ConnectionError(f'Not found: {url}')
+        return response(url, pages[url])
+
+    monkeypatch.setattr(scraper, 'fetch_response', fetch_response)
+    return pages
+
+
+def first_page(cfg, body):
+    engine = get_engine(cfg['parser'])
+    entries, next_url = scraper.extract_page(response(cfg['url'], body), cfg, engine)
+    return engine, entries, next_url
+
+
+def test_template_urls():
+    cfg = {'pagination': {'url_template': 'https://example.org/?seite={page}', 'max_pages': 4}}
+    assert template_urls(cfg) == ['https://example.org/?seite=2', 'https://example.org/?seite=3',
+                                  'https://example.org/?seite=4']
+    cfg['pagination']['start'] = 1
+    assert template_urls(cfg)[0] == 'https://example.org/?seite=1'
+    assert template_urls({'pagination': {'next_selector': 'a.weiter'}}) == []
+
+
+@pytest.mark.parametrize('pagination, message', [
+    ([], 'must be a mapping'),
+    ({'max_pages': 3}, "needs 'url_template' or 'next_selector'"),
+    ({'url_template': 'https://example.org/?seite=2'}, "must contain '{page}'"),
+    ({'next_selector': 'a.weiter', 'max_pages': 0}, 'at least 1'),
+])
+def test_validate_pagination(pagination, message):
+    with pytest.raises(ValueError, match=message):
+        validate_pagination({'pagination': pagination}, 'test.yaml')
+
+
+def test_fetch_all_keeps_order_and_runs_concurrently():
+    running = []
+    peak = []
+    lock = threading.Lock()
+
+    def fetch(url):
+        with lock:
+            running.append(url)
+            peak.append(len(running))
+        time.sleep(0.02)
+        with lock:
+            running.remove(url)
+        if url.endswith('3'):
+            raise requests.ConnectionError('down')
+        return url.upper()
+
+    urls = [f'https://example.org/{index}' for index in range(1, 6)]
+    results = fetch_all(urls, fetch, workers=4)
+
+    assert results == ['HTTPS://EXAMPLE.ORG/1', 'HTTPS://EXAMPLE.ORG/2', None,
+                       'HTTPS://EXAMPLE.ORG/4', 'HTTPS://EXAMPLE.ORG/5']
+    assert max(peak) > 1
+    assert fetch_all([], fetch) == []
+
+
+def test_merge_drops_duplicates_and_renumbers():
+    pages = [
+        [{'id': 1, 'title': 'A', 'call_to_action_url': '/a'}, {'id': 2, 'title': 'B', 'call_to_action_url': '/b'}],
+        [{'id': 1, 'title': 'B again', 'call_to_action_url': '/b'}, {'id': 2, 'title': 'C', 'call_to_action_url': ''}],
+        [{'id': 1, 'title': 'C', 'call_to_action_url': ''}],
+    ]
+
+    merged = merge_entries(pages, {})
+
+    assert [(entry['id'], entry['title']) for entry in merged] == [(1, 'A'), (2, 'B'), (3, 'C')]
+    by_title = merge_entries([[{'title': 'A', 'url': '/x'}], [{'title': 'B', 'url': '/x'}]],
+                             {'pagination': {'dedupe_key': 'url'}})
+    assert [entry['title'] for entry in by_title] == ['A']
+
+
+def test_next_links_are_followed_until_max_pages(site, crawler_id):
+    cfg = config(crawler_id, next_selector='a.weiter', max_pages=3)
+    site.update({
+        'https://example.org/termine?seite=2': listing('Konzert', next_href='?seite=3'),
+        'https://example.org/termine?seite=3': listing('Flohmarkt', 'Altstadtfest', next_href='?seite=4'),
+        'https://example.org/termine?seite=4': listing('Nie geladen'),
+    })
+    engine, entries, next_url = first_page(cfg, listing('Altstadtfest', next_href='?seite=2'))
+
+    merged = scraper.scrape_more_pages(cfg, engine, entries, next_url)
+
+    assert [entry['title'] for entry in merged] == ['Altstadtfest', 'Konzert', 'Flohmarkt']
+    assert [entry['id'] for entry in merged] == [1, 2, 3]
+
+
+def test_next_link_loops_stop(site, crawler_id):
+    cfg = config(crawler_id, next_selector='a.weiter', max_pages=10)
+    site['https://example.org/termine?seite=2'] = listing('Konzert', next_href='/termine')
+    engine, entries, next_url = first_page(cfg, listing('Altstadtfest', next_href='?seite=2'))
+
+    merged = scraper.scrape_more_pages(cfg, engine, entries, next_url)
+
+    assert [entry['title'] for entry in merged] == ['Altstadtfest', 'Konzert']
+
+
+def test_template_pages_stop_at_the_first_gap(site, crawler_id):
+    cfg = config(crawler_id, url_template='https://example.org/termine?seite={page}', max_pages=5)
+    site.update({
+        'https://example.org/termine?seite=2': listing('Konzert'),
+        'https://example.org/termine?seite=4': listing('Hinter der Lücke'),
+    })
+    engine, entries, next_url = first_page(cfg, listing('Altstadtfest'))
+
+    merged = scraper.scrape_more_pages(cfg, engine, entries, next_url)
+
+    assert [entry['title'] for entry in merged] == ['Altstadtfest', 'Konzert']
@@ -0,0 +1,99 @@
+"""Tests for extracting large listing pages in a process pool."""
+import pytest
+
+import parallel_extract
+import scraper
+from parallel_extract import extract_parallel, parallel_settings, validate_parallel
+from parsers import HAS_SELECTOLAX, get_engine
+from selector_stats import SelectorStats
+
+
+PARSERS = ['html.parser', pytest.param('selectolax', marks=pytest.mark.skipif(
+    not HAS_SELECTOLAX, reason='selectolax not installed'))]
+
+
+def page(count):
+    items = []
+    for index in range(count):
+        image = f'<img src="/bilder/{index}.jpg">' if index % 3 else ''
+        title = f'<h2>Termin {index} &amp; Co.</h2>' if index % 7 else ''
+        items.append(f'<li class="event">{title}<p>Ort {index} in Goslar</p>{image}'
+                     f'<a href="/termine/{index}">mehr</a></li>')
+    return f'<html><body><ul>{"".join(items)}</ul></body></html>'.encode('utf-8')
+
+
+def config(crawler_id, parser, **parallel):
+    return {
+        'id': crawler_id, 'url': 'https://example.org/', 'type': 'simple', 'parser': parser,
+        'selectors': {
+            'container': 'li.event',
+            'title': {'selector': 'h2'},
+            'description': {'selector': 'p'},
+            'image_url': {'selector': 'img', 'attribute': 'src', 'prefix': 'https://example.org',
+                          'fallback': 'https://example.org/platzhalter.jpg'},
+            'call_to_action_url': {'selector': 'a', 'attribute': 'href', 'prefix': 'https://example.org'},
+        },
+        'parallel_extraction': parallel,
+    }
+
+
+@pytest.fixture
+def pool():
+    yield
+    if parallel_extract._pool is not None:
+        parallel_extract._pool.shutdown()
+    parallel_extract.reset_pool()
+
+
+def scrape(cfg, markup):
+    engine = get_engine(cfg['parser'])
+    stats = SelectorStats()
+    entries = scraper.scrape(engine.parse(markup, None, 'utf-8'), cfg, engine, stats)
+    for entry in entries:
+        entry.pop('published_at')
+    return entries, stats.counts
+
+
+@pytest.mark.parametrize('parser', PARSERS)
+def test_parallel_entries_equal_serial(pool, crawler_id, parser, capsys):
+    markup = page(250)
+    serial = scrape(config(crawler_id, parser, threshold=0), markup)
+    parallel = scrape(config(crawler_id, parser, threshold=100, workers=2, chunk_size=60), markup)
+
+    assert 'in 5 chunks on 2 processes' in capsys.readouterr().out
+    assert parallel[0] == serial[0]
+    assert len(serial[0]) == 250
+    # Selector counts are merged from the workers; only the timings differ
+    assert {field: counts[:3] for field, counts in parallel[1].items()} == \
+        {field: counts[:3] for field, counts in serial[1].items()}
+
+
+def test_small_pages_stay_serial(crawler_id):
+    engine = get_engine('html.parser')
+    cfg = config(crawler_id, 'html.parser', threshold=100, workers=2, chunk_size=60)
+    plan = scraper.get_plan(cfg)
+
+    for count, settings in ((99, {}), (250, {'workers': 1}), (250, {'chunk_size': 250})):
+        cfg['parallel_extraction'].update(settings)
+        containers = engine.select(engine.parse(page(count), None, 'utf-8'), plan.container)
+        assert extract_parallel(containers, plan.fields, engine, cfg) is None
+
+
+def test_engines_without_cheap_fragments_need_a_threshold():
+    assert parallel_settings({}, get_engine('html.parser'))[0] == 0
+    assert parallel_settings({'parallel_extraction': {'threshold': 500}}, get_engine('html.parser'))[0] == 500
+
+
+@pytest.mark.parametrize('block, message', [
+    ('yes', 'must be a mapping'),
+    ({'workers': 0}, 'workers'),
+    ({'chunk_size': 0}, 'chunk_size'),
+])
+def test_validate_parallel(block, message):
+    with pytest.raises(ValueError, match=message):
+        validate_parallel({'type': 'simple', 'parallel_extraction': block}, 'test.yaml')
+
+
+def test_only_simple_configs_run_in_parallel():
+    with pytest.raises(ValueError, match="only supported for 'type: simple'"):
+        validate_parallel({'type': 'nested', 'parallel_extraction': {}}, 'test.yaml')
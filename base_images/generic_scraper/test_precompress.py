@@ -0,0 +1,120 @@
+"""Tests for precompressed siblings and the sweep of stale ones."""
+import gzip
+import json
+import os
+
+import pytest
+
+import precompress
+from precompress import ENCODINGS, MANIFEST_NAME, Manifest, publish, sweep_dir
+
+
+CONTENT = json.dumps([{'id': index, 'title': f'Meldung {index} aus Goslar'} for index in range(50)]).encode('utf-8')
+
+
+# .gz, plus .br where brotli is installed
+SIBLINGS = len(ENCODINGS)
+
+
+@pytest.fixture
+def root(tmp_path):
+    return tmp_path
+
+
+def names(directory):
+    return sorted(p.name for p in directory.iterdir() if not p.name.startswith('.'))
+
+
+def write(path, content=CONTENT, age=0):
+    """Write content; age moves the mtime that many seconds into the past."""
+    path.write_bytes(content)
+    if age:
+        stamp = path.stat().st_mtime - age
+        os.utime(path, (stamp, stamp))
+    return path
+
+
+def test_publish_writes_deterministic_gzip_and_manifest(root):
+    path = write(root / 'a.json')
+
+    assert publish(str(path), root=str(root))
+    gz = (root / 'a.json.gz').read_bytes()
+    assert gzip.decompress(gz) == CONTENT
+    entry = Manifest(str(root)).load()['a.json']
+    assert entry['size'] == len(CONTENT)
+    assert entry['encodings']['.gz']['size'] == len(gz)
+
+    # Unchanged content: nothing is rewritten
+    assert not publish(str(path), root=str(root))
+    assert precompress.compress_gzip(CONTENT) == gz
+
+
+def test_publish_rebuilds_after_change(root):
+    path = write(root / 'a.json')
+    publish(str(path), root=str(root))
+
+    changed = CONTENT.replace(b'Goslar', b'Oker')
+    write(path, changed)
+    assert publish(str(path), root=str(root))
+    assert gzip.decompress((root / 'a.json.gz').read_bytes()) == changed
+
+
+def test_small_and_other_files_get_no_siblings(root):
+    small = write(root / 'single.json', b'{"id": 1}')
+    image = write(root / 'bild.png')
+
+    assert publish(str(small), root=str(root))
+    assert not publish(str(image), root=str(root))
+    assert not (root / 'single.json.gz').exists()
+    assert not (root / 'bild.png.gz').exists()
+    assert Manifest(str(root)).load()['single.json']['encodings'] == {}
+
+
+def test_sweep_never_creates_siblings(root):
+    write(root / 'custom.json')
+
+    assert sweep_dir(str(root)) == {'current': 0, 'removed': 0}
+    assert names(root) == ['custom.json']
+
+
+def test_sweep_removes_siblings_of_files_rewritten_without_publish(root):
+    # A custom crawler's file was published once, then rewritten without publish()
+    path = write(root / 'custom.json')
+    publish(str(path), root=str(root))
+    write(path, CONTENT.replace(b'Goslar', b'Oker'))
+
+    assert sweep_dir(str(root)) == {'current': 0, 'removed': SIBLINGS}
+    assert names(root) == ['custom.json', MANIFEST_NAME]
+    assert 'custom.json' not in Manifest(str(root)).load()
+
+
+def test_sweep_keeps_siblings_of_published_files(root):
+    (root / 'sub').mkdir()
+    path = write(root / 'sub' / 'scraper-alle.json')
+    publish(str(path), root=str(root))
+    # Rewritten with identical content (e.g. write_if_changed skipped the publish)
+    write(path, age=-10)
+
+    assert sweep_dir(str(root)) == {'current': SIBLINGS, 'removed': 0}
+    assert (root / 'sub' / 'scraper-alle.json.gz').exists()
+
+
+def test_sweep_uses_mtime_for_unknown_siblings(root):
+    write(root / 'old.json')
+    write(root / 'old.json.gz', precompress.compress_gzip(b'old'), age=60)
+    write(root / 'fresh.json', age=60)
+    write(root / 'fresh.json.gz', precompress.compress_gzip(CONTENT))
+
+    assert sweep_dir(str(root)) == {'current': 1, 'removed': 1}
+    assert not (root / 'old.json.gz').exists()
+    assert (root / 'fresh.json.gz').exists()
+
+
+def test_sweep_drops_missing_files(root):
+    path = write(root / 'gone.json')
+    publish(str(path), root=str(root))
+    path.unlink()
+
+    assert sweep_dir(str(root))['removed'] == SIBLINGS
+    assert names(root) == [MANIFEST_NAME]
+    assert json.loads((root / MANIFEST_NAME).read_text(encoding='utf-8')) == {}
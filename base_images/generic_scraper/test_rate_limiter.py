@@ -0,0 +1,119 @@
+"""Tests for the SQLite-backed per-host token buckets."""
+import sqlite3
+import types
+
+import pytest
+
+import rate_limiter
+from rate_limiter import RateLimiter, parse_rate, parse_rules
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Frozen time for the limiter; advance with clock.now += seconds."""
+    fake = types.SimpleNamespace(now=1_000_000.0, slept=[])
+    fake.time = lambda: fake.now
+    fake.sleep = fake.slept.append
+    monkeypatch.setattr(rate_limiter, 'time', fake)
+    return fake
+
+
+def limiter(tmp_path, rules='', default='1:2', timeout=30):
+    return RateLimiter(str(tmp_path / 'rate-limits.sqlite'), rules=rules, default=default, timeout=timeout)
+
+
+def test_parse_rate():
+    assert parse_rate('0.5:3') == (0.5, 3.0)
+    assert parse_rate('2') == (2.0, 2.0)
+    assert parse_rate('0.2') == (0.2, 1.0)
+    assert parse_rate('0') is None
+
+
+def test_parse_rules():
+    assert parse_rules('Goslar.de=1:5, api.example.org=0, broken') == {
+        'goslar.de': (1.0, 5.0),
+        'api.example.org': (0.0, 0.0),
+    }
+
+
+def test_rules_cover_subdomains(tmp_path):
+    rl = limiter(tmp_path, rules='goslar.de=1:5,open.goslar.de=0')
+
+    assert rl.bucket_for('https://www.goslar.de/news') == ('goslar.de', (1.0, 5.0))
+    assert rl.bucket_for('https://open.goslar.de/') == ('open.goslar.de', None)
+    assert rl.bucket_for('https://example.org/') == ('example.org', (1.0, 2.0))
+
+
+def test_burst_is_free_then_requests_are_spaced(tmp_path, clock):
+    rl = limiter(tmp_path, default='2:3')
+    waits = [rl.reserve('https://example.org/') for _ in range(5)]
+
+    assert waits == [0.0, 0.0, 0.0, 0.5, 1.0]
+
+
+def test_tokens_refill_over_time(tmp_path, clock):
+    rl = limiter(tmp_path, default='1:2')
+    rl.reserve('https://example.org/')
+    rl.reserve('https://example.org/')
+    assert rl.reserve('https://example.org/') == 1.0
+
+    clock.now += 10
+    # Refill is capped at the burst size
+    assert [rl.reserve('https://example.org/') for _ in range(3)] == [0.0, 0.0, 1.0]
+
+
+def test_hosts_have_separate_buckets(tmp_path, clock):
+    rl = limiter(tmp_path, default='1:1')
+    assert rl.reserve('https://a.example/') == 0.0
+    assert rl.reserve('https://b.example/') == 0.0
+    assert rl.reserve('https://a.example/') == 1.0
+
+
+def test_bucket_is_shared_between_limiters_on_the_same_database(tmp_path, clock):
+    first, second = limiter(tmp_path, default='1:1'), limiter(tmp_path, default='1:1')
+
+    assert first.reserve('https://example.org/') == 0.0
+    assert second.reserve('https://example.org/') == 1.0
+    assert first.reserve('https://example.org/') == 2.0
+
+
+def test_unlimited_hosts_never_wait(tmp_path, clock):
+    rl = limiter(tmp_path, default='0')
+    assert [rl.reserve('https://example.org/') for _ in range(20)] == [0.0] * 20
+
+
+def test_acquire_sleeps_and_stats_count_waits(tmp_path, clock):
+    rl = limiter(tmp_path, default='1:1')
+    rl.acquire('https://example.org/')
+    rl.acquire('https://example.org/')
+
+    assert clock.slept == [1.0]
+    assert rl.stats() == [{'host': 'example.org', 'requests': 2, 'waits': 1, 'wait_seconds': 1.0, 'max_wait': 1.0}]
+
+
+def test_unusable_database_fails_open(tmp_path, capsys):
+    # A directory where the database file should be
+    (tmp_path / 'rate-limits.sqlite').mkdir()
+    rl = limiter(tmp_path)
+
+    assert rl.acquire('https://example.org/') == 0.0
+    assert rl.acquire('https://example.org/') == 0.0
+    assert 'Rate limiter disabled' in capsys.readouterr().out
+
+
+def test_locked_database_skips_only_that_request(tmp_path, clock, capsys):
+    rl = limiter(tmp_path, default='1:1', timeout=0.01)
+    assert rl.acquire('https://example.org/') == 0.0
+
+    # Another container holds the write lock
+    other = sqlite3.connect(str(tmp_path / 'rate-limits.sqlite'), isolation_level=None)
+    other.execute('BEGIN EXCLUSIVE')
+    assert rl.acquire('https://example.org/') == 0.0
+    other.execute('ROLLBACK')
+    other.close()
+
+    # Limiting resumes with the next call
+    assert rl.acquire('https://example.org/') == 1.0
+    assert clock.slept == [1.0]
+    out = capsys.readouterr().out
+    assert 'database busy' in out and 'disabled' not in out
@@ -0,0 +1,123 @@
+"""Tests for the compiled YAML cache of the crawler registry and configs."""
+import json
+
+import pytest
+import yaml
+
+import registry_cache
+from registry_cache import cache_path, load_registry, load_yaml
+
+
+REGISTRY = """crawlers:
+  - id: "001"
+    name: news
+  - id: "002"
+    name: events
+"""
+PARSED = {'crawlers': [{'id': '001', 'name': 'news'}, {'id': '002', 'name': 'events'}]}
+
+
+@pytest.fixture
+def parses(tmp_path, monkeypatch):
+    """Cache in tmp_path; the returned list grows by one for every real YAML parse."""
+    monkeypatch.setattr(registry_cache, 'REGISTRY_CACHE_DIR', str(tmp_path / 'cache'))
+    calls = []
+    load = yaml.load
+
+    def counting_load(*args, **kwargs):
+        calls.append(args[0])
+        return load(*args, **kwargs)
+
+    monkeypatch.setattr(registry_cache.yaml, 'load', counting_load)
+    return calls
+
+
+def write(path, text):
+    path.write_text(text, encoding='utf-8')
+    return path
+
+
+def test_second_load_comes_from_cache(tmp_path, parses):
+    source = write(tmp_path / 'crawlers.yaml', REGISTRY)
+
+    first = load_registry(source)
+    second = load_registry(source)
+
+    assert first == second == PARSED
+    assert len(parses) == 1
+    compiled = json.loads(cache_path(source).read_text(encoding='utf-8'))
+    assert compiled['version'] == registry_cache.COMPILED_VERSION
+    assert compiled['source'] == str(source)
+
+
+def test_changed_source_is_parsed_again(tmp_path, parses):
+    source = write(tmp_path / 'crawlers.yaml', REGISTRY)
+    load_registry(source)
+
+    write(source, REGISTRY.replace('events', 'calendar'))
+
+    assert load_registry(source)['crawlers'][1]['name'] == 'calendar'
+    assert len(parses) == 2
+
+
+def test_cache_lives_outside_the_source_directory(tmp_path, parses):
+    source = write(tmp_path / 'crawlers.yaml', REGISTRY)
+    load_registry(source)
+
+    assert cache_path(source).parent == tmp_path / 'cache'
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['cache', 'crawlers.yaml']
+
+
+def test_equal_names_in_different_directories_do_not_collide(tmp_path, parses):
+    (tmp_path / 'a').mkdir()
+    (tmp_path / 'b').mkdir()
+    first = write(tmp_path / 'a' / 'config.yaml', 'id: a\n')
+    second = write(tmp_path / 'b' / 'config.yaml', 'id: b\n')
+
+    assert cache_path(first) != cache_path(second)
+    assert (load_yaml(first), load_yaml(second)) == ({'id': 'a'}, {'id': 'b'})
+    assert (load_yaml(first), load_yaml(second)) == ({'id': 'a'}, {'id': 'b'})
+    assert len(parses) == 2
+
+
+def test_invalid_content_is_not_cached(tmp_path, parses):
+    source = write(tmp_path / 'crawlers.yaml', 'crawlers:\n  - id: "001"\n    name: a\n  - id: "001"\n    name: b\n')
+
+    for _ in range(2):
+        with pytest.raises(ValueError, match='Duplicate crawler id'):
+            load_registry(source)
+    assert len(parses) == 2
+    assert not cache_path(source).exists()
+
+
+@pytest.mark.parametrize('text, message', [
+    ('crawlers: {}\n', "'crawlers' list"),
+    ('crawlers:\n  - id: "001"\n', "'id' and a 'name'"),
+    ('- just a list\n', "'crawlers' list"),
+])
+def test_validate_registry(tmp_path, parses, text, message):
+    with pytest.raises(ValueError, match=message):
+        load_registry(write(tmp_path / 'crawlers.yaml', text))
+
+
+def test_yaml_errors_are_exposed(tmp_path, parses):
+    with pytest.raises(registry_cache.YAMLError):
+        load_yaml(write(tmp_path / 'broken.yaml', 'a: [1, 2\n'))
+
+
+def test_content_that_json_cannot_represent_is_not_cached(tmp_path, parses):
+    source = write(tmp_path / 'config.yaml', 'start: 2026-03-02\n1: numeric key\n')
+
+    data = load_yaml(source)
+    assert load_yaml(source) == data
+    assert str(data['start']) == '2026-03-02' and data[1] == 'numeric key'
+    assert len(parses) == 2
+    assert not cache_path(source).exists()
+
+
+def test_unwritable_cache_still_loads(tmp_path, parses, monkeypatch):
+    blocker = write(tmp_path / 'not-a-dir', '')
+    monkeypatch.setattr(registry_cache, 'REGISTRY_CACHE_DIR', str(blocker / 'cache'))
+    source = write(tmp_path / 'crawlers.yaml', REGISTRY)
+
+    assert load_registry(source) == PARSED
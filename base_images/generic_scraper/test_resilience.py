@@ -0,0 +1,174 @@
+"""Tests for the per-host circuit breaker, retry policy and freshness store."""
+import types
+
+import pytest
+import requests
+
+import resilience
+from resilience import (CircuitBreaker, CircuitOpenError, FetchPolicy, FreshnessStore,
+                        is_retryable, validate_retry)
+from state_store import JsonStore
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Frozen time for the breaker; advance with clock.now += seconds."""
+    fake = types.SimpleNamespace(now=1_000_000.0)
+    fake.time = lambda: fake.now
+    monkeypatch.setattr(resilience, 'time', fake)
+    return fake
+
+
+@pytest.fixture
+def breaker(tmp_path, clock):
+    return CircuitBreaker(failures=3, cooldown=900,
+                          store=JsonStore('circuit-breakers.json', str(tmp_path)))
+
+
+def http_error(status):
+    response = requests.Response()
+    response.status_code = status
+    return requests.HTTPError(response=response)
+
+
+def test_breaker_stays_closed_below_threshold(breaker):
+    for _ in range(2):
+        breaker.record_failure('https://example.org/a', ValueError('boom'))
+
+    breaker.check('https://example.org/b')
+
+
+def test_breaker_opens_after_repeated_failures(breaker):
+    for _ in range(3):
+        breaker.record_failure('https://Example.org/a', ValueError('boom'))
+
+    with pytest.raises(CircuitOpenError, match='after 3 failures'):
+        breaker.check('https://example.org/other')
+    # Other hosts are not affected
+    breaker.check('https://example.com/')
+
+
+def test_breaker_half_open_after_cooldown(breaker, clock):
+    for _ in range(3):
+        breaker.record_failure('https://example.org/', ValueError('boom'))
+
+    clock.now += 899
+    with pytest.raises(CircuitOpenError):
+        breaker.check('https://example.org/')
+    clock.now += 2
+    breaker.check('https://example.org/')
+
+    # A failed trial request opens the breaker again right away
+    breaker.record_failure('https://example.org/', ValueError('still down'))
+    with pytest.raises(CircuitOpenError, match='still down'):
+        breaker.check('https://example.org/')
+
+
+def test_half_open_lets_only_one_request_through(breaker, clock, tmp_path):
+    for _ in range(3):
+        breaker.record_failure('https://example.org/', ValueError('boom'))
+    clock.now += 901
+    other = CircuitBreaker(failures=3, cooldown=900, probe_timeout=300,
+                           store=JsonStore('circuit-breakers.json', str(tmp_path)))
+
+    breaker.check('https://example.org/a')
+    # Concurrent callers, also in other processes, wait for the trial request
+    for caller in (breaker, other):
+        with pytest.raises(CircuitOpenError, match='half-open'):
+            caller.check('https://example.org/b')
+
+    breaker.record_success('https://example.org/a')
+    other.check('https://example.org/b')
+    other.check('https://example.org/c')
+
+
+def test_lost_trial_request_releases_the_host(breaker, clock):
+    for _ in range(3):
+        breaker.record_failure('https://example.org/', ValueError('boom'))
+    clock.now += 901
+    breaker.check('https://example.org/')
+
+    # The trial never reported back (non-retryable error, killed run)
+    clock.now += 299
+    with pytest.raises(CircuitOpenError):
+        breaker.check('https://example.org/')
+    clock.now += 2
+    breaker.check('https://example.org/')
+
+
+def test_success_closes_breaker(breaker, clock):
+    for _ in range(3):
+        breaker.record_failure('https://example.org/', ValueError('boom'))
+    clock.now += 901
+
+    breaker.record_success('https://example.org/')
+
+    assert breaker.store.load() == {}
+    # Counting starts over
+    breaker.record_failure('https://example.org/', ValueError('boom'))
+    breaker.check('https://example.org/')
+
+
+def test_breaker_state_is_shared_through_store(breaker, tmp_path):
+    for _ in range(3):
+        breaker.record_failure('https://example.org/', ValueError('boom'))
+
+    other = CircuitBreaker(failures=3, cooldown=900,
+                           store=JsonStore('circuit-breakers.json', str(tmp_path)))
+    with pytest.raises(CircuitOpenError):
+        other.check('https://example.org/')
+
+
+def test_is_retryable():
+    assert is_retryable(requests.ConnectionError())
+    assert is_retryable(requests.Timeout())
+    assert is_retryable(http_error(503))
+    assert is_retryable(http_error(429))
+    assert not is_retryable(http_error(404))
+    assert not is_retryable(ValueError())
+
+
+def test_policy_from_config():
+    policy = FetchPolicy.from_config({'retry': {'attempts': 4, 'backoff': 1, 'on_error': 'empty'}})
+
+    assert policy.retries == 3
+    assert policy.backoff == 1.0
+    assert policy.on_error == 'empty'
+    assert FetchPolicy.from_config(None) == FetchPolicy(retries=resilience.FETCH_RETRIES)
+
+
+def test_policy_delay_honours_retry_after():
+    policy = FetchPolicy(backoff=2, max_backoff=30)
+    response = requests.Response()
+    response.headers['Retry-After'] = '120'
+
+    assert policy.delay(1, response) == 30
+    for attempt in range(1, 6):
+        assert 0 <= policy.delay(attempt) <= min(30, 2 * 2 ** (attempt - 1))
+
+
+def test_validate_retry():
+    validate_retry({}, 'x.yaml')
+    validate_retry({'retry': {'attempts': 2, 'on_error': 'serve_stale'}}, 'x.yaml')
+    with pytest.raises(ValueError, match='mapping'):
+        validate_retry({'retry': 3}, 'x.yaml')
+    with pytest.raises(ValueError, match='attempts'):
+        validate_retry({'retry': {'attempts': 0}}, 'x.yaml')
+    with pytest.raises(ValueError, match='on_error'):
+        validate_retry({'retry': {'on_error': 'ignore'}}, 'x.yaml')
+
+
+def test_freshness_stale_then_fresh(tmp_path, crawler_id):
+    freshness = FreshnessStore(JsonStore('freshness.json', str(tmp_path)))
+
+    first = freshness.mark_stale(crawler_id, ValueError('timeout'))
+    second = freshness.mark_stale(crawler_id, ValueError('refused'))
+
+    assert second['failures'] == 2
+    assert second['stale_since'] == first['stale_since']
+    assert second['last_error'] == 'refused'
+
+    freshness.mark_fresh(crawler_id)
+    state = freshness.get(crawler_id)
+    assert set(state) == {'last_success'}
+    assert freshness.get('unknown') == {}
@@ -0,0 +1,150 @@
+"""Tests for the in-process cache of responses and shared parsed documents."""
+import threading
+import types
+
+import pytest
+import requests
+
+import response_cache
+from response_cache import ResponseCache
+
+
+ENGINE = types.SimpleNamespace(name='html.parser')
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Frozen monotonic clock of the cache; advance with clock.now += seconds."""
+    fake = types.SimpleNamespace(now=1000.0)
+    fake.monotonic = lambda: fake.now
+    monkeypatch.setattr(response_cache, 'time', fake)
+    return fake
+
+
+def response(status=200):
+    result = requests.Response()
+    result.status_code = status
+    return result
+
+
+class CountingFetch:
+    """fetch() callable that counts its calls and can block until released."""
+
+    def __init__(self, status=200, block=False):
+        self.status = status
+        self.calls = 0
+        self.release = threading.Event()
+        if not block:
+            self.release.set()
+
+    def __call__(self):
+        self.calls += 1
+        self.release.wait(5)
+        return response(self.status)
+
+
+def run_threads(target, count):
+    results = [None] * count
+    threads = [threading.Thread(target=lambda i=i: results.__setitem__(i, target())) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads, results
+
+
+def test_disabled_cache_always_fetches():
+    cache = ResponseCache()
+    fetch = CountingFetch()
+
+    assert cache.fetch('https://example.org/', fetch)[1] is False
+    assert cache.fetch('https://example.org/', fetch)[1] is False
+    assert fetch.calls == 2
+
+
+def test_response_is_reused_until_ttl(clock):
+    cache = ResponseCache(ttl=300)
+    fetch = CountingFetch()
+
+    first, hit = cache.fetch('https://example.org/', fetch)
+    assert not hit
+    clock.now += 299
+    assert cache.fetch('https://example.org/', fetch) == (first, True)
+
+    clock.now += 2
+    assert cache.fetch('https://example.org/', fetch)[1] is False
+    assert fetch.calls == 2
+
+
+def test_error_responses_are_not_cached(clock):
+    cache = ResponseCache(ttl=300)
+    fetch = CountingFetch(status=503)
+
+    cache.fetch('https://example.org/', fetch)
+    cache.fetch('https://example.org/', fetch)
+
+    assert fetch.calls == 2
+
+
+def test_concurrent_requests_share_one_fetch():
+    cache = ResponseCache(ttl=300)
+    fetch = CountingFetch(block=True)
+
+    threads, results = run_threads(lambda: cache.fetch('https://example.org/', fetch), 4)
+    fetch.release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert fetch.calls == 1
+    assert len({id(result[0]) for result in results}) == 1
+    assert sorted(hit for _, hit in results) == [False, True, True, True]
+
+
+def test_document_is_parsed_once_for_concurrent_configs():
+    cache = ResponseCache(ttl=300)
+    cache.share(['https://example.org/', 'https://example.org/', 'https://example.org/other'])
+    page = response()
+    parsed = []
+    started = threading.Event()
+    release = threading.Event()
+
+    def parse():
+        parsed.append(object())
+        started.set()
+        release.wait(5)
+        return parsed[-1]
+
+    threads, results = run_threads(lambda: cache.document('https://example.org/', page, ENGINE, None, parse), 3)
+    started.wait(5)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(parsed) == 1
+    assert all(result == (parsed[0], True) for result in results)
+    assert cache.summary()['document_hit_rate'] == 0.667
+
+
+def test_documents_of_single_use_urls_are_not_kept():
+    cache = ResponseCache(ttl=300)
+    cache.share(['https://example.org/', 'https://example.org/other'])
+    page = response()
+
+    first = cache.document('https://example.org/', page, ENGINE, None, object)
+    second = cache.document('https://example.org/', page, ENGINE, None, object)
+
+    assert first[1] is False and second[1] is False
+    assert first[0] is not second[0]
+    assert 'document_misses' not in cache.summary()
+
+
+def test_documents_are_capped():
+    cache = ResponseCache(ttl=300, max_documents=2)
+    urls = [f'https://example.org/{index}' for index in range(3)]
+    cache.share(urls * 2)
+    pages = {url: response() for url in urls}
+
+    for url in urls:
+        cache.document(url, pages[url], ENGINE, None, object)
+    cache.document(urls[0], pages[urls[0]], ENGINE, None, object)
+
+    assert cache.summary()['document_misses'] == 4
+    assert len(cache._documents) == 2
@@ -0,0 +1,65 @@
+"""Tests for the per-run metrics record."""
+import pytest
+
+import run_metrics
+from run_metrics import RunMetrics, rss_mb, update_prometheus
+
+
+@pytest.fixture
+def rss(monkeypatch):
+    """Fake process RSS in MB; set rss.value before each sample."""
+    class FakeRss:
+        value = 100.0
+
+        def __call__(self):
+            return self.value
+
+    fake = FakeRss()
+    monkeypatch.setattr(run_metrics, 'rss_mb', fake)
+    return fake
+
+
+def test_rss_of_this_process():
+    assert rss_mb() > 1
+
+
+def test_memory_is_measured_per_run(rss, crawler_id):
+    first = RunMetrics(crawler_id)
+    rss.value = 180.0
+    first.sample_memory()
+    rss.value = 140.0
+    assert first.finish('success')['rss_delta_mb'] == 80.0
+
+    # A later, smaller run in the same process does not inherit the earlier peak
+    second = RunMetrics(crawler_id)
+    rss.value = 150.0
+    record = second.finish('success')
+    assert (record['rss_start_mb'], record['rss_peak_mb'], record['rss_delta_mb']) == (140.0, 150.0, 10.0)
+
+
+def test_stages_sample_memory(rss, crawler_id):
+    metrics = RunMetrics(crawler_id)
+    with metrics.stage('write'):
+        rss.value = 130.0
+    rss.value = 90.0
+
+    record = metrics.finish('success')
+    assert record['rss_peak_mb'] == 130.0
+    assert record['write_ms'] >= 0
+
+
+def test_without_proc_memory_is_left_out(monkeypatch, crawler_id):
+    monkeypatch.setattr(run_metrics, 'rss_mb', lambda: None)
+
+    record = RunMetrics(crawler_id).finish('success')
+    assert 'rss_delta_mb' not in record
+
+
+def test_prometheus_exports_delta_per_crawler(tmp_path, crawler_id):
+    path = tmp_path / 'gs_scraper.prom'
+    update_prometheus({'crawler_id': crawler_id, 'started_at': '2026-10-18T09:00:00',
+                       'rss_delta_mb': 2.0, 'outcome': 'success'}, str(path))
+
+    text = path.read_text(encoding='utf-8')
+    assert f'gs_scraper_rss_delta_bytes{{crawler="{crawler_id}"}} 2097152' in text
+    assert 'peak_rss' not in text
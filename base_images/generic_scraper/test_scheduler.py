@@ -0,0 +1,154 @@
+"""Tests for the cron parsing and next-fire computation of the scheduler."""
+from datetime import datetime
+
+import pytest
+
+from scheduler import CronSchedule, effective_schedule, stagger_offset, stagger_schedule
+
+
+def test_every_minute_fires_on_the_next_minute():
+    assert CronSchedule('* * * * *').next_run(datetime(2026, 3, 1, 10, 15, 42)) == datetime(2026, 3, 1, 10, 16)
+
+
+def test_next_run_is_strictly_after():
+    cron = CronSchedule('30 * * * *')
+    assert cron.next_run(datetime(2026, 3, 1, 10, 30)) == datetime(2026, 3, 1, 11, 30)
+    assert cron.next_run(datetime(2026, 3, 1, 10, 29, 59)) == datetime(2026, 3, 1, 10, 30)
+
+
+def test_step_minutes():
+    cron = CronSchedule('*/15 * * * *')
+    assert cron.minutes == {0, 15, 30, 45}
+    assert cron.next_run(datetime(2026, 3, 1, 10, 46)) == datetime(2026, 3, 1, 11, 0)
+
+
+def test_step_from_a_start_value():
+    # "5/20" runs from minute 5 to the end of the range
+    assert CronSchedule('5/20 * * * *').minutes == {5, 25, 45}
+
+
+def test_ranges_lists_and_stepped_ranges():
+    cron = CronSchedule('0,30 8-10 * * *')
+    assert cron.hours == {8, 9, 10}
+    assert cron.next_run(datetime(2026, 3, 1, 10, 31)) == datetime(2026, 3, 2, 8, 0)
+    assert CronSchedule('0 9-17/4 * * *').hours == {9, 13, 17}
+
+
+def test_hour_rollover_to_next_day():
+    assert CronSchedule('0 6 * * *').next_run(datetime(2026, 12, 31, 7, 0)) == datetime(2027, 1, 1, 6, 0)
+
+
+def test_day_of_week_with_sunday_as_0_and_7():
+    # 2026-03-01 is a Sunday
+    assert CronSchedule('0 9 * * 0').next_run(datetime(2026, 2, 27, 12, 0)) == datetime(2026, 3, 1, 9, 0)
+    assert CronSchedule('0 9 * * 7').weekdays == {0}
+
+
+def test_weekday_range():
+    cron = CronSchedule('0 7 * * 1-5')
+    # Saturday evening -> Monday morning
+    assert cron.next_run(datetime(2026, 2, 28, 20, 0)) == datetime(2026, 3, 2, 7, 0)
+
+
+def test_day_of_month():
+    cron = CronSchedule('0 0 1 * *')
+    assert cron.next_run(datetime(2026, 1, 15)) == datetime(2026, 2, 1, 0, 0)
+
+
+def test_day_of_month_skips_short_months():
+    assert CronSchedule('0 12 31 * *').next_run(datetime(2026, 4, 1)) == datetime(2026, 5, 31, 12, 0)
+
+
+def test_day_of_month_or_day_of_week_when_both_are_restricted():
+    # Like cron: the 15th OR any Monday
+    cron = CronSchedule('0 8 15 * 1')
+    assert cron.next_run(datetime(2026, 3, 3)) == datetime(2026, 3, 9, 8, 0)  # Monday
+    assert cron.next_run(datetime(2026, 3, 10)) == datetime(2026, 3, 15, 8, 0)  # Sunday the 15th
+
+
+def test_leap_day_is_found_across_years():
+    assert CronSchedule('0 0 29 2 *').next_run(datetime(2026, 3, 1)) == datetime(2028, 2, 29, 0, 0)
+
+
+def test_matches():
+    cron = CronSchedule('*/10 8 * * *')
+    assert cron.matches(datetime(2026, 3, 1, 8, 20, 59))
+    assert not cron.matches(datetime(2026, 3, 1, 8, 21))
+    assert not cron.matches(datetime(2026, 3, 1, 9, 20))
+
+
+@pytest.mark.parametrize('expression', [
+    '* * * *',          # too few fields
+    '60 * * * *',       # minute out of range
+    '* 24 * * *',
+    '* * 0 * *',        # days start at 1
+    '* * * 13 *',
+    '* * * * 8',
+    '*/0 * * * *',      # step must be positive
+    '10-5 * * * *',     # reversed range
+    'a * * * *',
+])
+def test_invalid_expressions(expression):
+    with pytest.raises(ValueError):
+        CronSchedule(expression)
+
+
+CRAWLER_IDS = [f"{number:03d}_crawler" for number in range(50)]
+
+
+def test_stagger_offset_is_stable_and_inside_window():
+    offsets = [stagger_offset(crawler_id, 600) for crawler_id in CRAWLER_IDS]
+
+    assert offsets == [stagger_offset(crawler_id, 600) for crawler_id in CRAWLER_IDS]
+    assert all(0 <= offset < 600 for offset in offsets)
+    # Spread out, not all in the same slot
+    assert len(set(offset // 60 for offset in offsets)) > 5
+    assert stagger_offset('001_crawler', 0) == 0
+
+
+def test_stagger_without_window_keeps_schedule():
+    assert stagger_schedule('*/15 * * * *', '001_crawler', 0) == ('*/15 * * * *', 0)
+    assert stagger_schedule('not a cron', '001_crawler', 600) == ('not a cron', 0)
+
+
+@pytest.mark.parametrize('crawler_id', CRAWLER_IDS)
+def test_stagger_step_keeps_frequency(crawler_id):
+    expression, delay = stagger_schedule('*/15 * * * *', crawler_id, 3600)
+    shift = stagger_offset(crawler_id, 15 * 60) // 60
+
+    assert 0 <= delay < 60
+    assert expression == (f"{shift}-59/15 * * * *" if shift else '*/15 * * * *')
+    assert CronSchedule(expression).minutes == {shift, shift + 15, shift + 30, shift + 45}
+
+
+@pytest.mark.parametrize('crawler_id', CRAWLER_IDS)
+def test_stagger_fixed_minutes_stay_in_the_hour(crawler_id):
+    expression, delay = stagger_schedule('0,30 6 * * *', crawler_id, 3600)
+    minutes = sorted(CronSchedule(expression).minutes)
+
+    assert expression.endswith(' 6 * * *')
+    assert len(minutes) == 2 and minutes[1] - minutes[0] == 30
+    assert minutes[0] < 30
+    assert 0 <= delay < 60
+
+
+def test_stagger_window_limits_shift():
+    for crawler_id in CRAWLER_IDS:
+        expression, delay = stagger_schedule('45 * * * *', crawler_id, 120)
+        shift = int(expression.split()[0]) - 45
+        assert 0 <= shift * 60 + delay < 120
+
+
+def test_stagger_other_minute_fields_only_delay():
+    expression, delay = stagger_schedule('5-10 * * * *', '001_crawler', 600)
+
+    assert expression == '5-10 * * * *'
+    assert 0 <= delay < 60
+
+
+def test_effective_schedule_uses_config_window():
+    config = {'id': '001_crawler', 'schedule': '0 * * * *', 'stagger_window': 0}
+    assert effective_schedule(config) == ('0 * * * *', 0)
+
+    config['stagger_window'] = 1800
+    assert effective_schedule(config) == stagger_schedule('0 * * * *', '001_crawler', 1800)
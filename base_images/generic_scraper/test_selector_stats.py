@@ -0,0 +1,133 @@
+"""Tests for per-field selector counts and the hit-rate baseline."""
+import pytest
+
+from extraction import FieldPlan
+from parsers import get_engine
+from run_metrics import RunMetrics
+import scraper
+from selector_stats import SELECTOR_BASELINE_MIN_RUNS, SelectorStats, check_baseline
+from state_store import JsonStore
+
+
+PAGE = b"""<ul>
+  <li class="event"><h2>Altstadtfest</h2><img src="/a.jpg"></li>
+  <li class="event"><h2>Konzert</h2></li>
+  <li class="event"><p>no title</p></li>
+</ul>"""
+
+
+@pytest.fixture
+def store(tmp_path):
+    return JsonStore('selector-baseline.json', str(tmp_path))
+
+
+def summary(**hit_rates):
+    return {field: {'hit_rate': rate} for field, rate in hit_rates.items()}
+
+
+def test_counts_matches_fallbacks_and_empty():
+    engine = get_engine('html.parser')
+    containers = engine.select(engine.parse(PAGE, None, 'utf-8'), FieldPlan.from_config({'selector': 'li'}).selector)
+    title = FieldPlan.from_config({'selector': 'h2'})
+    image = FieldPlan.from_config({'selector': 'img', 'attribute': 'src', 'fallback': '/placeholder.png'})
+    fixed = FieldPlan.from_config({'default': 'Goslar'})
+    stats = SelectorStats()
+
+    values = [(stats.extract('title', title, c, engine), stats.extract('image_url', image, c, engine),
+               stats.extract('city', fixed, c, engine)) for c in containers]
+    result = stats.summary()
+
+    assert values[1] == ('Konzert', '/placeholder.png', 'Goslar')
+    assert set(result) == {'image_url', 'title'}
+    assert result['title']['matches'] == 2 and result['title']['empty'] == 1
+    assert result['image_url']['fallbacks'] == 2
+    assert result['title']['hit_rate'] == 0.667
+    assert result['title']['ms'] >= 0
+
+
+def test_merge_adds_worker_counts():
+    stats = SelectorStats()
+    stats.merge({'title': [2, 0, 1, 0.001, 1]})
+    stats.merge({'title': [1, 1, 0, 0.001, 1], 'date': [0, 0, 2, 0.0, 0]})
+
+    result = stats.summary()
+    assert (result['title']['matches'], result['title']['fallbacks'], result['title']['empty']) == (3, 1, 1)
+    assert result['date']['hit_rate'] == 0.0
+    assert result['date']['ms'] == 0.0
+
+
+def test_baseline_needs_runs_before_alerting(store, crawler_id):
+    for _ in range(SELECTOR_BASELINE_MIN_RUNS - 1):
+        assert check_baseline(crawler_id, summary(title=1.0), store) == []
+
+    assert check_baseline(crawler_id, summary(title=0.1), store) == []
+    assert store.load()[crawler_id]['title']['runs'] == SELECTOR_BASELINE_MIN_RUNS
+
+
+def test_sharp_drop_is_reported(store, crawler_id):
+    for _ in range(SELECTOR_BASELINE_MIN_RUNS):
+        check_baseline(crawler_id, summary(title=1.0, image_url=0.5), store)
+
+    alerts = check_baseline(crawler_id, summary(title=0.2, image_url=0.4), store)
+
+    assert alerts == [{'field': 'title', 'hit_rate': 0.2, 'baseline': 1.0}]
+
+
+def test_baseline_follows_gradual_changes(store, crawler_id):
+    for _ in range(SELECTOR_BASELINE_MIN_RUNS):
+        check_baseline(crawler_id, summary(title=1.0), store)
+
+    # Small steps move the rolling baseline along without alerts
+    for rate in (0.95, 0.9, 0.85, 0.8, 0.75, 0.7):
+        assert check_baseline(crawler_id, summary(title=rate), store) == []
+    assert store.load()[crawler_id]['title']['hit_rate'] < 0.9
+
+
+def test_fields_without_values_are_skipped(store, crawler_id):
+    check_baseline(crawler_id, summary(title=None), store)
+
+    assert store.load() == {crawler_id: {}}
+
+
+def test_container_without_matches_is_reported(store, crawler_id):
+    assert check_baseline(crawler_id, summary(title=1.0), store, containers=12) == []
+    assert check_baseline(crawler_id, summary(title=1.0), store, containers=10) == []
+
+    # No containers: the fields never run, so only the container count shows the breakage
+    alerts = check_baseline(crawler_id, {}, store, containers=0)
+
+    assert alerts == [{'field': 'container', 'matches': 0, 'baseline': 11.6}]
+    assert store.load()[crawler_id]['container']['runs'] == 3
+
+
+def test_container_without_matches_needs_nonzero_baseline(store, crawler_id):
+    assert check_baseline(crawler_id, {}, store, containers=0) == []
+    assert check_baseline(crawler_id, {}, store, containers=0) == []
+    # Configs that run without a container selector are not tracked
+    check_baseline(crawler_id, summary(title=1.0), store)
+    assert store.load()[crawler_id]['container'] == {'matches': 0, 'runs': 2}
+
+
+def test_container_matches_are_counted_per_page():
+    stats = SelectorStats()
+    assert stats.containers is None
+
+    stats.count_containers(20)
+    stats.count_containers(0)
+    assert stats.containers == 20
+
+
+def test_scraper_warns_when_container_selector_stops_matching(crawler_id, capsys):
+    engine = get_engine('html.parser')
+    config = {'id': crawler_id, 'url': 'https://example.org/', 'output': {},
+              'selectors': {'container': 'li.event', 'title': {'selector': 'h2'}}}
+    redesigned = PAGE.replace(b'class="event"', b'class="teaser"')
+
+    for page in (PAGE, PAGE, redesigned):
+        metrics = RunMetrics(crawler_id)
+        scraper.scrape(engine.parse(page, None, 'utf-8'), config, engine, metrics.selectors)
+        scraper.check_selectors(config, metrics)
+
+    assert metrics.selectors.containers == 0
+    assert metrics.data['selector_alerts'] == [{'field': 'container', 'matches': 0, 'baseline': 3}]
+    assert f"container selector in {crawler_id} matched no items" in capsys.readouterr().out
@@ -10,3 +10,17 @@ def ensure_directory_exists(path: str, permissions: int = 0o755) -> bool:
         return True
     except Exception:
         return False
+
+
+def rate_limited_get(url: str, **kwargs):
+    """requests.get mit gemeinsamem Rate-Limit pro Host (siehe rate_limiter.py)."""
+    import requests
+    from rate_limiter import wait_for_host
+    wait_for_host(url)
+    return requests.get(url, **kwargs)
+
+
+def publish_outputs(*paths, output_dir: str = "/app/output") -> int:
+    """Schreibt .gz/.br-Geschwister für geänderte Ausgabedateien (siehe precompress.py)."""
+    from precompress import publish
+    return sum(1 for path in paths if publish(str(path), root=str(output_dir)))
@@ -0,0 +1,224 @@
+"""
+Precompressed siblings for files on the crawler output volume.
+For every published file a `.gz` (and, with the brotli package, a `.br`)
+sibling is written next to it, so the static web server can send the
+precompressed bytes (nginx: gzip_static / brotli_static) without compressing
+on each request. Siblings are only rebuilt when the source content changed.
+A manifest with sizes and hashes of all published files lives in the output
+directory.
+
+Only writers that call publish() after every write get siblings: a sibling of
+a file that is later rewritten without publish() would keep being served.
+sweep_dir() removes such stale siblings.
+
+Only needs the standard library (brotli is optional); the same file ships
+with the Python base images (copies kept in sync by
+scripts/sync-shared-modules.py, edit this one).
+
+    python precompress.py FILE...          # Publish files right after writing them
+    python precompress.py --sweep [DIR]    # Remove stale siblings below DIR (default: OUTPUT_DIR)
+"""
+import fcntl
+import gzip
+import hashlib
+import json
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, Optional
+
+try:
+    import brotli
+    HAS_BROTLI = True
+except ImportError:
+    HAS_BROTLI = False
+
+
+OUTPUT_DIR = os.environ.get('OUTPUT_DIR', '/app/output')
+# "0" disables precompression in the generic scraper
+PRECOMPRESS = os.environ.get('PRECOMPRESS', '1') != '0'
+MANIFEST_NAME = 'precompressed-manifest.json'
+COMPRESSIBLE = ('.json', '.html', '.css', '.js', '.svg', '.xml', '.txt', '.csv', '.geojson')
+# Files smaller than this are not worth a sibling (nginx gzip_min_length default is 20)
+MIN_SIZE = 256
+# Siblings that do not save at least this fraction are dropped
+MIN_SAVING = 0.05
+
+
+def _atomic_write(path: str, data: bytes):
+    directory = os.path.dirname(path) or '.'
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-', suffix=os.path.basename(path))
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def compress_gzip(content: bytes) -> bytes:
+    """Deterministic gzip (no timestamp or filename in the header)."""
+    return gzip.compress(content, compresslevel=9, mtime=0)
+
+
+def compress_brotli(content: bytes) -> bytes:
+    return brotli.compress(content, quality=11)
+
+
+ENCODINGS = [('.gz', compress_gzip)] + ([('.br', compress_brotli)] if HAS_BROTLI else [])
+# Swept even where brotli is not installed
+SIBLING_SUFFIXES = ('.gz', '.br')
+
+
+class Manifest:
+    """{relative path: sizes and hashes} of published files, updated under a file lock."""
+
+    def __init__(self, root: str = OUTPUT_DIR):
+        self.root = root
+        self.path = os.path.join(root, MANIFEST_NAME)
+
+    def load(self) -> Dict[str, Any]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    @contextmanager
+    def transaction(self) -> Iterator[Dict[str, Any]]:
+        os.makedirs(self.root, exist_ok=True)
+        with open(os.path.join(self.root, '.' + MANIFEST_NAME + '.lock'), 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                data = self.load()
+                before = json.dumps(data, sort_keys=True)
+                yield data
+                if json.dumps(data, sort_keys=True) != before:
+                    _atomic_write(self.path, (json.dumps(data, indent=2, sort_keys=True) + '\n').encode('utf-8'))
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _relative(path: str, root: str) -> str:
+    return os.path.relpath(os.path.abspath(path), os.path.abspath(root))
+
+
+def _siblings_current(path: str, entry: Optional[Dict[str, Any]]) -> bool:
+    if not entry:
+        return False
+    return all(os.path.exists(path + suffix) == (suffix in entry.get('encodings', {}))
+               for suffix, _ in ENCODINGS)
+
+
+def publish(path: str, content: Optional[bytes] = None, root: str = OUTPUT_DIR,
+            manifest: Optional[Manifest] = None) -> bool:
+    """Write compressed siblings of path if its content changed since the last publish.
+
+    Returns True if siblings were (re)written.
+    """
+    if not path.endswith(COMPRESSIBLE):
+        return False
+    if content is None:
+        with open(path, 'rb') as f:
+            content = f.read()
+    digest = hashlib.sha256(content).hexdigest()
+    manifest = manifest or Manifest(root)
+    name = _relative(path, root)
+
+    entry = manifest.load().get(name)
+    if entry and entry.get('sha256') == digest and _siblings_current(path, entry):
+        return False
+
+    encodings = {}
+    for suffix, compress in ENCODINGS:
+        sibling = path + suffix
+        compressed = compress(content) if len(content) >= MIN_SIZE else None
+        if compressed is None or len(compressed) > len(content) * (1 - MIN_SAVING):
+            if os.path.exists(sibling):
+                os.unlink(sibling)
+            continue
+        _atomic_write(sibling, compressed)
+        encodings[suffix] = {'size': len(compressed), 'sha256': hashlib.sha256(compressed).hexdigest()}
+
+    stat = os.stat(path)
+    with manifest.transaction() as data:
+        data[name] = {
+            'size': len(content),
+            'sha256': digest,
+            'mtime': int(stat.st_mtime),
+            'encodings': encodings,
+        }
+    return True
+
+
+def _sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def sweep_dir(root: str = OUTPUT_DIR) -> Dict[str, int]:
+    """Remove siblings that no longer match their source; never writes new ones.
+
+    A sibling is stale if its source is gone, if the source content differs
+    from the manifest entry of the last publish(), or (for files publish()
+    never saw) if it is older than the source. Manifest entries of stale or
+    missing files are dropped, so the next publish() rebuilds them.
+    """
+    manifest = Manifest(root)
+    counts = {'current': 0, 'removed': 0}
+    hashes: Dict[str, str] = {}
+
+    with manifest.transaction() as data:
+        for directory, subdirs, files in os.walk(root):
+            subdirs[:] = [d for d in subdirs if not d.startswith('.')]
+            for filename in files:
+                if filename.startswith('.') or not filename.endswith(SIBLING_SUFFIXES):
+                    continue
+                sibling = os.path.join(directory, filename)
+                source = sibling[:-len('.gz')]
+                if not source.endswith(COMPRESSIBLE):
+                    continue
+                name = _relative(source, root)
+                entry = data.get(name)
+                if not os.path.exists(source):
+                    stale = True
+                elif entry is not None:
+                    if source not in hashes:
+                        hashes[source] = _sha256(source)
+                    stale = (hashes[source] != entry.get('sha256')
+                             or filename[-3:] not in entry.get('encodings', {}))
+                else:
+                    stale = os.stat(sibling).st_mtime < os.stat(source).st_mtime
+
+                if stale:
+                    os.unlink(sibling)
+                    data.pop(name, None)
+                    counts['removed'] += 1
+                else:
+                    counts['current'] += 1
+
+        for name in [name for name in data if not os.path.exists(os.path.join(root, name))]:
+            data.pop(name)
+    return counts
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2 or sys.argv[1] in ('-h', '--help'):
+        print(__doc__)
+        sys.exit(0 if len(sys.argv) == 2 else 1)
+    if sys.argv[1] == '--sweep':
+        target = sys.argv[2] if len(sys.argv) > 2 else OUTPUT_DIR
+        result = sweep_dir(target)
+        print(f"Swept {target}: {result['removed']} stale siblings removed, {result['current']} current")
+    else:
+        published = sum(1 for path in sys.argv[1:] if publish(path))
+        print(f"Precompressed {published} of {len(sys.argv) - 1} files "
+              f"(brotli: {'yes' if HAS_BROTLI else 'not installed'})")
@@ -7,7 +7,8 @@ import threading
 from pathlib import Path
 
 try:
-    import yaml
+    # Kopie von base_images/generic_scraper/registry_cache.py (scripts/sync-shared-modules.py)
+    import registry_cache
     HAS_YAML = True
 except ImportError:
     HAS_YAML = False
@@ -22,7 +23,7 @@ REGISTRY_FILE = Path("/app/configs/crawlers.yaml")
 
 
 def load_containers_from_registry():
-    """Load container definitions from crawlers.yaml registry."""
+    """Load container definitions from crawlers.yaml registry (via the compiled cache)."""
     if not HAS_YAML:
         print("Warning: PyYAML not installed, using fallback")
         return None
@@ -32,8 +33,7 @@ def load_containers_from_registry():
         return None
 
     try:
-        with open(REGISTRY_FILE, 'r', encoding='utf-8') as f:
-            registry = yaml.safe_load(f)
+        registry = registry_cache.load_registry(REGISTRY_FILE)
 
         containers = {}
         for crawler in registry.get('crawlers', []):
@@ -471,6 +471,27 @@ def api_container_files(container_name):
             })
     return jsonify({'error': 'Container nicht gefunden'}), 404
 
+@app.route('/health/runs/<crawler_id>')
+def api_crawler_runs(crawler_id):
+    """API Endpoint für die letzten Läufe eines Crawlers aus dem Run-Ledger"""
+    ledger_file = os.path.join("output/", "scraper-runs.jsonl")
+    if not os.path.exists(ledger_file):
+        return jsonify({'error': 'Kein Run-Ledger vorhanden'}), 404
+
+    runs = []
+    with open(ledger_file, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(record, dict) and record.get('crawler_id') == crawler_id:
+                runs.append(record)
+
+    if not runs:
+        return jsonify({'error': 'Keine Läufe für diesen Crawler gefunden'}), 404
+    return jsonify({'crawler_id': crawler_id, 'runs': runs[-20:], 'last_run': runs[-1]})
+
 @app.route('/health/system')
 def api_health():
     """API Endpoint für System Health Check"""
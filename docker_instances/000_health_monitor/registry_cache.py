@@ -0,0 +1,103 @@
+"""
+Compiled cache for YAML files (crawlers.yaml and crawler configs).
+Parsing YAML is slow compared to reading JSON, and the registry keeps
+growing. load_yaml() keeps the parsed (and validated) content as JSON in
+REGISTRY_CACHE_DIR together with the SHA-256 of the source, and only parses
+the YAML again when the source changed. Nothing is written next to the
+sources, which are often read-only or bind-mounted checkouts.
+Only depends on PyYAML, so the scripts in scripts/ can use it as well.
+"""
+import os
+import json
+import hashlib
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+import yaml
+
+
+REGISTRY_CACHE_DIR = os.environ.get('REGISTRY_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'gs_crawler_registry'))
+# Bump when the cached form changes
+COMPILED_VERSION = 1
+
+# libyaml's loader is several times faster where available
+_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+# Raised by load_yaml() for invalid YAML, so callers need not import yaml
+YAMLError = yaml.YAMLError
+
+
+def cache_path(path: Path) -> Path:
+    """Cache file for a YAML file (keyed by its absolute path, so equal names don't collide)."""
+    digest = hashlib.sha1(str(path.resolve()).encode('utf-8')).hexdigest()[:12]
+    return Path(REGISTRY_CACHE_DIR) / f"{digest}.{path.stem}.compiled.json"
+
+
+def _write(path: Path, content: bytes) -> bool:
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=str(path.parent), prefix='.tmp-', suffix=path.name)
+    except OSError:
+        return False
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(content)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+        return True
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        return False
+
+
+def load_yaml(path, validate: Optional[Callable[[Any], None]] = None) -> Any:
+    """Parsed content of a YAML file, from its compiled cache while the source is unchanged.
+
+    `validate` runs only when the YAML is parsed; invalid content is never cached.
+    """
+    path = Path(path)
+    source = path.read_bytes()
+    source_hash = hashlib.sha256(source).hexdigest()
+    cache = cache_path(path)
+
+    try:
+        compiled = json.loads(cache.read_bytes())
+    except (OSError, ValueError):
+        compiled = {}
+    if compiled.get('version') == COMPILED_VERSION and compiled.get('source_sha256') == source_hash:
+        return compiled['data']
+
+    data = yaml.load(source, Loader=_LOADER)
+    if validate:
+        validate(data)
+
+    try:
+        content = json.dumps({'version': COMPILED_VERSION, 'source': str(path),
+                              'source_sha256': source_hash, 'data': data}, ensure_ascii=False)
+    except (TypeError, ValueError):
+        return data
+    # Dates or non-string keys would come back differently from JSON; such files are not cached
+    if json.loads(content)['data'] != data:
+        return data
+    # A cache that cannot be written only costs the next load a YAML parse
+    _write(cache, content.encode('utf-8'))
+    return data
+
+
+def validate_registry(registry: Any):
+    """Check the structure of crawlers.yaml: a `crawlers` list with unique ids and names."""
+    if not isinstance(registry, dict) or not isinstance(registry.get('crawlers'), list):
+        raise ValueError("crawlers.yaml must contain a 'crawlers' list")
+    seen = set()
+    for crawler in registry['crawlers']:
+        if not isinstance(crawler, dict) or not crawler.get('id') or not crawler.get('name'):
+            raise ValueError(f"Every crawler in crawlers.yaml needs an 'id' and a 'name': {crawler}")
+        if crawler['id'] in seen:
+            raise ValueError(f"Duplicate crawler id '{crawler['id']}' in crawlers.yaml")
+        seen.add(crawler['id'])
+
+
+def load_registry(path) -> dict:
+    """The validated crawler registry (crawlers.yaml)."""
+    return load_yaml(path, validate_registry)
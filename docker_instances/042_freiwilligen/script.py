@@ -11,6 +11,12 @@ from pathlib import Path
 import requests
 from bs4 import BeautifulSoup
 
+try:
+    from helpers import publish_outputs
+except ImportError:  # lokal ohne Base-Image
+    def publish_outputs(*paths, output_dir="/app/output"):
+        return 0
+
 PORTAL_ID = "114"
 AGENCY_ID = "25"
 ACCESS_KEY = os.environ["FREIWILLIGEN_AGENTUR_API_KEY"].strip()
@@ -226,6 +232,10 @@ def main():
     write_html(ordered_index)
     write_detail_html(ordered_index)
     copy_ui_kit()
+    publish_outputs(
+        *(OUTPUT_DIR / name for name in ["042-freiwilligenagentur-alle.json", INDEX_HTML_FILE, DETAIL_HTML_FILE]),
+        output_dir=OUTPUT_DIR,
+    )
 
     print(f"Fetched {len(offers)} active Freinet offers.")
 
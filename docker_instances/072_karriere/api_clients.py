@@ -9,6 +9,12 @@ from urllib.error import URLError
 from urllib.parse import quote, urlencode
 from urllib.request import Request, urlopen
 
+try:
+    from rate_limiter import wait_for_host
+except ImportError:  # lokal ohne Base-Image
+    def wait_for_host(url: str) -> float:
+        return 0.0
+
 from config import (
     ALLOWED_BUNDESAPI_FILTERS,
     ARBEITGEBERLOGO_BASE_URL,
@@ -62,6 +68,7 @@ def open_url_with_ssl_fallback(request: Request, timeout: int):
 def fetch_bytes(url: str, headers: dict[str, str], timeout: int = DEFAULT_TIMEOUT_SECONDS) -> tuple[bytes, str]:
     """Lädt Binärdaten von einer URL und gibt Body plus Content-Type zurück."""
     request = Request(url, headers=headers, method="GET")
+    wait_for_host(url)
     with open_url_with_ssl_fallback(request, timeout) as response:
         content_type = response.headers.get("Content-Type", "application/octet-stream")
         return response.read(), content_type
@@ -152,6 +159,7 @@ def fetch_bundesapi_json(url: str) -> dict[str, Any]:
         "\n%{http_code}",
         url,
     ]
+    wait_for_host(url)
     completed = subprocess.run(
         command,
         capture_output=True,
@@ -230,6 +238,7 @@ def fetch_open_data_json(url: str, api_key: str, query: dict[str, Any]) -> dict[
         "\n%{http_code}",
         f"{url}?{urlencode(query)}",
     ]
+    wait_for_host(url)
     completed = subprocess.run(
         command,
         capture_output=True,
@@ -10,6 +10,12 @@ from api_clients import fetch_logo
 from config import DEFAULT_LOCATION
 from jobs_logic import build_ba_job_url, build_jobs_payload, normalize_external_url
 
+try:
+    from helpers import publish_outputs
+except ImportError:  # lokal ohne Base-Image
+    def publish_outputs(*paths, output_dir: str = "/app/output") -> int:
+        return 0
+
 
 SCRIPT_DIR = Path(__file__).resolve().parent
 OUTPUT_DIR = Path("/app/output")
@@ -239,6 +245,10 @@ def main() -> None:
     write_html(payload)
     copy_static_assets()
     copy_ui_kit()
+    publish_outputs(
+        *(OUTPUT_DIR / name for name in [JOBS_JSON_FILE, CARD_JSON_FILE, INDEX_HTML_FILE, *EXPORT_STATIC_FILES]),
+        output_dir=OUTPUT_DIR,
+    )
 
 
 if __name__ == "__main__":
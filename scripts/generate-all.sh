@@ -33,12 +33,21 @@ echo ""
 echo "2. Generating README.md tables..."
 python3 scripts/generate-readme.py
 
+echo ""
+echo "3. Generating README.md load profile..."
+python3 scripts/generate-load-profile.py
+
+echo ""
+echo "4. Syncing shared modules into the Python base images..."
+python3 scripts/sync-shared-modules.py
+
 echo ""
 echo "=== All files generated! ==="
 echo ""
 echo "Generated files:"
 echo "  - compose.yaml (production)"
 echo "  - compose.dev.yaml (development)"
-echo "  - README.md (crawler tables)"
+echo "  - README.md (crawler tables, load profile)"
+echo "  - shared modules in base_images/python_*_crawler"
 echo ""
 echo "To verify changes: git diff"
@@ -8,7 +8,6 @@ Usage:
     python scripts/generate-compose.py --prod   # Generate only compose.yaml
 """
 
-import yaml
 import sys
 from pathlib import Path
 from collections import defaultdict
@@ -17,11 +16,13 @@ SCRIPT_DIR = Path(__file__).parent
 PROJECT_ROOT = SCRIPT_DIR.parent
 REGISTRY_FILE = PROJECT_ROOT / "crawlers.yaml"
 
+sys.path.insert(0, str(PROJECT_ROOT / "base_images" / "generic_scraper"))
+import registry_cache  # noqa: E402
+
 
 def load_registry():
     """Load the crawler registry."""
-    with open(REGISTRY_FILE, 'r', encoding='utf-8') as f:
-        return yaml.safe_load(f)
+    return registry_cache.load_registry(REGISTRY_FILE)
 
 
 def get_service_name(crawler):
@@ -47,6 +48,17 @@ def get_container_name(crawler):
     return f"gs_compiler_{cid}"
 
 
+def generic_scraper_environment(registry):
+    """Environment lines for generic scraper services from registry settings."""
+    window = registry.get('settings', {}).get('schedule_stagger_window')
+    if not window:
+        return []
+    return [
+        "    environment:",
+        f"      - SCHEDULE_STAGGER_WINDOW={int(window)}",
+    ]
+
+
 def generate_dev_compose(registry):
     """Generate compose.dev.yaml for local development."""
     settings = registry['settings']
@@ -152,6 +164,7 @@ def generate_dev_compose(registry):
             lines.append("    volumes:")
             lines.append("      - ./httpdocs/crawler:/app/output")
             lines.append(f"      - ./crawler_configs/{config_dir}:/app/configs")
+            lines.extend(generic_scraper_environment(registry))
             lines.append(f"    container_name: gs_generic_scraper_{config_dir}")
             lines.append("    restart: unless-stopped")
             lines.append("")
@@ -276,6 +289,7 @@ def generate_prod_compose(registry):
             lines.append("    volumes:")
             lines.append("      - ./httpdocs/crawler:/app/output")
             lines.append(f"      - ./crawler_configs/{config_dir}:/app/configs")
+            lines.extend(generic_scraper_environment(registry))
             lines.append(f"    container_name: gs_generic_scraper_{config_dir}")
             lines.append("    restart: unless-stopped")
             lines.append("")
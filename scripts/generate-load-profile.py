@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Generate a load profile of all scheduled crawlers from crawlers.yaml.
+
+Shows how many crawlers run at the same time over a day, once with the
+schedules as written and once with the stagger the generic scraper applies
+(settings.schedule_stagger_window). Run durations come from the run ledger
+of the generic scraper if one is given, otherwise DEFAULT_DURATION is used.
+
+Usage:
+    python scripts/generate-load-profile.py
+    python scripts/generate-load-profile.py --ledger httpdocs/crawler/scraper-runs.jsonl
+    python scripts/generate-load-profile.py --print
+    python scripts/generate-load-profile.py --print --window 900   # Preview a stagger window
+
+This updates the load profile in README.md between the marker comments:
+<!-- LOAD_PROFILE_START --> and <!-- LOAD_PROFILE_END -->
+"""
+
+import argparse
+import json
+import statistics
+import sys
+from collections import defaultdict
+from datetime import datetime, timedelta
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+REGISTRY_FILE = PROJECT_ROOT / "crawlers.yaml"
+README_FILE = PROJECT_ROOT / "README.md"
+CONFIG_ROOT = PROJECT_ROOT / "crawler_configs"
+
+sys.path.insert(0, str(PROJECT_ROOT / "base_images" / "generic_scraper"))
+import registry_cache  # noqa: E402
+from scheduler import CronSchedule, stagger_schedule  # noqa: E402
+
+START_MARKER = "<!-- LOAD_PROFILE_START -->"
+END_MARKER = "<!-- LOAD_PROFILE_END -->"
+
+# Assumed run time (seconds) of crawlers without ledger entries
+DEFAULT_DURATION = 60
+MINUTES_PER_DAY = 24 * 60
+
+
+def load_registry():
+    """Load the crawler registry."""
+    return registry_cache.load_registry(REGISTRY_FILE)
+
+
+def load_config_windows(default_window):
+    """Stagger window per config id (a config's stagger_window overrides the default)."""
+    windows = {}
+    for path in CONFIG_ROOT.glob('*/*.yaml'):
+        try:
+            config = registry_cache.load_yaml(path) or {}
+        except registry_cache.YAMLError:
+            continue
+        if isinstance(config, dict) and config.get('id'):
+            windows[config['id']] = int(config.get('stagger_window', default_window))
+    return windows
+
+
+def load_durations(ledger_path):
+    """Median run duration (seconds) per crawler id from a scraper-runs.jsonl ledger."""
+    samples = defaultdict(list)
+    if not ledger_path:
+        return {}
+    with open(ledger_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if record.get('crawler_id') and record.get('duration_ms') is not None:
+                samples[record['crawler_id']].append(record['duration_ms'] / 1000)
+    return {cid: statistics.median(values) for cid, values in samples.items()}
+
+
+def day_minutes(expression, delay=0):
+    """Minutes of a day (0..1439) at which a schedule starts, shifted by delay seconds."""
+    cron = CronSchedule(expression)
+    start = datetime(2024, 1, 1)  # a Monday; weekday schedules show up like on any weekday
+    return [
+        (minute + delay // 60) % MINUTES_PER_DAY
+        for minute in range(MINUTES_PER_DAY)
+        if cron.matches(start + timedelta(minutes=minute))
+    ]
+
+
+def concurrency(runs):
+    """Number of crawlers running in each minute of the day."""
+    load = [[] for _ in range(MINUTES_PER_DAY)]
+    for cid, minutes, duration in runs:
+        span = max(1, -(-int(duration) // 60))
+        for start in minutes:
+            for offset in range(span):
+                load[(start + offset) % MINUTES_PER_DAY].append(cid)
+    return load
+
+
+def describe_peaks(load, limit=5):
+    """The busiest minutes as markdown list lines."""
+    busiest = sorted(range(MINUTES_PER_DAY), key=lambda m: (-len(load[m]), m))[:limit]
+    return [
+        f"- {m // 60:02d}:{m % 60:02d} - {len(load[m])} running: {', '.join(sorted(set(load[m])))}"
+        for m in busiest if load[m]
+    ]
+
+
+def generate_load_profile(registry, durations, window=None):
+    """Generate the markdown load profile (window overrides the registry setting)."""
+    if window is None:
+        window = registry.get('settings', {}).get('schedule_stagger_window', 0)
+    default_window = int(window)
+    windows = load_config_windows(default_window)
+
+    as_written, staggered, suggestions = [], [], []
+    for crawler in registry['crawlers']:
+        expression = crawler.get('schedule', '')
+        if len(expression.split()) != 5:
+            continue  # "Always running", API endpoints
+        cid = crawler['id']
+        duration = durations.get(cid, DEFAULT_DURATION)
+        as_written.append((cid, day_minutes(expression), duration))
+
+        shifted, delay = stagger_schedule(expression, cid, windows.get(cid, default_window))
+        if crawler.get('implementation') != 'config':
+            # Custom containers keep their own cron; only suggest a schedule
+            if shifted != expression:
+                suggestions.append((cid, expression, shifted))
+            shifted, delay = expression, 0
+        staggered.append((cid, day_minutes(shifted, delay), duration))
+
+    before = concurrency(as_written)
+    after = concurrency(staggered)
+
+    lines = []
+    lines.append(f"**Scheduled crawlers:** {len(as_written)} "
+                 f"(stagger window: {default_window}s, "
+                 f"durations: {'run ledger' if durations else f'{DEFAULT_DURATION}s assumed'})")
+    lines.append("")
+    lines.append("| | As written | Staggered |")
+    lines.append("|:--|--:|--:|")
+    lines.append(f"| Peak concurrent runs | {max(map(len, before))} | {max(map(len, after))} |")
+    lines.append(f"| Minutes with 3+ runs | {sum(len(m) >= 3 for m in before)} "
+                 f"| {sum(len(m) >= 3 for m in after)} |")
+    lines.append(f"| Run starts per day | {sum(len(r[1]) for r in as_written)} "
+                 f"| {sum(len(r[1]) for r in staggered)} |")
+    lines.append("")
+
+    lines.append("Busiest minutes (staggered):")
+    lines.append("")
+    lines.extend(describe_peaks(after))
+    lines.append("")
+
+    lines.append("| Hour | " + " | ".join(f"{h:02d}" for h in range(24)) + " |")
+    lines.append("|:--|" + "--:|" * 24)
+    for label, load in (("Peak as written", before), ("Peak staggered", after)):
+        peaks = [max(len(load[h * 60 + m]) for m in range(60)) for h in range(24)]
+        lines.append(f"| {label} | " + " | ".join(str(p) for p in peaks) + " |")
+    lines.append("")
+
+    if suggestions:
+        lines.append("Suggested staggered schedules for custom crawlers:")
+        lines.append("")
+        lines.append("| ID | Schedule | Suggested |")
+        lines.append("|:---|:---------|:----------|")
+        for cid, expression, shifted in suggestions:
+            lines.append(f"| {cid} | `{expression}` | `{shifted}` |")
+        lines.append("")
+
+    return '\n'.join(lines)
+
+
+def update_readme(new_content):
+    """Update README.md with the new load profile."""
+    with open(README_FILE, 'r', encoding='utf-8') as f:
+        content = f.read()
+
+    start_idx = content.find(START_MARKER)
+    end_idx = content.find(END_MARKER)
+
+    if start_idx == -1 or end_idx == -1:
+        print("Warning: Markers not found in README.md")
+        print("Add these markers where you want the load profile:")
+        print(f"  {START_MARKER}")
+        print(f"  {END_MARKER}")
+        return False
+
+    new_readme = (
+        content[:start_idx + len(START_MARKER)] +
+        "\n" + new_content + "\n" +
+        content[end_idx:]
+    )
+
+    with open(README_FILE, 'w', encoding='utf-8') as f:
+        f.write(new_readme)
+
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate the crawler load profile')
+    parser.add_argument('--ledger', help='scraper-runs.jsonl with measured run durations')
+    parser.add_argument('--print', action='store_true', dest='print_only',
+                        help='Print the profile instead of updating README.md')
+    parser.add_argument('--window', type=int,
+                        help='Stagger window in seconds instead of settings.schedule_stagger_window')
+    args = parser.parse_args()
+
+    print("Loading crawler registry...", file=sys.stderr)
+    registry = load_registry()
+    durations = load_durations(args.ledger)
+
+    profile = generate_load_profile(registry, durations, args.window)
+
+    if args.print_only:
+        print(profile)
+        return
+
+    print("Updating README.md...")
+    if update_readme(profile):
+        print("  -> README.md updated")
+    else:
+        print("  -> Failed to update README.md (check for markers)")
+
+    print("Done!")
+
+
+if __name__ == '__main__':
+    main()
@@ -9,8 +9,8 @@ This updates the crawler tables in README.md between the marker comments:
 <!-- CRAWLER_TABLE_START --> and <!-- CRAWLER_TABLE_END -->
 """
 
-import yaml
 import re
+import sys
 from pathlib import Path
 from collections import defaultdict
 
@@ -19,14 +19,16 @@ PROJECT_ROOT = SCRIPT_DIR.parent
 REGISTRY_FILE = PROJECT_ROOT / "crawlers.yaml"
 README_FILE = PROJECT_ROOT / "README.md"
 
+sys.path.insert(0, str(PROJECT_ROOT / "base_images" / "generic_scraper"))
+import registry_cache  # noqa: E402
+
 START_MARKER = "<!-- CRAWLER_TABLE_START -->"
 END_MARKER = "<!-- CRAWLER_TABLE_END -->"
 
 
 def load_registry():
     """Load the crawler registry."""
-    with open(REGISTRY_FILE, 'r', encoding='utf-8') as f:
-        return yaml.safe_load(f)
+    return registry_cache.load_registry(REGISTRY_FILE)
 
 
 def generate_crawler_tables(registry):
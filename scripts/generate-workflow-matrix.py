@@ -18,21 +18,21 @@ import json
 import sys
 from pathlib import Path
 
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+REGISTRY_FILE = PROJECT_ROOT / "crawlers.yaml"
+
+sys.path.insert(0, str(PROJECT_ROOT / "base_images" / "generic_scraper"))
 try:
-    import yaml
+    import registry_cache
 except ImportError:
     print("Error: PyYAML not installed", file=sys.stderr)
     sys.exit(1)
 
-SCRIPT_DIR = Path(__file__).parent
-PROJECT_ROOT = SCRIPT_DIR.parent
-REGISTRY_FILE = PROJECT_ROOT / "crawlers.yaml"
-
 
 def load_registry():
     """Load the crawler registry."""
-    with open(REGISTRY_FILE, 'r', encoding='utf-8') as f:
-        return yaml.safe_load(f)
+    return registry_cache.load_registry(REGISTRY_FILE)
 
 
 def get_all_containers(registry):
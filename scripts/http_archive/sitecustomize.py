@@ -0,0 +1,15 @@
+"""
+Installs the HTTP record/replay archive in every Python process started with
+this directory on PYTHONPATH (set by scripts/test-crawler.py --record/--replay),
+so custom crawler scripts are covered without changes.
+"""
+import importlib.util
+import os
+from pathlib import Path
+
+if os.environ.get('HTTP_ARCHIVE_MODE'):
+    _path = Path(__file__).resolve().parents[2] / 'base_images' / 'generic_scraper' / 'http_archive.py'
+    _spec = importlib.util.spec_from_file_location('http_archive', _path)
+    _module = importlib.util.module_from_spec(_spec)
+    _spec.loader.exec_module(_module)
+    _module.install()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Keep modules shared between images identical to their single source.
+
+Every image is built from its own directory, so modules used by several
+images are copied into each build context. The copies are committed, but
+only the source file may be edited; this script copies it over or, with
+--check, fails when a copy has drifted.
+
+Usage:
+    python scripts/sync-shared-modules.py           # Copy sources over drifted copies
+    python scripts/sync-shared-modules.py --check   # Exit 1 if a copy differs (CI)
+"""
+
+import argparse
+import shutil
+import sys
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+
+# Source file -> copies in other build contexts
+SHARED_MODULES = {
+    "base_images/generic_scraper/rate_limiter.py": [
+        "base_images/python_basic_crawler/rate_limiter.py",
+        "base_images/python_selenium_crawler/rate_limiter.py",
+    ],
+    "base_images/generic_scraper/precompress.py": [
+        "base_images/python_basic_crawler/precompress.py",
+        "base_images/python_selenium_crawler/precompress.py",
+    ],
+    "base_images/generic_scraper/registry_cache.py": [
+        "docker_instances/000_health_monitor/registry_cache.py",
+    ],
+}
+
+
+def drifted_copies():
+    """(source, copy) pairs whose copy is missing or differs from the source."""
+    drifted = []
+    for source, copies in SHARED_MODULES.items():
+        content = (PROJECT_ROOT / source).read_bytes()
+        for copy in copies:
+            path = PROJECT_ROOT / copy
+            if not path.exists() or path.read_bytes() != content:
+                drifted.append((source, copy))
+    return drifted
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Sync modules shared between images')
+    parser.add_argument('--check', action='store_true', help='Only report drifted copies, exit 1 if there are any')
+    args = parser.parse_args()
+
+    drifted = drifted_copies()
+    if not drifted:
+        print("Shared modules are in sync")
+        return
+
+    if args.check:
+        print("Shared module copies differ from their source:")
+        for source, copy in drifted:
+            print(f"  {copy} (source: {source})")
+        print("Edit only the source and run: python scripts/sync-shared-modules.py")
+        sys.exit(1)
+
+    for source, copy in drifted:
+        shutil.copyfile(PROJECT_ROOT / source, PROJECT_ROOT / copy)
+        print(f"  -> {copy} updated from {source}")
+
+
+if __name__ == '__main__':
+    main()
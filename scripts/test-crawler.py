@@ -9,6 +9,8 @@ Usage:
     python scripts/test-crawler.py --config          # Test only config-driven
     python scripts/test-crawler.py --custom          # Test only custom crawlers
     python scripts/test-crawler.py --category news   # Test by category
+    python scripts/test-crawler.py 002_gz --record   # Record HTTP traffic to test_archives/
+    python scripts/test-crawler.py --all --replay    # Run offline from recorded archives
 """
 
 import argparse
@@ -28,23 +30,49 @@ class Colors:
     RESET = '\033[0m'
     BOLD = '\033[1m'
 
-try:
-    import yaml
-except ImportError:
-    print("PyYAML not installed. Run: pip3 install pyyaml")
-    sys.exit(1)
-
 SCRIPT_DIR = Path(__file__).parent
 PROJECT_ROOT = SCRIPT_DIR.parent
 REGISTRY_FILE = PROJECT_ROOT / "crawlers.yaml"
 TEST_OUTPUT_DIR = PROJECT_ROOT / "test_output"
 GENERIC_SCRAPER_DIR = PROJECT_ROOT / "base_images" / "generic_scraper"
 
+sys.path.insert(0, str(GENERIC_SCRAPER_DIR))
+try:
+    import registry_cache
+except ImportError:
+    print("PyYAML not installed. Run: pip3 install pyyaml")
+    sys.exit(1)
+ARCHIVE_DIR = PROJECT_ROOT / "test_archives"
+# Contains a sitecustomize.py that installs the HTTP archive in every process
+ARCHIVE_HOOK_DIR = SCRIPT_DIR / "http_archive"
+
+
+def archive_env(env, crawler_id, archive):
+    """Add the HTTP record/replay settings for one crawler to env.
+
+    Returns an error message if the crawler cannot be replayed.
+    """
+    if not archive:
+        return None
+    mode, speed = archive
+    archive_path = ARCHIVE_DIR / f"{crawler_id}.sqlite"
+    if mode == 'replay' and not archive_path.exists():
+        return f"No HTTP archive recorded: {archive_path}"
+
+    env['HTTP_ARCHIVE_MODE'] = mode
+    env['HTTP_ARCHIVE'] = str(archive_path)
+    env['HTTP_ARCHIVE_SPEED'] = str(speed)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [str(ARCHIVE_HOOK_DIR), env.get('PYTHONPATH')]))
+    if mode == 'replay':
+        # Offline runs should neither wait for rate limits nor retry misses
+        env.setdefault('RATE_LIMIT_DEFAULT', '0')
+        env.setdefault('FETCH_RETRIES', '0')
+    return None
+
 
 def load_registry():
     """Load the crawler registry."""
-    with open(REGISTRY_FILE, 'r', encoding='utf-8') as f:
-        return yaml.safe_load(f)
+    return registry_cache.load_registry(REGISTRY_FILE)
 
 
 def get_venv_python():
@@ -63,7 +91,7 @@ def get_venv_python():
     return str(python_path)
 
 
-def test_config_crawler(crawler, venv_python):
+def test_config_crawler(crawler, venv_python, archive=None):
     """Test a config-driven crawler."""
     config_dir = crawler.get('config_dir', 'simple')
     config_path = PROJECT_ROOT / "crawler_configs" / config_dir / f"{crawler['id']}.yaml"
@@ -73,6 +101,9 @@ def test_config_crawler(crawler, venv_python):
 
     env = os.environ.copy()
     env['OUTPUT_DIR'] = str(TEST_OUTPUT_DIR)
+    skip_reason = archive_env(env, crawler['id'], archive)
+    if skip_reason:
+        return None, skip_reason
 
     try:
         result = subprocess.run(
@@ -127,7 +158,7 @@ def get_base_image_requirements(docker_dir):
     return None
 
 
-def test_custom_crawler(crawler):
+def test_custom_crawler(crawler, archive=None):
     """Test a custom container crawler by running its script directly."""
     crawler_id = crawler['id']
 
@@ -184,6 +215,9 @@ def test_custom_crawler(crawler):
 
     env = os.environ.copy()
     env['OUTPUT_DIR'] = str(TEST_OUTPUT_DIR)
+    skip_reason = archive_env(env, crawler_id, archive)
+    if skip_reason:
+        return None, skip_reason
 
     # Many custom scripts use hardcoded ./output/ path
     # Create symlink from docker_dir/output to test_output
@@ -264,8 +298,8 @@ def list_crawlers(registry):
         print()
 
 
-def run_tests(crawlers, registry, test_config=True, test_custom=True):
-    """Run tests for the specified crawlers."""
+def run_tests(crawlers, registry, test_config=True, test_custom=True, archive=None):
+    """Run tests for the specified crawlers (archive: optional (mode, speed) for record/replay)."""
     TEST_OUTPUT_DIR.mkdir(exist_ok=True)
 
     venv_python = get_venv_python() if test_config else None
@@ -289,9 +323,9 @@ def run_tests(crawlers, registry, test_config=True, test_custom=True):
         print(f"{Colors.BOLD}Testing: {crawler_id}{Colors.RESET} ({crawler['name']})")
 
         if impl == 'config' and test_config:
-            success, message = test_config_crawler(crawler, venv_python)
+            success, message = test_config_crawler(crawler, venv_python, archive)
         elif impl == 'custom' and test_custom:
-            success, message = test_custom_crawler(crawler)
+            success, message = test_custom_crawler(crawler, archive)
         else:
             results['skipped'].append((crawler_id, "Filtered out"))
             print(f"  {Colors.YELLOW}SKIPPED{Colors.RESET}: Filtered out\n")
@@ -342,6 +376,13 @@ def main():
     parser.add_argument('--custom', '-u', action='store_true', help='Test only custom crawlers')
     parser.add_argument('--category', '-t', help='Test crawlers in specific category')
     parser.add_argument('--list', '-l', action='store_true', help='List available crawlers')
+    archive_group = parser.add_mutually_exclusive_group()
+    archive_group.add_argument('--record', action='store_true',
+                               help='Record all HTTP traffic to test_archives/<id>.sqlite')
+    archive_group.add_argument('--replay', action='store_true',
+                               help='Run offline from test_archives/<id>.sqlite')
+    parser.add_argument('--replay-speed', type=float, default=0,
+                        help='Replay timing: 0 = instant (default), 1 = recorded response times')
 
     args = parser.parse_args()
 
@@ -377,8 +418,12 @@ def main():
     test_config = not args.custom
     test_custom = not args.config
 
+    archive = None
+    if args.record or args.replay:
+        archive = ('record' if args.record else 'replay', args.replay_speed)
+
     # Run tests
-    results = run_tests(test_crawlers, registry, test_config, test_custom)
+    results = run_tests(test_crawlers, registry, test_config, test_custom, archive)
 
     # Print summary
     success = print_summary(results)